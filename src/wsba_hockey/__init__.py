@@ -1,7 +1,12 @@
 from wsba_hockey.wsba_main import (
+    nhl_configure_reporting,
     nhl_scrape_game,
     nhl_scrape_schedule,
     nhl_scrape_season,
+    nhl_stream_games,
+    nhl_stream_season,
+    nhl_merge_sources,
+    nhl_scrape_live,
     nhl_scrape_seasons_info,
     nhl_scrape_standings,
     nhl_scrape_roster,
@@ -13,7 +18,15 @@ from wsba_hockey.wsba_main import (
     nhl_scrape_edge,
     nhl_scrape_seasons,
     nhl_calculate_stats,
+    nhl_build_stat_cube,
+    nhl_calculate_cube_stats,
+    nhl_calculate_partitioned_stats,
+    nhl_build_stints,
+    nhl_calculate_rapm,
     nhl_apply_xG,
+    nhl_compact_pbp,
+    nhl_calculate_adjustments,
+    nhl_build_plot_context,
     nhl_plot_skaters_shots,
     nhl_plot_heatmap,
     nhl_plot_games,
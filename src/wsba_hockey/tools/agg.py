@@ -1,3 +1,4 @@
+import os
 import json
 import pandas as pd
 import numpy as np
@@ -17,10 +18,63 @@ strengths_list = {
 
 per_sixty = ['Fi','xGi','Gi','A1','A2','P1','P','Si','OZF','NZF','DZF','FF','FA','xGF','xGA','GF','GA','SF','SA','CF','CA','HF','HA','Give','Take','Penl','Penl2','Penl5','Draw','PIM','Block','GSAx']
 
+#Columns of play-by-play used by each calculation (calculations are made on projections of these columns, leaving the provided play-by-play unchanged)
+onice_ids = [f'{venue}_on_{i}_id' for venue in ['away','home'] for i in range(1,7)]
+indv_cols = ['event_type','event_team_abbr','away_team_abbr','home_team_abbr','event_player_1_id','event_player_2_id','event_player_3_id','xG','penalty_duration','description','rush','shot_type','strength_state']
+onice_cols = ['season','game_id','strength_state','event_num','away_team_abbr','home_team_abbr','event_type','event_team_venue','event_team_abbr','ids_on','shift_type','event_length','zone_code','xG','away_score','home_score']+onice_ids
+stats_cols = list(dict.fromkeys(['season','season_type','game_id','game_date','period_type','away_goalie_id','home_goalie_id']+indv_cols+onice_cols))
+
+def project_columns(pbp,cols,rows=None):
+    #Given play-by-play, columns, and an optional mask of rows, return a new frame with only those columns (and rows) of the play-by-play
+    #Only the projection is copied and the play-by-play is left unchanged
+    cols = [col for col in dict.fromkeys(cols) if col in pbp.columns]
+    
+    return pd.DataFrame(pbp.loc[rows, cols] if rows is not None else pbp[cols])
+
+def row_index(keys, rows):
+    #Given keys and the row position of each key, return dictionary of each key to its (sorted) row positions
+    return {key: np.sort(rows[pos]) for key, pos in pd.Series(rows).groupby(keys).indices.items()}
+
+def onice_index(pbp, suffix = '_id'):
+    #Given play-by-play, return inverted index of each player (by ID, or by name with an empty suffix) to the row positions of events with the player on-ice for each venue
+    #Players are matched exactly on the on-ice columns (rather than by substrings of joined on-ice strings), and their events are found without scanning the play-by-play again
+    index = {}
+    for venue in ['away','home']:
+        players = pbp[[f'{venue}_on_{i}{suffix}' for i in range(1,7)]].to_numpy().ravel()
+        rows = np.repeat(np.arange(len(pbp)),6)
+        on = pd.notna(players)
+
+        index[venue] = row_index(players[on],rows[on])
+
+    return index
+
+def onice_rows(pbp, index, player, situation = 'all'):
+    #Given play-by-play, on-ice index, player, and situation, return sorted row positions of events with the player on-ice
+    #Situation is 'for' (events by the team of the player), 'against' (events by the opposing team), or 'all'
+    event_venue = pbp['event_team_venue'].to_numpy()
+    rows = []
+    for venue, opp in [('away','home'),('home','away')]:
+        player_rows = index[venue].get(player,np.array([],dtype=int))
+        if situation != 'all':
+            player_rows = player_rows[event_venue[player_rows]==(venue if situation == 'for' else opp)]
+        rows.append(player_rows)
+
+    return np.sort(np.concatenate(rows))
+
+def standard_dtypes(df):
+    #Given stats dataframe, return stats with columns carried over from compact play-by-play (categoricals and nullable integers) returned to standard types
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+        elif isinstance(df[col].dtype, pd.api.extensions.ExtensionDtype) and df[col].dtype.kind in 'iu':
+            #Player IDs are floats in stats generated from standard play-by-play
+            df[col] = df[col].astype(float) if (col == 'ID' or df[col].hasnans) else df[col].astype('int64')
+
+    return df
+
 def calc_indv(pbp,game_strength,second_group):
-    # Filter by game strength if not "all"
-    if game_strength != "all":
-        pbp = pbp.loc[pbp['strength_state'].isin(game_strength)]
+    #Project required columns and filter by game strength if not "all"
+    pbp = project_columns(pbp,indv_cols+second_group,pbp['strength_state'].isin(game_strength) if game_strength != "all" else None)
         
     #Add second event-team column for necessary situations
     pbp['event_team_abbr_2'] = np.where(pbp['event_team_abbr'].notna(),
@@ -37,7 +91,7 @@ def calc_indv(pbp,game_strength,second_group):
 
     #First event player stats
     ep1 = (
-        pbp.loc[pbp['event_type'].isin(["goal", "shot-on-goal", "missed-shot","blocked-shot",'hit','giveaway','takeaway','faceoff','penalty'])].groupby(raw_group_1).agg(
+        pbp.loc[pbp['event_type'].isin(["goal", "shot-on-goal", "missed-shot","blocked-shot",'hit','giveaway','takeaway','faceoff','penalty'])].groupby(raw_group_1,observed=True).agg(
         Gi=('event_type', lambda x: (x == "goal").sum()),
         Si=('event_type', lambda x: (x.isin(['shot-on-goal','goal'])).sum()),
         Fi=('event_type', lambda x: (x.isin(fenwick_events)).sum()),
@@ -56,7 +110,7 @@ def calc_indv(pbp,game_strength,second_group):
 
     #Second event player stats
     ep2 = (
-        pbp.loc[(pbp['event_type'].isin(['goal','blocked-shot','hit','faceoff','penalty']))&~(pbp['description'].str.lower().str.contains('blocked by teammate',na=False))].groupby(raw_group_2).agg(
+        pbp.loc[(pbp['event_type'].isin(['goal','blocked-shot','hit','faceoff','penalty']))&~(pbp['description'].str.lower().str.contains('blocked by teammate',na=False))].groupby(raw_group_2,observed=True).agg(
         A1=('event_type',lambda x: (x=='goal').sum()),
         HA=('event_type',lambda x: (x=='hit').sum()),
         Draw=('event_type',lambda x: (x=='penalty').sum()),
@@ -67,14 +121,14 @@ def calc_indv(pbp,game_strength,second_group):
 
     #Third event player stats
     ep3 = (
-        pbp.loc[pbp['event_type'].isin(["goal"])].groupby(raw_group_3).agg(
+        pbp.loc[pbp['event_type'].isin(["goal"])].groupby(raw_group_3,observed=True).agg(
         A2=('event_type', 'count')
     ).reset_index().rename(columns={'event_player_3_id': 'ID', 'event_team_abbr': 'Team', 'season': 'Season', 'game_id':'Game'})
     )
     
     #Rush events
     rush = (
-        pbp.loc[(pbp['event_type'].isin(fenwick_events))&(pbp['rush']>0)].groupby(raw_group_1).agg(
+        pbp.loc[(pbp['event_type'].isin(fenwick_events))&(pbp['rush']>0)].groupby(raw_group_1,observed=True).agg(
         Rush=('event_type','count'),
         Rush_G=('event_type',lambda x: (x == 'goal').sum()),
         Rush_xG=('xG','sum')
@@ -88,7 +142,7 @@ def calc_indv(pbp,game_strength,second_group):
     #Shot Types
     for type in shot_types:
         shot = (
-            pbp.loc[(pbp['event_type'].isin(["goal", "shot-on-goal", "missed-shot"])&(pbp['shot_type']==type))].groupby(raw_group_1).agg(
+            pbp.loc[(pbp['event_type'].isin(["goal", "shot-on-goal", "missed-shot"])&(pbp['shot_type']==type))].groupby(raw_group_1,observed=True).agg(
             Gi=('event_type', lambda x: (x == "goal").sum()),
             Si=('event_type', lambda x: (x.isin(['shot-on-goal','goal'])).sum()),
             Fi=('event_type', lambda x: (x != "blocked-shot").sum()),
@@ -104,6 +158,10 @@ def calc_indv(pbp,game_strength,second_group):
         })
         indv = pd.merge(indv,shot,how='outer',on=clean_group)
 
+    return standard_dtypes(indv_ratios(indv))
+
+def indv_ratios(indv):
+    #Given individual counts, return individual stats with composite and ratio columns added
     indv[['Gi','A1','A2','Penl','Draw','FW','FL']] = indv[['Gi','A1','A2','Penl','Draw','FW','FL']].fillna(0)
 
     indv['P1'] = indv['Gi']+indv['A1']
@@ -120,17 +178,25 @@ def calc_indv(pbp,game_strength,second_group):
 
     return indv
 
-def calc_onice(pbp,game_strength,second_group):
+def calc_onice(pbp,game_strength,second_group,weights=None):
+    #Project required columns
+    pbp = project_columns(pbp,onice_cols)
+
+    #Apply score and venue adjustment weights to events (all events are weighted equally when not adjusting)
+    pbp[adjust_cols] = event_weights(pbp,weights)
+
     #Convert player on-ice columns to vectors
-    pbp['home_on_ice'] = pbp['home_on_1_id'].astype(str) + ";" + pbp['home_on_2_id'].astype(str) + ";" + pbp['home_on_3_id'].astype(str) + ";" + pbp['home_on_4_id'].astype(str) + ";" + pbp['home_on_5_id'].astype(str) + ";" + pbp['home_on_6_id'].astype(str)
-    pbp['away_on_ice'] = pbp['away_on_1_id'].astype(str) + ";" + pbp['away_on_2_id'].astype(str) + ";" + pbp['away_on_3_id'].astype(str) + ";" + pbp['away_on_4_id'].astype(str) + ";" + pbp['away_on_5_id'].astype(str) + ";" + pbp['away_on_6_id'].astype(str)
+    #IDs are converted to floats first so compact (nullable integer) IDs are formatted the same way
+    for venue in ['home','away']:
+        ids = [pbp[f'{venue}_on_{i}_id'].astype(float).astype(str) for i in range(1,7)]
+        pbp[f'{venue}_on_ice'] = ids[0] + ";" + ids[1] + ";" + ids[2] + ";" + ids[3] + ";" + ids[4] + ";" + ids[5]
     
     #Remove NA players
     pbp['home_on_ice'] = pbp['home_on_ice'].str.replace(';nan', '', regex=True)
     pbp['away_on_ice'] = pbp['away_on_ice'].str.replace(';nan', '', regex=True)
 
     def process_team_stats(df, on_ice_col, team_col, opp_col, game_strength):
-        df = df[['season','game_id','strength_state','event_num', team_col, opp_col, 'event_type', 'event_team_venue','event_team_abbr', on_ice_col,'ids_on','shift_type','event_length','zone_code','xG']].copy()
+        df = df[['season','game_id','strength_state','event_num', team_col, opp_col, 'event_type', 'event_team_venue','event_team_abbr', on_ice_col,'ids_on','shift_type','event_length','zone_code','xG']+adjust_cols].copy()
 
         #Flip strength state (when necessary) and filter by game strength if not "all"
         if game_strength != "all":
@@ -143,21 +209,21 @@ def calc_onice(pbp,game_strength,second_group):
         df[on_ice_col] = df[on_ice_col].str.split(';')
         df = df.explode(on_ice_col)
         df = df.rename(columns={on_ice_col: 'ID', 'season': 'Season'})
-        df['xGF'] = np.where(df['event_team_abbr'] == df[team_col], df['xG'], 0)
-        df['xGA'] = np.where(df['event_team_abbr'] == df[opp_col], df['xG'], 0)
+        df['xGF'] = np.where(df['event_team_abbr'] == df[team_col], df['xG']*df['xG_weight'], 0)
+        df['xGA'] = np.where(df['event_team_abbr'] == df[opp_col], df['xG']*df['xG_weight'], 0)
         df['GF'] = np.where((df['event_type'] == "goal") & (df['event_team_abbr'] == df[team_col]), 1, 0)
         df['GA'] = np.where((df['event_type'] == "goal") & (df['event_team_abbr'] == df[opp_col]), 1, 0)
         df['SF'] = np.where((df['event_type'].isin(['shot-on-goal','goal'])) & (df['event_team_abbr'] == df[team_col]), 1, 0)
         df['SA'] = np.where((df['event_type'].isin(['shot-on-goal','goal'])) & (df['event_team_abbr'] == df[opp_col]), 1, 0)
-        df['FF'] = np.where((df['event_type'].isin(fenwick_events)) & (df['event_team_abbr'] == df[team_col]), 1, 0)
-        df['FA'] = np.where((df['event_type'].isin(fenwick_events)) & (df['event_team_abbr'] == df[opp_col]), 1, 0)
-        df['CF'] = np.where((df['event_type'].isin(fenwick_events+['blocked-shot'])) & (df['event_team_abbr'] == df[team_col]), 1, 0)
-        df['CA'] = np.where((df['event_type'].isin(fenwick_events+['blocked-shot'])) & (df['event_team_abbr'] == df[opp_col]), 1, 0)
+        df['FF'] = np.where((df['event_type'].isin(fenwick_events)) & (df['event_team_abbr'] == df[team_col]), df['fenwick_weight'], 0)
+        df['FA'] = np.where((df['event_type'].isin(fenwick_events)) & (df['event_team_abbr'] == df[opp_col]), df['fenwick_weight'], 0)
+        df['CF'] = np.where((df['event_type'].isin(fenwick_events+['blocked-shot'])) & (df['event_team_abbr'] == df[team_col]), df['corsi_weight'], 0)
+        df['CA'] = np.where((df['event_type'].isin(fenwick_events+['blocked-shot'])) & (df['event_team_abbr'] == df[opp_col]), df['corsi_weight'], 0)
         df['OZF'] = np.where((df['event_type']=='faceoff') & ((df['zone_code']=='O')&((df['event_team_abbr'] == df[team_col])) | (df['zone_code']=='D')&((df['event_team_abbr'] == df[opp_col]))), 1, 0)
         df['NZF'] = np.where((df['zone_code']=='N') & (df['event_team_abbr']==df[team_col]),1,0)
         df['DZF'] = np.where((df['event_type']=='faceoff') & ((df['zone_code']=='D')&((df['event_team_abbr'] == df[team_col])) | (df['zone_code']=='O')&((df['event_team_abbr'] == df[opp_col]))), 1, 0)
 
-        stats = df.groupby(['ID',team_col,'Season']+(['game_id'] if 'game_id' in second_group else [])).agg(
+        stats = df.groupby(['ID',team_col,'Season']+(['game_id'] if 'game_id' in second_group else []),observed=True).agg(
             GP=('game_id','nunique'),
             TOI=('event_length','sum'),
             FF=('FF', 'sum'),
@@ -180,7 +246,7 @@ def calc_onice(pbp,game_strength,second_group):
     home_stats = process_team_stats(pbp, 'home_on_ice', 'home_team_abbr', 'away_team_abbr',game_strength)
     away_stats = process_team_stats(pbp, 'away_on_ice', 'away_team_abbr', 'home_team_abbr',game_strength)
 
-    onice_stats = pd.concat([home_stats,away_stats]).groupby(['ID','Team','Season']+(['Game'] if 'game_id' in second_group else [])).agg(
+    onice_stats = pd.concat([home_stats,away_stats]).groupby(['ID','Team','Season']+(['Game'] if 'game_id' in second_group else []),observed=True).agg(
             GP=('GP','sum'),
             TOI=('TOI','sum'),
             FF=('FF', 'sum'),
@@ -198,6 +264,10 @@ def calc_onice(pbp,game_strength,second_group):
             DZF=('DZF','sum')
     ).reset_index()
 
+    return standard_dtypes(onice_ratios(onice_stats))
+
+def onice_ratios(onice_stats):
+    #Given on-ice counts, return on-ice stats with ratio columns added
     onice_stats['ShF%'] = onice_stats['GF']/onice_stats['SF']
     onice_stats['xGF/FF'] = onice_stats['xGF']/onice_stats['FF']
     onice_stats['GF/xGF'] = onice_stats['GF']/onice_stats['xGF']
@@ -213,107 +283,167 @@ def calc_onice(pbp,game_strength,second_group):
 
     return onice_stats
 
-def calc_team(pbp,game_strength,second_group):
-    teams = []
-    for team in [('away','home'),('home','away')]:
-        #Flip strength state (when necessary) and filter by game strength if not "all"
-        if game_strength != "all":
-            if game_strength not in ['3v3','4v4','5v5']:
-                for strength in game_strength:
-                    pbp['strength_state'] = np.where(np.logical_and(pbp['event_team_venue']==team[1],pbp['strength_state']==strength[::-1]),strength,pbp['strength_state'])
-
-            pbp = pbp.loc[pbp['strength_state'].isin(game_strength)]
-
-        pbp['xGF'] = np.where(pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'], pbp['xG'], 0)
-        pbp['xGA'] = np.where(pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'], pbp['xG'], 0)
-        pbp['GF'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['GA'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['SF'] = np.where((pbp['event_type'].isin(['shot-on-goal','goal'])) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['SA'] = np.where((pbp['event_type'].isin(['shot-on-goal','goal'])) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['FF'] = np.where((pbp['event_type'].isin(fenwick_events)) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['FA'] = np.where((pbp['event_type'].isin(fenwick_events)) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['CF'] = np.where((pbp['event_type'].isin(fenwick_events+['blocked-shot'])) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['CA'] = np.where((pbp['event_type'].isin(fenwick_events+['blocked-shot'])) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['HF'] =  np.where((pbp['event_type']=='hit') & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['HA'] = np.where((pbp['event_type']=='hit') & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['Penl'] = np.where((pbp['event_type']=='penalty') & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['Penl2'] = np.where((pbp['event_type']=='penalty') & (pbp['penalty_duration']==2) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['Penl5'] = np.where((pbp['event_type']=='penalty') & (pbp['penalty_duration']==5) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['PIM'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), pbp['penalty_duration'], 0)
-        pbp['Draw'] = np.where((pbp['event_type']=='penalty') & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['Give'] = np.where((pbp['event_type']=='giveaway') & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['Take'] = np.where((pbp['event_type']=='takeaway') & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['Block'] = pbp['CA'] - pbp['FA']
-        pbp['RushF'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushA'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushFxG'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), pbp['xG'], 0)
-        pbp['RushAxG'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), pbp['xG'], 0)
-        pbp['RushFG'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushAG'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-
-        stats = pbp.groupby([f'{team[0]}_team_abbr']+second_group).agg(
-            GP=('game_id','nunique'),
-            TOI=('event_length','sum'),
-            FF=('FF', 'sum'),
-            FA=('FA', 'sum'),
-            GF=('GF', 'sum'),
-            GA=('GA', 'sum'),
-            SF=('SF','sum'),
-            SA=('SA','sum'),
-            xGF=('xGF', 'sum'),
-            xGA=('xGA', 'sum'),
-            CF=('CF','sum'),
-            CA=('CA','sum'),
-            HF=('HF','sum'),
-            HA=('HA','sum'),
-            Penl=('Penl','sum'),
-            Penl2=('Penl2','sum'),
-            Penl5=('Penl5','sum'),
-            PIM=('PIM','sum'),
-            Draw=('Draw','sum'),
-            Give=('Give','sum'),
-            Take=('Take','sum'),
-            Block=('Block','sum'),
-            RushF=('RushF','sum'),
-            RushA=('RushA','sum'),
-            RushFxG=('RushFxG','sum'),
-            RushAxG=('RushAxG','sum'),
-            RushFG=('RushFG','sum'),
-            RushAG=('RushAG','sum'),
-        ).reset_index().rename(columns={f'{team[0]}_team_abbr':"Team",'season':"Season",'game_id':'Game'})
-        teams.append(stats)
-    
-    onice_stats = pd.concat(teams).groupby(['Team','Season']+(['Game'] if 'game_id' in second_group else [])).agg(
-            GP=('GP','sum'),
-            TOI=('TOI','sum'),
-            FF=('FF', 'sum'),
-            FA=('FA', 'sum'),
-            GF=('GF', 'sum'),
-            GA=('GA', 'sum'),
-            SF=('SF','sum'),
-            SA=('SA','sum'),
-            xGF=('xGF', 'sum'),
-            xGA=('xGA', 'sum'),
-            CF=('CF','sum'),
-            CA=('CA','sum'),
-            HF=('HF','sum'),
-            HA=('HA','sum'),
-            Penl=('Penl','sum'),
-            Penl2=('Penl2','sum'),
-            Penl5=('Penl5','sum'),
-            PIM=('PIM','sum'),
-            Draw=('Draw','sum'),
-            Give=('Give','sum'),
-            Take=('Take','sum'),
-            Block=('Block','sum'),
-            RushF=('RushF','sum'),
-            RushA=('RushA','sum'),
-            RushFxG=('RushFxG','sum'),
-            RushAxG=('RushAxG','sum'),
-            RushFG=('RushFG','sum'),
-            RushAG=('RushAG','sum'),
-    ).reset_index()
-
+def calc_skater(indv_stats,onice_stats,second_group):
+    #Given individual and on-ice stats, return complete skater stats
+
+    #IDs sometimes set as objects
+    indv_stats['ID'] = indv_stats['ID'].astype(float)
+    onice_stats['ID'] = onice_stats['ID'].astype(float)
+
+    #Merge and add columns for extra stats
+    complete = pd.merge(indv_stats,onice_stats,how="outer",on=['ID','Team','Season']+(['Game'] if 'game_id' in second_group else []))
+    complete['GC%'] = complete['Gi']/complete['GF']
+    complete['AC%'] = (complete['A1']+complete['A2'])/complete['GF']
+    complete['GI%'] = (complete['Gi']+complete['A1']+complete['A2'])/complete['GF']
+    complete['FC%'] = complete['Fi']/complete['FF']
+    complete['xGC%'] = complete['xGi']/complete['xGF']
+    complete['GF%'] = complete['GF']/(complete['GF']+complete['GA'])
+    complete['SF%'] = complete['SF']/(complete['SF']+complete['SA'])
+    complete['xGF%'] = complete['xGF']/(complete['xGF']+complete['xGA'])
+    complete['FF%'] = complete['FF']/(complete['FF']+complete['FA'])
+    complete['CF%'] = complete['CF']/(complete['CF']+complete['CA'])
+
+    #Set TOI to minute and remove players with no TOI
+    complete['TOI'] = complete['TOI']/60
+    complete = complete.loc[complete['TOI']>0]
+
+    #Add per 60 stats
+    for stat in per_sixty:
+        complete[f'{stat}/60'] = (complete[stat]/complete['TOI'])*60
+
+    #Shot Type Metrics
+    type_metrics = []
+    for shot_type in shot_types:
+        for stat in per_sixty[:3]:
+            type_metrics.append(f'{shot_type.capitalize()}{stat}')
+
+    #Remove entries with no ID listed
+    complete = complete.loc[complete['ID'].notna()]
+
+    head = ['ID','Game'] if 'Game' in complete.columns else ['ID']
+    complete = complete[head+[
+        "Season","Team",
+        'GP','TOI',
+        "Gi","A1","A2",'P1','P','Si','Shi%',
+        'Give','Take','PM%','HF','HA','HF%',
+        "Fi","xGi",'xGi/Fi',"Gi/xGi","Fshi%",
+        "GF","SF","FF","xGF","xGF/FF","GF/xGF","ShF%","FshF%",
+        "GA","SA","FA","xGA","xGA/FA","GA/xGA","ShA%","FshA%",
+        'Ci','CF','CA','CF%',
+        'FF%','xGF%','GF%',"SF%",
+        'Rush',"Rush xG",'Rush G',"GC%","AC%","GI%","FC%","xGC%",
+        'F','FW','FL','F%',
+        'Penl','Penl2','Penl5',
+        'Draw','PIM','PENL%',
+        'Block',
+        'OZF','NZF','DZF',
+        'OZF%','NZF%','DZF%',
+        'GSAx'
+    ]+[f'{stat}/60' for stat in per_sixty]+type_metrics]
+
+    return complete
+
+def flip_strength(state,game_strength):
+    #Given strength states and game strength, return strength states flipped into the game strength (as in the original loop, each strength is flipped in turn, so a state may be flipped more than once)
+    flipped = {}
+    for value in state.dropna().unique():
+        flipped[value] = value
+        for strength in game_strength:
+            if flipped[value] == strength[::-1]:
+                flipped[value] = strength
+
+    return state.map(flipped)
+
+def team_perspectives(pbp,game_strength,weights=None):
+    #Given play-by-play, game strength, and adjustment weights, return each event from the perspective of the away team and then the home team (without copying or altering the play-by-play)
+    #Sign is 1 for events by the team, -1 for events by the opposing team, and 0 otherwise
+    state = pbp['strength_state'].astype(object)
+    venue = pbp['event_team_venue']
+    keep = {venue_team: np.ones(len(pbp),dtype=bool) for venue_team in ['away','home']}
+
+    #Flip strength state (when necessary) for events by the opposing team and filter by game strength if not "all"
+    #Events kept for the home team are those kept for the away team which are also in the game strength once events by the away team are flipped
+    if game_strength != "all":
+        flipped = flip_strength(state,game_strength) if game_strength not in ['3v3','4v4','5v5'] else state
+        keep['away'] = state.where(venue!='home',flipped).isin(game_strength).to_numpy()
+        keep['home'] = keep['away']&flipped.where(venue.isin(['away','home']),state).isin(game_strength).to_numpy()
+
+    rows = np.concatenate([np.flatnonzero(keep['away']),np.flatnonzero(keep['home'])])
+    sign = np.concatenate([
+        np.where(pbp['event_team_abbr']==pbp[f'{team}_team_abbr'],1,np.where(pbp['event_team_abbr']==pbp[f'{opp}_team_abbr'],-1,0))[keep[team]]
+        for team, opp in [('away','home'),('home','away')]
+    ])
+
+    #Event indicators are computed once for all events and taken for each perspective
+    event_type = pbp['event_type']
+    weights = event_weights(pbp,weights).to_numpy()[rows]
+    xg = pbp['xG'].astype(float).to_numpy()[rows]
+    duration = pbp['penalty_duration'].astype(float).to_numpy()[rows]
+    rush = (pbp['rush'].astype(float)>0).to_numpy()[rows]
+    is_for = sign>0
+    is_against = sign<0
+    goal, shot, fenwick, corsi, hit, penalty, give, take, block = [event_type.isin(events).to_numpy()[rows] for events in [
+        ['goal'],['shot-on-goal','goal'],fenwick_events,fenwick_events+['blocked-shot'],['hit'],['penalty'],['giveaway'],['takeaway'],['blocked-shot']
+    ]]
+
+    def take_teams(col):
+        #Values of each perspective's team column for the kept events
+        return pd.concat([pbp[f'{team}_{col}'].iloc[np.flatnonzero(keep[team])] for team in ['away','home']],ignore_index=True)
+
+    #Return: events by team perspective
+    return pd.DataFrame({
+        'ID':take_teams('goalie_id'),
+        'Team':take_teams('team_abbr'),
+        'Season':pbp['season'].iloc[rows].reset_index(drop=True),
+        'Game':pbp['game_id'].iloc[rows].reset_index(drop=True),
+        'TOI':pbp['event_length'].iloc[rows].reset_index(drop=True),
+        'FF':np.where(fenwick&is_for,weights[:,1],0),
+        'FA':np.where(fenwick&is_against,weights[:,1],0),
+        'GF':(goal&is_for).astype(int),
+        'GA':(goal&is_against).astype(int),
+        'SF':(shot&is_for).astype(int),
+        'SA':(shot&is_against).astype(int),
+        'xGF':np.where(is_for,xg*weights[:,2],0),
+        'xGA':np.where(is_against,xg*weights[:,2],0),
+        'CF':np.where(corsi&is_for,weights[:,0],0),
+        'CA':np.where(corsi&is_against,weights[:,0],0),
+        'HF':(hit&is_for).astype(int),
+        'HA':(hit&is_against).astype(int),
+        'Penl':(penalty&is_for).astype(int),
+        'Penl2':(penalty&(duration==2)&is_for).astype(int),
+        'Penl5':(penalty&(duration==5)&is_for).astype(int),
+        'PIM':np.where(is_for,duration,0),
+        'Draw':(penalty&is_against).astype(int),
+        'Give':(give&is_for).astype(int),
+        'Take':(take&is_for).astype(int),
+        'Block':(block&is_against).astype(int),
+        'RushF':(rush&is_for).astype(int),
+        'RushA':(rush&is_against).astype(int),
+        'RushFxG':np.where(rush&is_for,xg,0),
+        'RushAxG':np.where(rush&is_against,xg,0),
+        'RushFG':(goal&rush&is_for).astype(int),
+        'RushAG':(goal&rush&is_against).astype(int)
+    })
+
+def sum_perspectives(events,group,stats):
+    #Given events by team perspective, grouping, and stats, return games played and summed stats in a single groupby
+    grouped = events.groupby(group,observed=True)
+    sums = grouped[stats].sum()
+    sums.insert(0,'GP',grouped['Game'].nunique())
+
+    return sums.reset_index()
+
+def team_counts(pbp,game_strength,second_group,weights=None):
+    #Given play-by-play, return games played and additive team counts (see calc_team)
+    events = team_perspectives(pbp,game_strength,weights)
+    return sum_perspectives(events,['Team','Season']+(['Game'] if 'game_id' in second_group else []),[
+        'TOI','FF','FA','GF','GA','SF','SA','xGF','xGA','CF','CA','HF','HA',
+        'Penl','Penl2','Penl5','PIM','Draw','Give','Take','Block',
+        'RushF','RushA','RushFxG','RushAxG','RushFG','RushAG'
+    ])
+
+def team_ratios(onice_stats):
+    #Given team counts, return team stats with ratio columns added
     onice_stats['ShF%'] = onice_stats['GF']/onice_stats['SF']
     onice_stats['xGF/FF'] = onice_stats['xGF']/onice_stats['FF']
     onice_stats['GF/xGF'] = onice_stats['GF']/onice_stats['xGF']
@@ -327,79 +457,21 @@ def calc_team(pbp,game_strength,second_group):
     onice_stats['PENL%'] = onice_stats['Draw']/(onice_stats['Draw']+onice_stats['Penl'])
     onice_stats['GSAx'] = onice_stats['xGA']/onice_stats['GA']
 
-    return onice_stats
+    return standard_dtypes(onice_stats)
 
-def calc_goalie(pbp,game_strength,second_group):
-    teams=[]
-    for team in [('away','home'),('home','away')]:
-        #Flip strength state (when necessary) and filter by game strength if not "all"
-        if game_strength != "all":
-            if game_strength not in ['3v3','4v4','5v5']:
-                for strength in game_strength:
-                    pbp['strength_state'] = np.where(np.logical_and(pbp['event_team_venue']==team[1],pbp['strength_state']==strength[::-1]),strength,pbp['strength_state'])
-
-            pbp = pbp.loc[pbp['strength_state'].isin(game_strength)]
-
-        pbp['xGF'] = np.where(pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'], pbp['xG'], 0)
-        pbp['xGA'] = np.where(pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'], pbp['xG'], 0)
-        pbp['GF'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['GA'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['SF'] = np.where((pbp['event_type'].isin(['shot-on-goal','goal'])) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['SA'] = np.where((pbp['event_type'].isin(['shot-on-goal','goal'])) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['FF'] = np.where((pbp['event_type'].isin(fenwick_events)) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['FA'] = np.where((pbp['event_type'].isin(fenwick_events)) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['CF'] = np.where((pbp['event_type'].isin(fenwick_events+['blocked-shot'])) & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr']), 1, 0)
-        pbp['CA'] = np.where((pbp['event_type'].isin(fenwick_events+['blocked-shot'])) & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr']), 1, 0)
-        pbp['RushF'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushA'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushFxG'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), pbp['xG'], 0)
-        pbp['RushAxG'] = np.where((pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), pbp['xG'], 0)
-        pbp['RushFG'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[0]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-        pbp['RushAG'] = np.where((pbp['event_type'] == "goal") & (pbp['event_team_abbr'] == pbp[f'{team[1]}_team_abbr'])&(pbp['rush']>0), 1, 0)
-
-        stats = pbp.groupby([f'{team[0]}_goalie_id',f'{team[0]}_team_abbr']+second_group).agg(
-            GP=('game_id','nunique'),
-            TOI=('event_length','sum'),
-            FF=('FF', 'sum'),
-            FA=('FA', 'sum'),
-            GF=('GF', 'sum'),
-            GA=('GA', 'sum'),
-            SF=('SF', 'sum'),
-            SA=('SA', 'sum'),
-            xGF=('xGF', 'sum'),
-            xGA=('xGA', 'sum'),
-            CF=('CF','sum'),
-            CA=('CA','sum'),
-            RushF=('RushF','sum'),
-            RushA=('RushA','sum'),
-            RushFxG=('RushFxG','sum'),
-            RushAxG=('RushAxG','sum'),
-            RushFG=('RushFG','sum'),
-            RushAG=('RushAG','sum'),
-        ).reset_index().rename(columns={f'{team[0]}_goalie_id':"ID",f'{team[0]}_team_abbr':"Team",'season':"Season",'game_id':'Game'})
-        teams.append(stats)
-    
-    onice_stats = pd.concat(teams).groupby(['ID','Team','Season']+(['Game'] if 'game_id' in second_group else [])).agg(
-            GP=('GP','sum'),
-            TOI=('TOI','sum'),
-            FF=('FF', 'sum'),
-            FA=('FA', 'sum'),
-            GF=('GF', 'sum'),
-            GA=('GA', 'sum'),
-            SF=('SF', 'sum'),
-            SA=('SA', 'sum'),
-            xGF=('xGF', 'sum'),
-            xGA=('xGA', 'sum'),
-            CF=('CF','sum'),
-            CA=('CA','sum'),
-            RushF=('RushF','sum'),
-            RushA=('RushA','sum'),
-            RushFxG=('RushFxG','sum'),
-            RushAxG=('RushAxG','sum'),
-            RushFG=('RushFG','sum'),
-            RushAG=('RushAG','sum'),
-    ).reset_index()
+def calc_team(pbp,game_strength,second_group,weights=None):
+    return team_ratios(team_counts(pbp,game_strength,second_group,weights))
 
+def goalie_counts(pbp,game_strength,second_group,weights=None):
+    #Given play-by-play, return games played and additive goalie counts (see calc_goalie)
+    events = team_perspectives(pbp,game_strength,weights)
+    return sum_perspectives(events,['ID','Team','Season']+(['Game'] if 'game_id' in second_group else []),[
+        'TOI','FF','FA','GF','GA','SF','SA','xGF','xGA','CF','CA',
+        'RushF','RushA','RushFxG','RushAxG','RushFG','RushAG'
+    ])
+
+def goalie_ratios(onice_stats):
+    #Given goalie counts, return goalie stats with ratio columns added
     onice_stats['ShF%'] = onice_stats['GF']/onice_stats['SF']
     onice_stats['xGF/FF'] = onice_stats['xGF']/onice_stats['FF']
     onice_stats['GF/xGF'] = onice_stats['GF']/onice_stats['xGF']
@@ -410,29 +482,416 @@ def calc_goalie(pbp,game_strength,second_group):
     onice_stats['FshA%'] = onice_stats['GA']/onice_stats['FA']
     onice_stats['GSAx'] = onice_stats['xGA']-onice_stats['GA']
 
-    return onice_stats
+    return standard_dtypes(onice_stats)
 
-def calc_game_score_features(pbp,type):
+def calc_goalie(pbp,game_strength,second_group,weights=None):
+    return goalie_ratios(goalie_counts(pbp,game_strength,second_group,weights))
+
+## ADJUSTMENTS ##
+#Corsi, fenwick, and xG are adjusted for score and venue by weighting each event by the inverse of the share of events taken by teams in the same venue and score state in reference play-by-play
+adjust_cols = ['corsi_weight','fenwick_weight','xG_weight']
+
+def adjustment_states(pbp):
+    #Given play-by-play, return venue and score state (from the perspective of the event team and capped at three goals) of each event
+    score_state = np.where(pbp['event_team_venue']=='away',pbp['away_score']-pbp['home_score'],pbp['home_score']-pbp['away_score'])
+    score_state = np.clip(np.nan_to_num(score_state.astype(float)),-3,3).astype(int)
+
+    return pd.MultiIndex.from_arrays([pbp['event_team_venue'].astype(object),score_state],names=['venue','score_state'])
+
+def adjustment_counts(pbp):
+    #Given reference play-by-play, return corsi, fenwick, and xG events by venue and score state (counts of different play-by-play may be added together)
+    shots = pbp.loc[pbp['event_type'].isin(fenwick_events+['blocked-shot'])&pbp['event_team_venue'].isin(['away','home'])]
+    fenwick = shots['event_type'].isin(fenwick_events)
+
+    #Sum events by venue and score state in one grouped pass
+    counts = pd.DataFrame({'corsi_weight':1,
+                           'fenwick_weight':fenwick.astype(int),
+                           'xG_weight':shots['xG'].where(fenwick,0).fillna(0)},index=shots.index)
+    counts = counts.groupby(adjustment_states(shots)).sum()
+
+    index = pd.MultiIndex.from_product([['away','home'],range(-3,4)],names=['venue','score_state'])
+    return counts.reindex(index,fill_value=0)
+
+def adjustment_weights(counts):
+    #Given adjustment counts, return score and venue adjustment weights for corsi, fenwick, and xG events
+
+    #Events by the opposing team in the same game state are those at the other venue with the reversed score state
+    index = counts.index
+    opposing = counts.reindex(pd.MultiIndex.from_arrays([np.where(index.get_level_values(0)=='away','home','away'),-index.get_level_values(1)])).to_numpy()
+
+    #Events in game states without events from both teams are not adjusted
+    share = counts/(counts+opposing)
+    weights = (0.5/share).where((counts>0)&(opposing>0),1)
+
+    #Return: adjustment weights by venue and score state
+    return weights.reset_index()
+
+def calc_adjustments(pbp):
+    #Given reference play-by-play, return score and venue adjustment weights for corsi, fenwick, and xG events
+    return adjustment_weights(adjustment_counts(pbp))
+
+def event_weights(pbp,weights):
+    #Given play-by-play and adjustment weights (or None), return corsi, fenwick, and xG weights for each event
+    if weights is None:
+        return pd.DataFrame(1,index=pbp.index,columns=adjust_cols)
+    
+    weights = weights.set_index(['venue','score_state'])[adjust_cols]
+    return pd.DataFrame(weights.reindex(adjustment_states(pbp)).fillna(1).to_numpy(),index=pbp.index,columns=adjust_cols)
+
+## STINTS ##
+#Stints are contiguous stretches of play with identical on-ice skaters and goalies, score, and strength
+stint_events = {'goals':['goal'],
+                'shots':['shot-on-goal','goal'],
+                'fenwick':fenwick_events,
+                'corsi':fenwick_events+['blocked-shot']}
+
+def personnel_hash(pbp,venue):
+    #Given play-by-play and venue, return sorted on-ice skater IDs and a hash of the skaters and goalie on the ice for the venue for each event
+    skaters = np.sort(pbp[[f'{venue}_on_{i}_id' for i in range(1,7)]].astype(float).to_numpy(),axis=1)
+    ids = pd.DataFrame(np.column_stack([skaters,pbp[f'{venue}_goalie_id'].astype(float).to_numpy()]))
+
+    return skaters, pd.util.hash_pandas_object(ids,index=False).to_numpy()
+
+def build_stints(pbp):
+    #Given play-by-play (with shootouts removed and xG applied), return stint table with start and end, strength, score, personnel, and event counts and xG for each team
+    #Events of each game must be contiguous and in order (play-by-play combined from several sources may not be)
+    pbp = pbp.sort_values(['game_id','event_num'],kind='stable').reset_index(drop=True)
+    skaters, hashes = {}, {}
+    for venue in ['home','away']:
+        skaters[venue], hashes[venue] = personnel_hash(pbp,venue)
+
+    #Changes in personnel, game, period, strength, or score begin a new stint
+    scores = {venue: pbp[f'{venue}_score'].astype(float).fillna(0).to_numpy() for venue in ['home','away']}
+    change = np.ones(len(pbp),dtype=bool)
+    change[1:] = (hashes['home'][1:]!=hashes['home'][:-1])|(hashes['away'][1:]!=hashes['away'][:-1])
+    for values in [pd.factorize(pbp[col])[0] for col in ['game_id','period','strength_state_venue']]+list(scores.values()):
+        change[1:] |= values[1:]!=values[:-1]
+
+    stint = np.cumsum(change)-1
+    first = np.flatnonzero(change)
+    count = len(first)
+    duration = np.bincount(stint,weights=pbp['event_length'].astype(float).fillna(0).to_numpy(),minlength=count)
+
+    stints = pd.DataFrame({'season':pbp['season'].to_numpy()[first],
+                           'season_type':pbp['season_type'].to_numpy()[first],
+                           'game_id':pbp['game_id'].to_numpy()[first],
+                           'game_date':pbp['game_date'].astype(object).to_numpy()[first],
+                           'period':pbp['period'].to_numpy()[first],
+                           'start_seconds':pbp['seconds_elapsed'].to_numpy()[first],
+                           'duration':duration,
+                           'strength_state_venue':pbp['strength_state_venue'].astype(object).to_numpy()[first],
+                           'home_score':scores['home'][first],
+                           'away_score':scores['away'][first],
+                           'events':np.bincount(stint,minlength=count)})
+    stints.insert(3,'stint',stints.groupby('game_id').cumcount()+1)
+    stints.insert(7,'end_seconds',stints['start_seconds']+stints['duration'])
+
+    #Count events for each team in one pass over the stint labels
+    event_type = pbp['event_type']
+    xg = pbp['xG'].astype(float).fillna(0).to_numpy()
+    for venue in ['home','away']:
+        is_venue = (pbp['event_team_venue']==venue).to_numpy()
+        for col, events in stint_events.items():
+            stints[f'{venue}_{col}'] = np.bincount(stint,weights=is_venue&event_type.isin(events).to_numpy(),minlength=count).astype(int)
+        stints[f'{venue}_xG'] = np.bincount(stint,weights=xg*is_venue,minlength=count)
+
+    #Personnel
+    for venue in ['home','away']:
+        stints[f'{venue}_personnel'] = hashes[venue][first]
+        for i in range(6):
+            stints[f'{venue}_on_{i+1}_id'] = skaters[venue][first,i]
+        stints[f'{venue}_goalie_id'] = pbp[f'{venue}_goalie_id'].astype(float).to_numpy()[first]
+
+    #Return: stint table
+    return stints
+
+## STAT CUBE ##
+#The stat cube stores additive skater counts by player, team, game, and strength state so that stats for any span of games or strengths may be summed rather than recalculated from play-by-play
+#Each row also records whether its events were by the opposing team (events by the opposing team with the reversed strength state are included in on-ice stats, as in calc_onice)
+cube_keys = ['ID','Team','Season','Game','season_type','game_date','strength_state','opp']
+
+#Individual counts by the table of calc_indv they come from (counts for players absent from a table are missing rather than zero in calc_indv)
+cube_indv = {'ep1':['Gi','Si','Fi','Ci','xGi','HF','Give','Take','Penl','Penl2','Penl5','PIM','FW'],
+             'ep2':['A1','HA','Draw','FL','Block'],
+             'ep3':['A2'],
+             'rush':['Rush','Rush G','Rush xG']}
+for shot_type in shot_types:
+    cube_indv[shot_type] = [f'{shot_type.capitalize()}{stat}' for stat in ['Gi','Si','Fi','xGi']]
+
+cube_onice = ['TOI','FF','FA','GF','GA','SF','SA','xGF','xGA','CF','CA','OZF','NZF','DZF']
+
+def cube_counts(df,id_col,team_col,stats,table):
+    #Given events, player and team columns, and dict of counts, return events keyed for the stat cube with counts (and a count of events in the table)
+    counts = pd.DataFrame({'ID':df[id_col].astype(float),
+                           'Team':df[team_col],
+                           'Season':df['season'],
+                           'Game':df['game_id'],
+                           'season_type':df['season_type'],
+                           'game_date':df['game_date'],
+                           'strength_state':df['strength_state'],
+                           'opp':False})
+    
+    #Counts are not assigned to tables without events (assigning a column to an empty frame would take the index of the play-by-play)
+    if counts.empty:
+        return counts
+    
+    for stat, values in stats.items():
+        counts[stat] = values
+    counts[f'n_{table}'] = 1
+
+    #Events without a player or team are not counted (as in calc_indv)
+    return counts.loc[counts['ID'].notna()&counts['Team'].notna()]
+
+def build_stat_cube(pbp,weights=None):
+    #Given play-by-play (with shootouts removed and xG applied) and adjustment weights (or None), return stat cube of skater counts by player, team, game, and strength state
+    #Corsi, fenwick, and xG on-ice counts are weighted as in calc_onice if weights are provided
+    pbp = pbp.reset_index(drop=True)
+    event_type = pbp['event_type']
+    goal = (event_type=='goal').astype(int)
+    frames = []
+
+    #Individual counts (see calc_indv)
+    event_team_abbr_2 = pd.Series(np.where(pbp['event_team_abbr'].notna(),
+        np.where(pbp['event_team_abbr']==pbp['home_team_abbr'],pbp['away_team_abbr'],pbp['home_team_abbr']),np.nan),index=pbp.index)
+    pbp = pbp.assign(event_team_abbr_2=event_team_abbr_2.where(event_type!='goal',pbp['event_team_abbr']))
+
+    ep1 = event_type.isin(["goal", "shot-on-goal", "missed-shot","blocked-shot",'hit','giveaway','takeaway','faceoff','penalty'])
+    frames.append(cube_counts(pbp.loc[ep1],'event_player_1_id','event_team_abbr',{
+        'Gi':goal,
+        'Si':event_type.isin(['shot-on-goal','goal']).astype(int),
+        'Fi':event_type.isin(fenwick_events).astype(int),
+        'Ci':event_type.isin(fenwick_events+['blocked-shot']).astype(int),
+        'xGi':pbp['xG'],
+        'HF':(event_type=='hit').astype(int),
+        'Give':(event_type=='giveaway').astype(int),
+        'Take':(event_type=='takeaway').astype(int),
+        'Penl':(event_type=='penalty').astype(int),
+        'Penl2':(pbp['penalty_duration']==2).astype(int),
+        'Penl5':(pbp['penalty_duration']==5).astype(int),
+        'PIM':pbp['penalty_duration'],
+        'FW':(event_type=='faceoff').astype(int)},'ep1'))
+
+    ep2 = event_type.isin(['goal','blocked-shot','hit','faceoff','penalty'])&~(pbp['description'].str.lower().str.contains('blocked by teammate',na=False))
+    frames.append(cube_counts(pbp.loc[ep2],'event_player_2_id','event_team_abbr_2',{
+        'A1':goal,
+        'HA':(event_type=='hit').astype(int),
+        'Draw':(event_type=='penalty').astype(int),
+        'FL':(event_type=='faceoff').astype(int),
+        'Block':(event_type=='blocked-shot').astype(int)},'ep2'))
+
+    frames.append(cube_counts(pbp.loc[event_type=='goal'],'event_player_3_id','event_team_abbr',{'A2':1},'ep3'))
+
+    rush = event_type.isin(fenwick_events)&(pbp['rush']>0)
+    frames.append(cube_counts(pbp.loc[rush],'event_player_1_id','event_team_abbr',{
+        'Rush':1,
+        'Rush G':goal,
+        'Rush xG':pbp['xG']},'rush'))
+
+    for shot_type in shot_types:
+        shots = event_type.isin(["goal", "shot-on-goal", "missed-shot"])&(pbp['shot_type']==shot_type)
+        name = shot_type.capitalize()
+        frames.append(cube_counts(pbp.loc[shots],'event_player_1_id','event_team_abbr',{
+            f'{name}Gi':goal,
+            f'{name}Si':event_type.isin(['shot-on-goal','goal']).astype(int),
+            f'{name}Fi':1,
+            f'{name}xGi':pbp['xG']},shot_type))
+
+    #On-ice counts for each skater on the ice (see calc_onice)
+    weighted = event_weights(pbp,weights) if weights is not None else None
+    for team, opp in [('home','away'),('away','home')]:
+        team_abbr = pbp[f'{team}_team_abbr']
+        opp_abbr = pbp[f'{opp}_team_abbr']
+        is_for = pbp['event_team_abbr']==team_abbr
+        is_against = pbp['event_team_abbr']==opp_abbr
+
+        counts = pd.DataFrame({
+            'Team':team_abbr,
+            'Season':pbp['season'],
+            'Game':pbp['game_id'],
+            'season_type':pbp['season_type'],
+            'game_date':pbp['game_date'],
+            'strength_state':pbp['strength_state'],
+            'opp':pbp['event_team_venue']==opp,
+            'TOI':pbp['event_length'],
+            'FF':(event_type.isin(fenwick_events)&is_for).astype(int),
+            'FA':(event_type.isin(fenwick_events)&is_against).astype(int),
+            'GF':((event_type=='goal')&is_for).astype(int),
+            'GA':((event_type=='goal')&is_against).astype(int),
+            'SF':(event_type.isin(['shot-on-goal','goal'])&is_for).astype(int),
+            'SA':(event_type.isin(['shot-on-goal','goal'])&is_against).astype(int),
+            'xGF':pbp['xG'].where(is_for,0),
+            'xGA':pbp['xG'].where(is_against,0),
+            'CF':(event_type.isin(fenwick_events+['blocked-shot'])&is_for).astype(int),
+            'CA':(event_type.isin(fenwick_events+['blocked-shot'])&is_against).astype(int),
+            'OZF':((event_type=='faceoff')&(((pbp['zone_code']=='O')&is_for)|((pbp['zone_code']=='D')&is_against))).astype(int),
+            'NZF':((pbp['zone_code']=='N')&is_for).astype(int),
+            'DZF':((event_type=='faceoff')&(((pbp['zone_code']=='D')&is_for)|((pbp['zone_code']=='O')&is_against))).astype(int),
+            'n_onice':1})
+
+        if weighted is not None:
+            for cols, weight in [(['CF','CA'],'corsi_weight'),(['FF','FA'],'fenwick_weight'),(['xGF','xGA'],'xG_weight')]:
+                counts[cols] = counts[cols].mul(weighted[weight],axis=0)
+
+        #Each skater on the ice receives the counts of the event
+        for i in range(1,7):
+            ids = pbp[f'{team}_on_{i}_id'].astype(float)
+            frames.append(counts.assign(ID=ids).loc[ids.notna()])
+
+    #Tables without events are skipped (their counts are added as zeros)
+    stats = [col for table in cube_indv for col in cube_indv[table]+[f'n_{table}']]+cube_onice+['n_onice']
+    cube = pd.concat([frame for frame in frames if not frame.empty],ignore_index=True).reindex(columns=cube_keys+stats)
+    
+    #Return: stat cube (missing strength states are kept for stats at all strengths)
+    return cube.groupby(cube_keys,dropna=False,observed=True,sort=False)[stats].sum().reset_index()
+
+def sum_stat_cube(cube,game_strength,second_group):
+    #Given stat cube, game strength, and grouping, return summed counts and games played (sums of stat cubes of different games may be added together)
+    if game_strength != "all":
+        state = cube['strength_state'].astype(object)
+        keep = state.isin(game_strength)
+        
+        #Events by the opposing team with the reversed strength state are flipped into the requested strengths for on-ice stats (individual counts are never recorded for these rows)
+        if game_strength not in ['3v3','4v4','5v5']:
+            keep = keep|(cube['opp']&state.map(lambda x: x[::-1] if isinstance(x,str) else x).isin(game_strength))
+
+        cube = cube.loc[keep]
+
+    group = ['ID','Team','Season']+(['Game'] if 'game_id' in second_group else [])
+    stats = [col for col in cube.columns if col not in cube_keys]
+    sums = cube.groupby(group,observed=True)[stats].sum()
+
+    #Games played are games with on-ice events
+    sums['GP'] = cube.loc[cube['n_onice']>0].groupby(group,observed=True)['Game'].nunique()
+
+    return sums.reset_index()
+
+def stat_cube_ratios(sums,second_group):
+    #Given summed stat cube counts, return individual and on-ice stats equivalent to calc_indv and calc_onice
+    group = ['ID','Team','Season']+(['Game'] if 'game_id' in second_group else [])
+
+    #Individual stats for players present in any individual table (counts from a table the player is absent from are missing)
+    tables = list(cube_indv.keys())
+    indv = sums.loc[sums[[f'n_{table}' for table in tables]].sum(axis=1)>0,group+[col for table in tables for col in cube_indv[table]]+[f'n_{table}' for table in tables]].copy()
+    for table in tables:
+        for col in cube_indv[table]:
+            indv[col] = indv[col].where(indv[f'n_{table}']>0)
+    indv = indv.drop(columns=[f'n_{table}' for table in tables])
+
+    onice = sums.loc[sums['n_onice']>0,group+['GP']+cube_onice].copy()
+
+    #Return: individual and on-ice stats
+    return standard_dtypes(indv_ratios(indv)), standard_dtypes(onice_ratios(onice))
+
+def query_stat_cube(cube,game_strength,second_group):
+    #Given stat cube, game strength, and grouping, return individual and on-ice stats equivalent to calc_indv and calc_onice
+    return stat_cube_ratios(sum_stat_cube(cube,game_strength,second_group),second_group)
+
+## PARTITIONED STATS ##
+#Stats over more play-by-play than fits in memory are calculated from partitions (files or frames of complete games) read one at a time
+#Each partition is reduced to additive partial stats (counts and games played by player or team) which are summed after every partial_batch partitions, so memory is bounded by the number of players and teams rather than the number of events
+#Ratios, shares, and rates are only calculated once all partials are merged
+partition_types = ['.csv','.csv.gz','.parquet']
+partial_keys = {'skater':['ID','Team','Season'],
+                'goalie':['ID','Team','Season'],
+                'team':['Team','Season']}
+partial_batch = 32
+
+#Subdirectories of the sources directory holding the HTML, JSON, and shift events of each game before they are combined (these are not play-by-play)
+source_dirs = ['HTML','JSON','SHIFTS']
+
+def partition_files(path):
+    #Given directory (searched recursively) or file path, return sorted play-by-play partition files (such as the games exported with the sources option of scraping functions)
+    if os.path.isfile(path):
+        return [path]
+    
+    files = []
+    for root, dirs, names in os.walk(path):
+        #Only complete games are read from a sources directory (events of the documents of each game would otherwise be counted again)
+        dirs[:] = [name for name in dirs if name not in source_dirs]
+        files += [os.path.join(root,name) for name in names if any(name.endswith(ext) for ext in partition_types)]
+    
+    return sorted(files)
+
+def read_partition(partition,cols=stats_cols):
+    #Given play-by-play partition (file path or frame), return play-by-play with only the provided columns and xG
+    #Only the required columns are read from files with xG (the xG model requires complete play-by-play so other files are read in full)
+    if isinstance(partition, pd.DataFrame):
+        pbp = partition
+    elif partition.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        names = pq.read_schema(partition).names
+        pbp = pd.read_parquet(partition,columns=[col for col in cols if col in names] if 'xG' in names else None)
+    else:
+        names = pd.read_csv(partition,nrows=0).columns
+        pbp = pd.read_csv(partition,usecols=[col for col in cols if col in names] if 'xG' in names else None)
+
+    if 'xG' not in pbp.columns:
+        pbp = wsba_xG(pbp)
+
+    return project_columns(pbp,cols)
+
+def iter_partitions(partitions):
+    #Given directory, file path, or list (or iterable) of file paths and frames, yield each partition
+    if isinstance(partitions, (str, os.PathLike)):
+        partitions = partition_files(os.fspath(partitions))
+    elif isinstance(partitions, pd.DataFrame):
+        partitions = [partitions]
+
+    for partition in partitions:
+        if isinstance(partition, (str, os.PathLike)):
+            for path in partition_files(os.fspath(partition)):
+                yield path
+        else:
+            yield partition
+
+def partial_stats(pbp,type,game_strength,second_group,weights=None):
+    #Given play-by-play of complete games (with shootouts removed and xG applied), return additive partial stats of the type ('skater', 'goalie', or 'team')
+    if type == 'skater':
+        return sum_stat_cube(build_stat_cube(pbp,weights),game_strength,second_group)
+    elif type == 'goalie':
+        return goalie_counts(pbp,game_strength,second_group,weights)
+    else:
+        return team_counts(pbp,game_strength,second_group,weights)
+
+def merge_partials(partials,type,second_group):
+    #Given list of partial stats, return their sum by player or team (games played are summed, so each game must be in only one partition)
+    partials = [partial for partial in partials if not partial.empty]
+    if not partials:
+        return pd.DataFrame()
+    
+    group = partial_keys[type]+(['Game'] if 'game_id' in second_group else [])
+    return pd.concat(partials,ignore_index=True).groupby(group,observed=True).sum().reset_index()
+
+def partial_ratios(partial,type,second_group):
+    #Given merged partial stats, return stats of the type with ratio columns added (equivalent to calc_skater, calc_goalie, and calc_team)
+    if type == 'skater':
+        indv_stats, onice_stats = stat_cube_ratios(partial,second_group)
+        return calc_skater(indv_stats,onice_stats,second_group)
+    elif type == 'goalie':
+        return goalie_ratios(partial)
+    else:
+        return team_ratios(partial)
+
+def game_score_features(pbp,types=['skater','goalie']):
+    #Given play-by-play and types ('skater' and/or 'goalie'), return dict of game score features by player and game for each type
+    #Skater features at each strength are summed from one stat cube of the play-by-play rather than recalculated from play-by-play for each strength
     clean_group = ['ID','Team','Season','Game']
     second_group = ['season','game_id']
 
     team_stats = calc_team(pbp,'all',['season','game_id'])[['Team','Season','Game','GF','GA']].rename(columns={'GF':'Team GF', 'GA':'Team GA'})
 
-    if type == 'skater':
-        df = calc_indv(pbp,'all',second_group)[
+    features = {}
+    if 'skater' in types:
+        cube = build_stat_cube(pbp)
+        df = query_stat_cube(cube,'all',second_group)[0][
             clean_group+
             ['P','PENL%','PM%','F%']
         ]
         
         for key, strengths in strengths_list.items():
-            indv = calc_indv(pbp,strengths,second_group)[
-                clean_group+
-                ['xGi']
-            ]
-            onice = calc_onice(pbp,strengths,second_group)[
-                clean_group+
-                ['xGF','xGA']
-            ]
+            indv, onice = query_stat_cube(cube,strengths,second_group)
+            indv = indv[clean_group+['xGi']]
+            onice = onice[clean_group+['xGF','xGA']]
 
             indv['ID'] = indv['ID'].astype(float)
             onice['ID'] = onice['ID'].astype(float)
@@ -443,20 +902,25 @@ def calc_game_score_features(pbp,type):
 
             df = pd.merge(df,stats,how='left')
         
-        team_stats['T-GD'] = team_stats['Team GF'] - team_stats['Team GA']
+        skater_stats = team_stats.copy()
+        skater_stats['T-GD'] = skater_stats['Team GF'] - skater_stats['Team GA']
         
-        df = pd.merge(df,team_stats,how='left')
-        score = df.replace([np.inf,-np.inf],np.nan).fillna(0)
+        df = pd.merge(df,skater_stats,how='left')
+        features['skater'] = df.replace([np.inf,-np.inf],np.nan).fillna(0)
 
-    else:  
+    if 'goalie' in types:
         score = calc_goalie(pbp,'all',['season','game_id'])[['ID','Season','Team','Game','xGF','xGA','GA/xGA']]
         score = pd.merge(score,team_stats,how='left')
 
         score['xGF%'] = score['xGF']/(score['xGF']+score['xGA'])
         score['T-GD'] = score['Team GF'] - score['Team GA']
-        score = score.drop(columns=['xGF','xGA','Team GF','Team GA']).replace([np.inf,-np.inf],np.nan).fillna(0)
+        features['goalie'] = score.drop(columns=['xGF','xGA','Team GF','Team GA']).replace([np.inf,-np.inf],np.nan).fillna(0)
+
+    return features
 
-    return score
+def calc_game_score_features(pbp,type):
+    #Given play-by-play and type ('skater' or 'goalie'), return game score features by player and game
+    return game_score_features(pbp,[type])[type]
 
 def shooting_impacts(agg, type):
     #Given stats table generated from the nhl_calculate_stats function, return table with shot impacts
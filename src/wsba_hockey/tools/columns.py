@@ -599,6 +599,12 @@ def col_map():
             "PIM/60":"penalty_minutes_per_sixty",
             "Block/60":"blocked_shots_per_sixty",
             "GSAx/60":"goals_saved_above_expected_per_sixty",
+            "xGF/60 RAPM":"expected_goals_for_per_sixty_rapm",
+            "xGA/60 RAPM":"expected_goals_against_per_sixty_rapm",
+            "xG+/-/60 RAPM":"expected_goals_plus_minus_per_sixty_rapm",
+            "CF/60 RAPM":"corsi_for_per_sixty_rapm",
+            "CA/60 RAPM":"corsi_against_per_sixty_rapm",
+            "C+/-/60 RAPM":"corsi_plus_minus_per_sixty_rapm",
             "WristFi":"wrist_fenwick",
             "WristxGi":"wrist_expected_goals",
             "WristGi":"wrist_goals",
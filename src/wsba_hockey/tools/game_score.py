@@ -36,6 +36,8 @@ dir = os.path.dirname(os.path.realpath(__file__))
 model_path = os.path.join(dir,'game_score\\')
 roster_path = os.path.join(dir,'rosters\\nhl_rosters.csv')
 schedule_path = os.path.join(dir,'schedule\\schedule.csv')
+stats_path = os.path.join(dir,'game_score','stats')
+target = 'team_goal_differential'
 
 def game_score_model(pbp,types=['skater','goalie']):
     for t in types:
@@ -60,3 +62,102 @@ def game_score_model(pbp,types=['skater','goalie']):
 
         with open(os.path.join(model_path, f'wsba_gs_{t}.json'), "w") as f:
             json.dump(model_json, f, indent=4)
+
+## INCREMENTAL RETRAINING ##
+#Sufficient statistics of the training data (count, sums, X^T X, and X^T y of the features and target) are kept on disk for each season and type
+#Feature means and variances and the standardized ridge regression (equivalent to game_score_model) follow from these sums, so new games only add to the sums of their season
+
+def feature_stats(stats,t):
+    #Given game score features (with standardized column names) and type, return sufficient statistics of the features and target
+    x = stats[skater if t=='skater' else goalie].to_numpy(dtype=float)
+    y = stats[target].to_numpy(dtype=float)
+
+    return {
+        'n':len(x),
+        'sum_x':x.sum(axis=0),
+        'sum_y':y.sum(),
+        'xtx':x.T@x,
+        'xty':x.T@y
+    }
+
+def load_season_stats(season,t,path=stats_path):
+    #Given season, type, and path, return stored sufficient statistics of the season (and the games they include) or None if there are none
+    file = os.path.join(path,f'wsba_gs_{t}_{season}.json')
+    if not os.path.exists(file):
+        return None
+    
+    with open(file) as f:
+        data = json.load(f)
+
+    return {key: np.array(value) if isinstance(value,list) and key != 'games' else value for key, value in data.items()}
+
+def save_season_stats(season,t,season_stats,path=stats_path):
+    #Given season, type, sufficient statistics, and path, write statistics of the season to disk
+    os.makedirs(path,exist_ok=True)
+    with open(os.path.join(path,f'wsba_gs_{t}_{season}.json'),'w') as f:
+        json.dump({key: value.tolist() if isinstance(value,np.ndarray) else value for key, value in season_stats.items()},f)
+
+def update_game_score_stats(pbp,types=['skater','goalie'],path=stats_path):
+    #Given play-by-play of new games, add game score features of the games to the stored sufficient statistics of their seasons
+    #Only the features of the provided games are calculated and games already included in the statistics are skipped
+    features = agg.game_score_features(pbp,types)
+
+    for t in types:
+        stats = features[t].rename(columns=col_map()['stats'])
+        for season, df in stats.groupby('season'):
+            season_stats = load_season_stats(season,t,path)
+            games = [] if season_stats is None else season_stats['games']
+
+            df = df.loc[~df['game_id'].isin(games)]
+            if df.empty:
+                continue
+
+            new = feature_stats(df,t)
+            if season_stats is not None:
+                new = {key: season_stats[key]+new[key] for key in new}
+            new['games'] = games+[int(game) for game in df['game_id'].unique()]
+
+            save_season_stats(season,t,new,path)
+
+def fit_game_score(season_stats,t,alpha=1.0):
+    #Given sufficient statistics of one or more seasons and type, return model data of the ridge regression of the target on standardized features
+    n = sum(stats['n'] for stats in season_stats)
+    sum_x = sum(stats['sum_x'] for stats in season_stats)
+    sum_y = sum(stats['sum_y'] for stats in season_stats)
+    xtx = sum(stats['xtx'] for stats in season_stats)
+    xty = sum(stats['xty'] for stats in season_stats)
+
+    #Feature means and variances (features without variance are not scaled, as in StandardScaler)
+    mean = sum_x/n
+    mean_y = sum_y/n
+    scale = np.sqrt(np.maximum(np.diag(xtx)/n-mean**2,0))
+    scale = np.where(scale < 10*np.finfo(float).eps,1.0,scale)
+
+    #Centered cross products of the standardized features and target, solved in closed form
+    zz = (xtx-n*np.outer(mean,mean))/np.outer(scale,scale)
+    zy = (xty-n*mean*mean_y)/scale
+    coefficients = np.linalg.solve(zz+alpha*np.eye(len(mean)),zy)
+
+    return {
+        "coefficients": coefficients.tolist(),
+        "intercept": float(mean_y),
+        "features": skater if t=='skater' else goalie,
+        "scaler_mean": mean.tolist(),
+        "scaler_scale": scale.tolist()
+    }
+
+def retrain_game_score_model(pbp=None,types=['skater','goalie'],seasons=None,alpha=1.0,path=stats_path):
+    #Given play-by-play of new games (optional), types, and seasons to train on (all stored seasons by default), update stored statistics and write retrained game score models
+    if pbp is not None:
+        update_game_score_stats(pbp,types,path)
+
+    for t in types:
+        files = [file for file in os.listdir(path) if file.startswith(f'wsba_gs_{t}_')] if os.path.exists(path) else []
+        stored = sorted(int(file.split('_')[-1].split('.')[0]) for file in files)
+        season_stats = [load_season_stats(season,t,path) for season in stored if seasons is None or season in seasons]
+
+        if not season_stats:
+            continue
+
+        with open(os.path.join(model_path, f'wsba_gs_{t}.json'), "w") as f:
+            json.dump(fit_game_score(season_stats,t,alpha), f, indent=4)
@@ -0,0 +1,160 @@
+import json as json_lib
+import numpy as np
+import pandas as pd
+from wsba_hockey.tools.scraping import *
+from wsba_hockey.tools.xg_model import wsba_xG
+from wsba_hockey.tools.utils.fetch import conditional_get
+
+### LIVE FUNCTIONS ###
+# Provided in this file are functions used to track games in progress in the WSBA Hockey Python package. #
+
+## ORDER OF OPERATIONS ##
+# Request play-by-play json (conditionally) and stop if it has not changed (unless json plays are waiting for the HTML report)
+# Request json shifts and HTML documents (conditionally)
+# Parse HTML events after the last processed event number and json plays after the last processed sort order
+# Re-parse shifts only if the shifts document has changed
+# Finalize the running play-by-play and apply xG
+# Return events which have not been emitted previously
+
+## GLOBAL VARIABLES ##
+final_states = ['OFF','FINAL']
+
+#Polls of a final game allowed for the HTML report to catch up to the json before tracking stops
+settle_polls = 6
+
+def event_keys(pbp):
+    #Given play-by-play, return keys identifying each event between polls (event numbers are recalibrated every poll)
+    base = pbp['event_type'].astype(str)+"|"+pbp['period'].astype(str)+"|"+pbp['seconds_elapsed'].astype(str)+"|"+pbp['event_team_abbr'].astype(str)
+
+    return pd.Series(np.where(pbp['event_id'].notna(),
+                              'id'+pbp['event_id'].astype(str),
+                              np.where(pbp['event_type']=='change',base,base+"|"+pbp['description'].astype(str))),
+                     index=pbp.index)
+
+class LiveGame:
+    #Tracker for a single game in progress; each call to poll() returns only the events which are new since the previous call
+
+    def __init__(self, game_id, xg=True):
+        self.game_id = str(game_id)
+        self.xg = xg
+
+        #Conditional request cache (ETag, Last-Modified, and content by url)
+        self.cache = {}
+        self.coaches = None
+
+        #Last processed json play (sortOrder) and HTML event (event number)
+        self.last_sort_order = -1
+        self.last_event_num = 0
+
+        #Running events, shifts, and complete play-by-play
+        self.events = pd.DataFrame()
+        self.shifts = pd.DataFrame()
+        self.pbp = pd.DataFrame()
+
+        self.seen = set()
+        self.game_state = None
+
+        #Whether json plays after the last processed play have not been matched to HTML events yet, and polls since the game became final
+        self.pending = False
+        self.final_polls = 0
+
+    @property
+    def final(self):
+        return self.game_state in final_states
+
+    @property
+    def done(self):
+        #Tracking stops once the game is final and every json play is matched (or the HTML report has had settle_polls polls to catch up)
+        return self.final and (not self.pending or self.final_polls >= settle_polls)
+
+    def poll(self):
+        #Return new events since the last poll (empty dataframe if nothing has changed)
+        game_id = self.game_id
+
+        if self.final:
+            self.final_polls += 1
+
+        #Retreive play-by-play json; nothing else is requested if it has not changed (unless json plays are still waiting for the HTML report)
+        content, changed = conditional_get(f"https://api-web.nhle.com/v1/gamecenter/{game_id}/play-by-play", self.cache)
+        if not changed and not self.pending:
+            return pd.DataFrame()
+
+        json = json_lib.loads(content)
+        if json['gameState'] in ['FUT','PRE']:
+            return pd.DataFrame()
+
+        shifts, shifts_changed = conditional_get(f"https://api.nhle.com/stats/rest/en/shiftcharts?cayenneExp=gameId={game_id}", self.cache)
+
+        #Coaches do not change over the course of a game
+        if self.coaches is None:
+            self.coaches = get_game_coaches(game_id)
+
+        info = parse_game_info(json, json_lib.loads(shifts), self.coaches)
+        self.game_state = info['game_state']
+
+        #Retreive HTML documents
+        season = info['season']
+        html, html_changed = conditional_get(f"https://www.nhl.com/scores/htmlreports/{season}/PL{game_id[-6:]}.HTM", self.cache)
+        info['documents'] = {'html_pbp':html}
+
+        if len(info['json_shifts']) == 0:
+            for venue, code in [('home','H'),('away','V')]:
+                doc, doc_changed = conditional_get(f"https://www.nhl.com/scores/htmlreports/{season}/T{code}{game_id[-6:]}.HTM", self.cache)
+                info['documents'][f'html_shifts_{venue}'] = doc
+                shifts_changed = shifts_changed or doc_changed
+
+        #Parse new plays only
+        plays = info['events']
+        new_plays = plays.loc[plays['sortOrder'] > self.last_sort_order] if not plays.empty else plays
+        new_events = False
+
+        #Plays are parsed when either document has changed (the json turning final releases events held below)
+        if (html_changed or changed) and not new_plays.empty:
+            info['events'] = new_plays.reset_index(drop=True)
+            events = combine_pbp(info, False, self.last_event_num)
+
+            if not events.empty:
+                #The HTML occasionally updates before the json; hold events trailing the last json match until the next poll (unless the game is over)
+                matched = events.loc[events['event_id'].notna(),'event_num']
+                if not self.final:
+                    events = events.loc[events['event_num'] <= (matched.max() if not matched.empty else 0)]
+
+                if not events.empty:
+                    sort_orders = new_plays.set_index('eventId')['sortOrder']
+                    matched_orders = sort_orders.loc[sort_orders.index.isin(events['event_id'])]
+
+                    self.last_event_num = int(events['event_num'].max())
+                    self.last_sort_order = int(matched_orders.max()) if not matched_orders.empty else self.last_sort_order
+                    self.events = pd.concat([self.events, events])
+                    new_events = True
+
+        #Json plays after the last matched play are parsed again on later polls even if the json does not change
+        self.pending = bool((plays['sortOrder'] > self.last_sort_order).any()) if not plays.empty else False
+
+        #Shifts are only re-parsed when the document has changed
+        if shifts_changed:
+            try:
+                self.shifts = combine_shifts(info, False)
+                new_events = True
+            except (KeyError, IndexError, ValueError):
+                #Shifts may not be available early in a game
+                pass
+
+        if not new_events:
+            return pd.DataFrame()
+
+        #Finalize running play-by-play (coordinates are recalibrated with all events as the median shot location changes as the game progresses)
+        events = adjust_coords(self.events.copy()) if not self.events.empty else self.events
+        pbp = finalize_data(pd.concat([events, self.shifts]), info)
+
+        if self.xg:
+            pbp = wsba_xG(pbp)
+
+        self.pbp = pbp
+
+        #Return: events which have not been emitted
+        keys = event_keys(pbp)
+        delta = pbp.loc[~keys.isin(self.seen)]
+        self.seen.update(keys.to_list())
+
+        return delta
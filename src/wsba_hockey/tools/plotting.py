@@ -1,15 +1,17 @@
 import os
+import multiprocessing
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
 from matplotlib.lines import Line2D
 from matplotlib.colors import Normalize
+from concurrent.futures import ProcessPoolExecutor
 from hockey_rink import NHLRink
 from hockey_rink import CircularImage
-from scipy.interpolate import griddata
 from scipy.ndimage import gaussian_filter
 from wsba_hockey.tools.xg_model import *
+from wsba_hockey.tools.agg import project_columns, row_index, onice_index, onice_rows
 
 ### PLOTTING FUNCTIONS ###
 # Provided in this file are basic plotting functions for the WSBA Hockey Python package. #
@@ -76,12 +78,26 @@ def wsba_rink(display_range='offense',rotation = 0):
             despine=True
         )
 
+#Columns of play-by-play used in plotting (plots are made from a projection of these columns, leaving the provided play-by-play unchanged)
+plot_cols = ['season','season_type','game_id','game_date','event_type','event_team_abbr','event_team_venue','away_team_abbr','home_team_abbr','strength_state',
+             'x','y','x_adj','y_adj','event_distance','empty_net','xG','is_goal','is_corsi','event_player_1_id','event_player_1_name']+[f'{venue}_on_{i}{suffix}' for venue in ['away','home'] for i in range(1,7) for suffix in ['','_id']]
+
 def prep_plot_data(pbp,strengths,season_types=2,marker_dict=event_markers):
     try: pbp['xG']
     except:
         pbp = wsba_xG(pbp)
         pbp['xG'] = np.where(pbp['xG'].isna(),0,pbp['xG'])
 
+    if isinstance(season_types, int):
+        season_types = [season_types]
+
+    #Filter by season type and strength (in either direction) before projecting the required columns
+    rows = pbp['season_type'].isin(season_types)
+    if strengths != 'all':
+        rows &= (pbp['strength_state'].isin(strengths)) | (pbp['strength_state'].str[::-1].isin(strengths))
+
+    pbp = project_columns(pbp,plot_cols,rows)
+
     pbp['wsba_id'] = pbp['event_player_1_id'].astype(str)+pbp['season'].astype(str)+pbp['event_team_abbr']
     
     pbp['event_team_abbr_2'] = np.where(pbp['event_team_venue']=='home',pbp['away_team_abbr'],pbp['home_team_abbr'])
@@ -89,31 +105,9 @@ def prep_plot_data(pbp,strengths,season_types=2,marker_dict=event_markers):
     pbp['x_plot'] = np.where(pbp['x']<0,-pbp['y_adj'],pbp['y_adj'])
     pbp['y_plot'] = abs(pbp['x_adj'])
 
-    pbp['home_on_ice'] = pbp['home_on_1'].astype(str) + ";" + pbp['home_on_2'].astype(str) + ";" + pbp['home_on_3'].astype(str) + ";" + pbp['home_on_4'].astype(str) + ";" + pbp['home_on_5'].astype(str) + ";" + pbp['home_on_6'].astype(str)
-    pbp['away_on_ice'] = pbp['away_on_1'].astype(str) + ";" + pbp['away_on_2'].astype(str) + ";" + pbp['away_on_3'].astype(str) + ";" + pbp['away_on_4'].astype(str) + ";" + pbp['away_on_5'].astype(str) + ";" + pbp['away_on_6'].astype(str)
-
-    pbp['home_on_ice_id'] = pbp['home_on_1_id'].astype(str) + ";" + pbp['home_on_2_id'].astype(str) + ";" + pbp['home_on_3_id'].astype(str) + ";" + pbp['home_on_4_id'].astype(str) + ";" + pbp['home_on_5_id'].astype(str) + ";" + pbp['home_on_6_id'].astype(str)
-    pbp['away_on_ice_id'] = pbp['away_on_1_id'].astype(str) + ";" + pbp['away_on_2_id'].astype(str) + ";" + pbp['away_on_3_id'].astype(str) + ";" + pbp['away_on_4_id'].astype(str) + ";" + pbp['away_on_5_id'].astype(str) + ";" + pbp['away_on_6_id'].astype(str)
-
-    pbp['onice_for_name'] = np.where(pbp['home_team_abbr']==pbp['event_team_abbr'],pbp['home_on_ice'],pbp['away_on_ice'])
-    pbp['onice_against_name'] = np.where(pbp['away_team_abbr']==pbp['event_team_abbr'],pbp['home_on_ice'],pbp['away_on_ice'])
-
-    pbp['onice_for_id'] = np.where(pbp['home_team_abbr']==pbp['event_team_abbr'],pbp['home_on_ice_id'],pbp['away_on_ice_id'])
-    pbp['onice_against_id'] = np.where(pbp['away_team_abbr']==pbp['event_team_abbr'],pbp['home_on_ice_id'],pbp['away_on_ice_id'])
-
-    pbp['strength_state_2'] = pbp['strength_state'].str[::-1]
-
     pbp['size'] = np.where(pbp['xG']<0.05,20,pbp['xG']*400)
     pbp['marker'] = pbp['event_type'].replace(marker_dict)
 
-    if isinstance(season_types, int):
-        season_types = [season_types]
-
-    pbp = pbp.loc[pbp['season_type'].isin(season_types)]
-
-    if strengths != 'all':
-        pbp = pbp.loc[(pbp['strength_state'].isin(strengths)) | (pbp['strength_state_2'].isin(strengths))]
-
     pbp['is_shot'] = pbp['event_type'].isin(metric_events['Shots']).astype(int)
     pbp['is_fenwick'] = pbp['event_type'].isin(metric_events['Fenwick']).astype(int)
     pbp['is_give'] = (pbp['event_type'] == 'giveaway').astype(int)
@@ -121,94 +115,198 @@ def prep_plot_data(pbp,strengths,season_types=2,marker_dict=event_markers):
 
     return pbp
 
+## PLOT CONTEXT ##
+class PlotContext:
+    #Play-by-play shared by plots, prepared once (see prep_plot_data) for each selection of strengths and season types
+    #Prepared events are indexed by game, team, shooter, and on-ice players, so each plot only looks up its own rows
+
+    def __init__(self, pbp, marker_dict = event_markers):
+        try: pbp['xG']
+        except:
+            pbp = wsba_xG(pbp)
+            pbp['xG'] = np.where(pbp['xG'].isna(),0,pbp['xG'])
+
+        self.pbp = project_columns(pbp,plot_cols+heatmap_cols)
+        self.marker_dict = marker_dict
+        self.selections = {}
+        self.grids = None
+
+    def select(self, strengths, season_types):
+        #Return prepared play-by-play of the selection and its indices
+        if isinstance(season_types, int):
+            season_types = [season_types]
+
+        key = (tuple(strengths) if strengths != 'all' else 'all',tuple(season_types))
+        if key not in self.selections:
+            data = prep_plot_data(self.pbp,strengths,season_types,self.marker_dict).reset_index(drop=True)
+            rows = np.arange(len(data))
+
+            self.selections[key] = (data, {
+                'game':row_index(data['game_id'],rows),
+                'team':row_index(pd.concat([data['away_team_abbr'],data['home_team_abbr']]).to_numpy(),np.tile(rows,2)),
+                'shooter_id':row_index(data['event_player_1_id'],rows),
+                'shooter_name':row_index(data['event_player_1_name'],rows),
+                'onice_id':onice_index(data),
+                'onice_name':onice_index(data,'')
+            })
+
+        return self.selections[key]
+
+    def rows(self, strengths, season_types, by, value, situation = 'all'):
+        #Return row positions of prepared events of the selection for a game, team, shooter, or on-ice player (by 'game', 'team', 'shooter_id', 'shooter_name', 'onice_id', or 'onice_name')
+        #Situation ('for', 'against', or 'all') only applies to on-ice players
+        data, index = self.select(strengths,season_types)
+        if by.startswith('onice'):
+            return onice_rows(data,index[by],value,situation)
+        
+        return index[by].get(value,np.array([],dtype=int))
+
+    def events(self, strengths, season_types, by, value, situation = 'all'):
+        #Return prepared events of the selection for a game, team, shooter, or on-ice player (see rows)
+        data = self.select(strengths,season_types)[0]
+        return data.iloc[self.rows(strengths,season_types,by,value,situation)]
+
+    def heatmap_grids(self):
+        #Return shot grids for heatmaps (built once)
+        if self.grids is None:
+            self.grids = HeatmapGrids(self.pbp)
+
+        return self.grids
+
+## HEATMAP GRIDS ##
+#Shots are binned into one-foot cells of the offensive half of the rink (shots against are placed in the same cells rotated to the defensive half)
+grid_x = np.arange(0,101)
+grid_y = np.linspace(-42.5,42.5,86)
+grid_sigma = 3
+
+#Columns of play-by-play used in heatmaps
+heatmap_cols = ['season','season_type','event_type','event_team_venue','away_team_abbr','home_team_abbr','strength_state_venue','event_length',
+                'x_adj','y_adj','event_distance','empty_net','xG']+[f'{venue}_on_{i}{suffix}' for venue in ['away','home'] for i in range(1,7) for suffix in ['','_id']]
+
+def shot_grid(x,y,weights,seconds):
+    #Given shot coordinates, metric weights, and time on ice (in seconds), return smoothed grid of the metric per sixty minutes
+    if seconds <= 0:
+        return np.zeros((len(grid_y)-1,len(grid_x)-1))
+    
+    grid = np.histogram2d(y,x,bins=[grid_y,grid_x],weights=weights)[0]
+    return gaussian_filter(grid,sigma=grid_sigma)*3600/seconds
+
+class HeatmapGrids:
+    #Shot-location grids for heatmaps of the provided play-by-play
+    #Shots of each season are prepared once and league baselines are cached by season, strengths, season types, and metric, so they are reused for every player or team plotted
+
+    def __init__(self, pbp):
+        try: pbp['xG']
+        except:
+            pbp = wsba_xG(pbp)
+            pbp['xG'] = np.where(pbp['xG'].isna(),0,pbp['xG'])
+
+        self.pbp = pbp
+        self.seasons = {}
+        self.indices = {}
+        self.baselines = {}
+
+    def season_data(self, season, season_types):
+        #Return projected play-by-play of the season with shot coordinates on the offensive half of the rink and strength states from the perspective of each venue
+        key = (season,tuple(season_types))
+        if key not in self.seasons:
+            data = project_columns(self.pbp,heatmap_cols,(self.pbp['season']==season)&(self.pbp['season_type'].isin(season_types)))
+
+            data['x'] = abs(data['x_adj'])
+            data['y'] = np.where(data['x_adj']<0,-data['y_adj'],data['y_adj'])
+            data['on_grid'] = (data['x_adj'].notna())&(data['y_adj'].notna())&(data['empty_net'].fillna(0)==0)&(abs(data['event_distance'].fillna(0))<=89)&(data['x']<=89)
+
+            data['away_state'] = data['strength_state_venue'].astype(str)
+            data['home_state'] = data['away_state'].str[::-1]
+            data['event_length'] = data['event_length'].fillna(0)
+
+            self.seasons[key] = data
+
+        return self.seasons[key]
+
+    def onice_index(self, season, season_types, id_mod = '_id'):
+        #Return on-ice index of the season (see onice_index in agg.py)
+        key = (season,tuple(season_types),id_mod)
+        if key not in self.indices:
+            self.indices[key] = onice_index(self.season_data(season,season_types),id_mod)
+
+        return self.indices[key]
+
+    def surface(self, season, strengths, season_types, metric, team = None, player = None, id_mod = '_id'):
+        #Return grids of the metric per sixty minutes for and against (rotated to the defensive half) the team or player on-ice
+        #When neither is provided, return the grids of an average team in the league
+        data = self.season_data(season,season_types)
+        shots = (data['event_type'].isin(metric_events[metric])&data['on_grid']).to_numpy()
+        weights = data['xG'].fillna(0).to_numpy() if metric == 'xG' else np.ones(len(data))
+        event_venue = data['event_team_venue'].to_numpy()
+
+        #Only the events with the player on-ice are considered when a player is provided
+        seconds = 0
+        sit = {'for':[],'against':[]}
+        for venue, opp in [('away','home'),('home','away')]:
+            rows = np.arange(len(data)) if player is None else self.onice_index(season,season_types,id_mod)[venue].get(player,np.array([],dtype=int))
+            if strengths != 'all':
+                rows = rows[np.isin(data[f'{venue}_state'].to_numpy()[rows],strengths)]
+            if team:
+                rows = rows[data[f'{venue}_team_abbr'].to_numpy()[rows]==team]
+
+            seconds += data['event_length'].to_numpy()[rows].sum()
+            rows = rows[shots[rows]]
+            sit['for'].append(rows[event_venue[rows]==venue])
+            sit['against'].append(rows[event_venue[rows]==opp])
+
+        sit = {key: np.concatenate(rows) for key, rows in sit.items()}
+        grids = {key: shot_grid(data['x'].to_numpy()[rows],data['y'].to_numpy()[rows],weights[rows],seconds) for key, rows in sit.items()}
+        grids['against'] = np.flip(grids['against'])
+
+        return grids
+
+    def baseline(self, season, strengths, season_types, metric):
+        #Return cached league grids of the metric per sixty minutes
+        key = (season,tuple(strengths) if strengths != 'all' else 'all',tuple(season_types),metric)
+        if key not in self.baselines:
+            self.baselines[key] = self.surface(season,strengths,season_types,metric)
+
+        return self.baselines[key]
+
 def gen_heatmap(pbp, player, season, team, strengths, season_types = 2, metric = 'xG', strengths_title = None, title = None):
+    #Play-by-play may be provided as PlotContext or HeatmapGrids to reuse prepared shots and league baselines between heatmaps
+    grids = pbp.heatmap_grids() if isinstance(pbp, PlotContext) else pbp if isinstance(pbp, HeatmapGrids) else HeatmapGrids(pbp)
+
     if isinstance(player, int):
         id_mod = '_id'
     elif player:
-        id_mod = '_name'
+        id_mod = ''
         player = player.upper()
     else:
         id_mod = None
-    
-    pbp = pbp.loc[(pbp['season']==season)]
-    
-    pbp = prep_plot_data(pbp, strengths, season_types)
 
-    events = metric_events[metric]
+    if isinstance(season_types, int):
+        season_types = [season_types]
 
-    pbp = pbp.loc[pbp['event_type'].isin(events)]
+    #Subtract the league baseline from the on-ice grids of the player or team
+    league = grids.baseline(season,strengths,season_types,metric)
+    onice = grids.surface(season,strengths,season_types,metric,team,player,id_mod)
+    difference = np.hstack([onice['against']-league['against'],onice['for']-league['for']])
 
-    pbp = pbp.fillna(0)
-    pbp = pbp.loc[(pbp['x_adj'].notna())&(pbp['y_adj'].notna())&(pbp['empty_net']==0)]
+    x_centers = (grid_x[:-1]+grid_x[1:])/2
+    [x,y] = np.meshgrid(np.concatenate([-x_centers[::-1],x_centers]),(grid_y[:-1]+grid_y[1:])/2)
 
     fig, ax = plt.subplots(1, 1, figsize=(10,12), facecolor='w', edgecolor='k')
     wsba_rink(display_range='full')
 
-    for sit in ['for','against']:
-        df = pbp
-
-        if sit == 'for':
-            df['x'] = abs(df['x_adj'])
-            df['y'] = np.where(df['x_adj']<0,-df['y_adj'],df['y_adj'])
-            df['event_distance'] = abs(df['event_distance'].fillna(0))
-            df = df.loc[(df['event_distance']<=89)&(df['x']<=89)]
-
-            x_min = 0
-            x_max = 100
-
-        else:
-            df['x'] = -abs(df['x_adj'])
-            df['y'] = np.where(df['x_adj']>0,-df['y_adj'],df['y_adj'])
-            df['event_distance'] = -abs(df['event_distance'])
-            df = df.loc[(df['event_distance']>-89)&(df['x']>-89)]
-
-            x_min = -100
-            x_max = 0
-
-        if metric != 'xG':
-            df[metrics[metric]] = df[metrics[metric]].fillna(0).clip(0,1)
-
-        [x,y] = np.round(np.meshgrid(np.linspace(x_min,x_max,(x_max-x_min)),np.linspace(-42.5,42.5,85)))
-        xgoals = griddata((df['x'],df['y']),df[metrics[metric]],(x,y),method='cubic',fill_value=0)
-        xgoals = np.where(xgoals < 0,0,xgoals)
-
-        xgoals_smooth = gaussian_filter(xgoals,sigma=3)
-        
-        if player:
-            if sit == 'for':
-                player_shots = df.loc[(df[f'onice_for{id_mod}'].str.contains(str(player)))&(df['event_team_abbr']==team)&(df['strength_state'].isin(strengths) if strengths != 'all' else True)]
-            else:
-                player_shots = df.loc[(df[f'onice_against{id_mod}'].str.contains(str(player)))&(df['event_team_abbr_2']==team)&(df['strength_state_2'].isin(strengths) if strengths != 'all' else True)]
-        else:
-            if sit == 'for':
-                player_shots = df.loc[(df['event_team_abbr']==team)]
-            else:
-                player_shots = df.loc[(df['event_team_abbr_2']==team)]
-
-        [x,y] = np.round(np.meshgrid(np.linspace(x_min,x_max,(x_max-x_min)),np.linspace(-42.5,42.5,85)))
-        xgoals_player = griddata((player_shots['x'],player_shots['y']),player_shots[metrics[metric]],(x,y),method='cubic',fill_value=0)
-        xgoals_player = np.where(xgoals_player < 0,0,xgoals_player)
-
-        xgoals_player_smooth = gaussian_filter(xgoals_player,sigma = 3)
-              
-        difference = xgoals_player_smooth - xgoals_smooth
-        data_min= difference.min()
-        data_max= difference.max()
+    data_max = max(abs(difference.min()),abs(difference.max()))
+    data_min = data_max * -1
     
-        if abs(data_min) > data_max:
-            data_max = data_min * -1
-        elif data_max > abs(data_min):
-            data_min = data_max * -1
-        
-        cont = ax.contourf(
-            x, y, difference,
-            alpha=0.6,
-            cmap='bwr',
-            levels=np.linspace(data_min, data_max, 12),
-            norm=Normalize(vmin=data_min,vmax=data_max),
-            vmin=data_min,
-            vmax=data_max
-        )
+    cont = ax.contourf(
+        x, y, difference,
+        alpha=0.6,
+        cmap='bwr',
+        levels=np.linspace(data_min, data_max, 12),
+        norm=Normalize(vmin=data_min,vmax=data_max),
+        vmin=data_min,
+        vmax=data_max
+    )
     
     ax.text(-50, -50, 'Defense (Against)', ha='center', va='bottom', fontsize=12)
     ax.text(50, -50, 'Offense (For)', ha='center', va='bottom', fontsize=12)
@@ -239,8 +337,7 @@ def gen_heatmap(pbp, player, season, team, strengths, season_types = 2, metric =
 
 def plot_skater_shots(pbp, player, season, team, strengths, season_types = 2, strengths_title = None, title = None, marker_dict=event_markers, situation='for', legend=False):
     shots = ['goal','missed-shot','shot-on-goal']
-    pbp = prep_plot_data(pbp,strengths,season_types,marker_dict)
-    pbp = pbp.loc[(pbp['season']==season)&(pbp['event_type'].isin(shots))&((pbp['away_team_abbr']==team)|(pbp['home_team_abbr']==team))]
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp,marker_dict)
 
     team_data = pd.read_csv(info_path)
     team_color = list(team_data.loc[team_data['wsba_id']==f'{team}{season}','primary_color'])[0]
@@ -252,11 +349,15 @@ def plot_skater_shots(pbp, player, season, team, strengths, season_types = 2, st
         id_mod = '_name'
         player = player.upper()
 
+    #Select events of the team with the player on-ice (or shooting)
+    by = f'onice{id_mod}' if situation in ['for','against'] else f'shooter{id_mod}'
+    rows = np.intersect1d(context.rows(strengths,season_types,'team',team),context.rows(strengths,season_types,by,player,situation))
+    skater = context.select(strengths,season_types)[0].iloc[rows]
+    skater = skater.loc[(skater['season']==season)&(skater['event_type'].isin(shots))]
+
     if situation in ['for','against']:
-        skater = pbp.loc[(pbp[f'onice_{situation}{id_mod}'].str.contains(str(player)))]
         skater['color'] = np.where(skater[f'event_player_1{id_mod}']==player,team_color,team_color_2nd)
     else:
-        skater = pbp.loc[pbp[f'event_player_1{id_mod}']==player]
         skater['color'] = team_color
 
     fig, ax = plt.subplots()
@@ -279,8 +380,9 @@ def plot_skater_shots(pbp, player, season, team, strengths, season_types = 2, st
     return fig
     
 def plot_game_events(pbp,game_id,events,strengths,marker_dict=event_markers,team_colors={'away':'secondary','home':'primary'},legend=False):
-    pbp = prep_plot_data(pbp,strengths,season_types=[2,3],marker_dict=marker_dict)
-    pbp = pbp.loc[(pbp['event_type'].isin(events))&(pbp['game_id']==game_id)]
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp,marker_dict)
+    pbp = context.events(strengths,[2,3],'game',game_id)
+    pbp = pbp.loc[pbp['event_type'].isin(events)]
     
     away_abbr = pbp['away_team_abbr'].iloc[0]
     home_abbr = pbp['home_team_abbr'].iloc[0]
@@ -415,4 +517,45 @@ def plot_game_score(df):
 
         plots[team] = fig
 
-    return plots
\ No newline at end of file
+    return plots
+
+## BATCH RENDERING ##
+#Plot context of a rendering process (set once for each worker)
+render_data = {}
+
+def init_renderer(pbp, marker_dict):
+    #Set plot context of a rendering worker and use the non-interactive Agg backend
+    plt.switch_backend('Agg')
+    render_data['context'] = PlotContext(pbp,marker_dict)
+
+def render_plot(context, kind, args, path, formats):
+    #Given plot context, plot kind ('game', 'shot', or 'heatmap'), plot arguments, and output path (without extension), write the plot in each format, close the figure, and return the written paths
+    plot = {'game':plot_game_events,'shot':plot_skater_shots,'heatmap':gen_heatmap}[kind]
+    fig = plot(context,*args)
+
+    os.makedirs(os.path.dirname(path) or '.',exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        paths.append(f'{path}.{fmt}')
+        fig.savefig(paths[-1],bbox_inches='tight')
+    plt.close(fig)
+
+    return paths
+
+def render_job(job):
+    #Render plot job in a worker process
+    return render_plot(render_data['context'],*job)
+
+def render_plots(pbp, jobs, formats = ['png'], workers = 1):
+    #Given play-by-play (or plot context) and plot jobs (kind, arguments, and output path), render every plot to disk and return the written paths of each job in order
+    #No figure is kept alive; plots are rendered in worker processes with the Agg backend when more than one worker is requested
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp)
+    jobs = [(kind, args, path, formats) for kind, args, path in jobs]
+
+    if workers > 1 and len(jobs) > 1:
+        #Workers are spawned so they do not inherit the plotting state of the calling process (each worker receives the projected play-by-play once)
+        with ProcessPoolExecutor(max_workers=workers,mp_context=multiprocessing.get_context('spawn'),initializer=init_renderer,initargs=(context.pbp,context.marker_dict)) as pool:
+            return list(pool.map(render_job,jobs,chunksize=max(1,len(jobs)//(workers*4))))
+    else:
+        return [render_plot(context,*job) for job in jobs]
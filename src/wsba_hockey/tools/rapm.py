@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import Ridge
+
+### RAPM FUNCTIONS ###
+# Provided in this file are functions vital to the regularized adjusted plus-minus (RAPM) model in the WSBA Hockey Python package. #
+
+## GLOBAL VARIABLES ##
+#Targets of the model (rates per sixty minutes for the offensive team of each observation)
+targets = {'xG':'xG','C':'corsi'}
+
+def rapm_design(stints):
+    #Given stints (see build_stints in agg.py), return sparse design matrix (offense and defense columns for each player and a home column), targets, weights, and player IDs
+    #Each stint is two observations: one with the home team on offense and one with the away team on offense
+    home = stints[[f'home_on_{i}_id' for i in range(1,7)]].to_numpy(dtype=float)
+    away = stints[[f'away_on_{i}_id' for i in range(1,7)]].to_numpy(dtype=float)
+    players = np.unique(np.concatenate([home[~np.isnan(home)],away[~np.isnan(away)]]))
+
+    count = len(stints)
+    size = len(players)
+
+    #Columns of each observation in row order (offense, defense, then home ice for observations with the home team on offense)
+    offense = np.vstack([home,away])
+    defense = np.vstack([away,home])
+    cols = np.hstack([np.searchsorted(players,offense),np.searchsorted(players,defense)+size,np.full((2*count,1),2*size)])
+    on = np.hstack([~np.isnan(offense),~np.isnan(defense),(np.arange(2*count)<count)[:,None]])
+
+    #Build the compressed matrix directly from row counts
+    indptr = np.concatenate([[0],np.cumsum(on.sum(axis=1))])
+    design = sparse.csr_matrix((np.ones(indptr[-1]),cols[on],indptr),shape=(2*count,2*size+1))
+
+    #Targets are rates per sixty minutes weighted by the length of each stint (in minutes)
+    length = np.tile(stints['duration'].to_numpy(dtype=float),2)
+    y = np.column_stack([np.concatenate([stints[f'home_{col}'].to_numpy(dtype=float),stints[f'away_{col}'].to_numpy(dtype=float)]) for col in targets.values()])/length[:,None]*3600
+
+    return design, y, length/60, players
+
+def rapm_model(stints,alpha=100):
+    #Given stints, return RAPM coefficients (offense and defense impacts per sixty minutes) for each player
+    stints = stints.loc[stints['duration']>0]
+    design, y, weights, players = rapm_design(stints)
+    size = len(players)
+
+    #Fit all targets at once with a sparse solver
+    model = Ridge(alpha=alpha,solver='sparse_cg')
+    model.fit(design,y,sample_weight=weights)
+    coef = np.atleast_2d(model.coef_)
+
+    #Time on ice is the length of the stints in which each player is on offense
+    toi = np.asarray(design[:,:size].T@weights).ravel()
+
+    rapm = pd.DataFrame({'ID':players,'TOI':toi})
+    for i, stat in enumerate(targets):
+        #Defense coefficients are the impact on rates against (positive values are detrimental)
+        rapm[f'{stat}F/60 RAPM'] = coef[i,:size]
+        rapm[f'{stat}A/60 RAPM'] = coef[i,size:2*size]
+        rapm[f'{stat}+/-/60 RAPM'] = rapm[f'{stat}F/60 RAPM']-rapm[f'{stat}A/60 RAPM']
+
+    #Return: RAPM by player
+    return rapm
@@ -1,12 +1,22 @@
 import re
 import warnings
 import os
+from functools import lru_cache
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 import requests as rs
 import json as json_lib
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from bs4 import BeautifulSoup
 from wsba_hockey.tools.utils.shared import *
+from wsba_hockey.tools.utils.fetch import governor, fetch_many, get_json, get_sized_json, get_content, is_transient
+from wsba_hockey.tools.utils.report import reporter, Progress
 warnings.filterwarnings('ignore')
 
 ### SCRAPING FUNCTIONS ###
@@ -23,6 +33,40 @@ warnings.filterwarnings('ignore')
 # Parse shift events
 # Combine all data, return complete play-by-play
 
+## INSTRUMENTATION ##
+# The scrape of each game records the wall time, bytes downloaded, and rows produced by each of its stages
+# Stage times are exclusive (time spent in a stage nested within another is counted only in the nested stage) so the stages of a game add up to the time spent scraping it
+class StageRecorder:
+    #Records the stages of the scrape of a single game (records are dicts so they may be passed between processes)
+
+    def __init__(self, game_id, records=None):
+        self.game_id = int(game_id)
+        self.records = list(records) if records else []
+        self.nested = []
+
+    @contextmanager
+    def stage(self, name):
+        #Time stage (bytes and rows may be added to the yielded record)
+        record = {'game_id':self.game_id,'stage':name,'seconds':0.0,'bytes':None,'rows':None}
+        self.records.append(record)
+        self.nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter()-start
+            record['seconds'] = elapsed-self.nested.pop()
+            if self.nested:
+                self.nested[-1] += elapsed
+
+def record_stage(recorder,name):
+    #Given stage recorder (or None) and stage name, return context recording the stage (nothing is recorded without a recorder)
+    return recorder.stage(name) if recorder is not None else nullcontext({})
+
+def metrics_frame(records):
+    #Given stage records, return metrics by game and stage
+    return pd.DataFrame(records,columns=['game_id','stage','seconds','bytes','rows'])
+
 ## UTILITY FUNCTIONS ##
 def get_col():
     return [
@@ -75,6 +119,57 @@ def adjust_coords(pbp):
     #Return: pbp with adjiusted coordinates
     return pbp
 
+def get_document(info,key,url):
+    #Given game info, return raw document stored in game info (if it has already been retreived) or request it
+    documents = info.get('documents',{})
+
+    if key in documents:
+        return documents[key]
+    else:
+        return get_content(url)
+
+## SEASON AND SCHEDULE FUNCTIONS ##
+@lru_cache(maxsize=1)
+def get_seasons_data():
+    #Return season information for all seasons (requested once per session)
+    return get_json('https://api.nhle.com/stats/rest/en/season')['data']
+
+def get_season_data(season):
+    #Given season, return season information
+    return [s for s in get_seasons_data() if s['id'] == int(season)][0]
+
+def get_season_dates(season,start=None,end=None):
+    #Given season and optional start and end dates (MM-DD), return the start and end dates of a scrape (official season start and end dates are used if none are provided)
+    season_data = get_season_data(season)
+
+    #Determine how to approach scraping; if month in season is after the new year the year must be adjusted
+    season_start = f'{(str(season)[0:4] if int(start[0:2])>=9 else str(season)[4:8])}-{start[0:2]}-{start[3:5]}' if start else season_data['startDate'][0:10]
+    season_end = f'{(str(season)[0:4] if int(end[0:2])>=9 else str(season)[4:8])}-{end[0:2]}-{end[3:5]}' if end else season_data['endDate'][0:10]
+
+    #Return: datetime values of start and end dates
+    return datetime.strptime(season_start,'%Y-%m-%d'), datetime.strptime(season_end,'%Y-%m-%d')
+
+def parse_schedule_day(data):
+    #Given json returned from the score endpoint, return games on the date
+    games = pd.json_normalize(data['games']).drop(columns=['goals'],errors='ignore')
+    
+    #Return nothing if there's nothing
+    if not games.empty:
+        games['game_date'] = data['currentDate']
+        games['game_title'] = games['awayTeam.abbrev'] + " @ " + games['homeTeam.abbrev'] + " - " + games['game_date']
+        games['start_time_est'] = pd.to_datetime(games['startTimeUTC']).dt.tz_convert('US/Eastern').dt.strftime("%I:%M %p")
+
+    #Return: games on date
+    return games
+
+def scrape_schedule_days(dates,workers=8):
+    #Given list of date strings (or 'now'), return games on each date with the days requested concurrently
+    api = "https://api-web.nhle.com/v1/score/"
+    data = fetch_many([f'{api}{date}' for date in dates],workers)
+
+    #Return: list of games by date
+    return [parse_schedule_day(day) for day in data]
+
 ## JSON FUNCTIONS ##
 def get_game_roster(json):
     #Given raw json data, return game rosters
@@ -84,12 +179,13 @@ def get_game_roster(json):
     #Return: roster information
     return roster
 
-def get_game_coaches(game_id):
+def get_game_coaches(game_id,recorder=None):
     #Given game info, return head coaches for away and home team
     
     #Retreive data (or try to)
     try:
-        json = rs.get(f'https://api-web.nhle.com/v1/gamecenter/{game_id}/right-rail').json()
+        with record_stage(recorder,'fetch_coaches') as record:
+            json, record['bytes'] = get_sized_json(f'https://api-web.nhle.com/v1/gamecenter/{game_id}/right-rail')
         data = json['gameInfo']
 
         #Add coaches
@@ -104,16 +200,17 @@ def get_game_coaches(game_id):
 
         #Return: dict with coaches
         return coaches
-    except rs.JSONDecodeError:
+    except (rs.JSONDecodeError, rs.HTTPError):
         #Right-rail content is missing for some playoff games in 2019-20
         return {}
     
-def get_game_info(game_id):
-    #Given game_id, return game information
+def get_game_data(game_id,recorder=None):
+    #Given game_id (and stage recorder), return raw json play-by-play, json shifts, and coaches
     
     #Retreive data
     api = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/play-by-play"
-    json = rs.get(api).json()
+    with record_stage(recorder,'fetch_json_pbp') as record:
+        json, record['bytes'] = get_sized_json(api)
 
     #Provide explicit error for games which have not yet occured
     if json['gameState'] in ['FUT', 'PRE']:
@@ -121,69 +218,80 @@ def get_game_info(game_id):
     else:
         #Games don't always have JSON shifts, for whatever reason
         shifts = f"https://api.nhle.com/stats/rest/en/shiftcharts?cayenneExp=gameId={game_id}"
-        shifts = rs.get(shifts).json()
-        json_shifts = pd.json_normalize(shifts['data'])
-        
-        if shifts['total'] == 0:
-            json_shifts = pd.DataFrame()
-
-        #Split information
-        base = pd.json_normalize(json)
-        game_id = base['id'][0]
-        season = base['season'][0]
-        season_type = base['gameType'][0]
-        game_date = base['gameDate'][0]
-        game_state = base['gameState'][0]
-        start_time = base['startTimeUTC'][0]
-        venue = base['venue.default'][0]
-        venue_location = base['venueLocation.default'][0]
-        away_team_id = base['awayTeam.id'][0]
-        away_team_abbr = base['awayTeam.abbrev'][0]
-        home_team_id = base['homeTeam.id'][0]
-        home_team_abbr = base['homeTeam.abbrev'][0]
-
-        #Add roster
-        roster = get_game_roster(json)
-        #In the HTML parsing process, player are identified by a regex pattern (ABB #00 such as BOS #37) or number and name in the following format: #00 NAME (i.e. #37 BERGERON) so these are added as IDs of sorts.  
-        roster['descID'] = '#'+roster['sweaterNumber'].astype(str)+" "+roster['lastName.default'].str.upper()
-        roster['team_abbr'] = roster['teamId'].replace({
-            away_team_id:[away_team_abbr],
-            home_team_id:[home_team_abbr]
-        })
-        roster['key'] = roster['team_abbr'] + " #" + roster['sweaterNumber'].astype(str)
+        with record_stage(recorder,'fetch_json_shifts') as record:
+            shifts, record['bytes'] = get_sized_json(shifts)
+
+        #Return: raw game data
+        return json, shifts, get_game_coaches(game_id,recorder)
+
+def get_game_info(game_id):
+    #Given game_id, return game information
+    return parse_game_info(*get_game_data(game_id))
+
+def parse_game_info(json, shifts, coaches):
+    #Given raw json play-by-play, json shifts, and coaches, return game information
+    json_shifts = pd.json_normalize(shifts['data'])
+    
+    if shifts['total'] == 0:
+        json_shifts = pd.DataFrame()
+
+    #Split information
+    base = pd.json_normalize(json)
+    game_id = base['id'][0]
+    season = base['season'][0]
+    season_type = base['gameType'][0]
+    game_date = base['gameDate'][0]
+    game_state = base['gameState'][0]
+    start_time = base['startTimeUTC'][0]
+    venue = base['venue.default'][0]
+    venue_location = base['venueLocation.default'][0]
+    away_team_id = base['awayTeam.id'][0]
+    away_team_abbr = base['awayTeam.abbrev'][0]
+    home_team_id = base['homeTeam.id'][0]
+    home_team_abbr = base['homeTeam.abbrev'][0]
+
+    #Add roster
+    roster = get_game_roster(json)
+    #In the HTML parsing process, player are identified by a regex pattern (ABB #00 such as BOS #37) or number and name in the following format: #00 NAME (i.e. #37 BERGERON) so these are added as IDs of sorts.  
+    roster['descID'] = '#'+roster['sweaterNumber'].astype(str)+" "+roster['lastName.default'].str.upper()
+    roster['team_abbr'] = roster['teamId'].replace({
+        away_team_id:[away_team_abbr],
+        home_team_id:[home_team_abbr]
+    })
+    roster['key'] = roster['team_abbr'] + " #" + roster['sweaterNumber'].astype(str)
 
-        #Create an additional roster dictionary for use with HTML parsing
-        #Roster dict
-        roster_dict = {'away':{},
-                    'home':{}}
+    #Create an additional roster dictionary for use with HTML parsing
+    #Roster dict
+    roster_dict = {'away':{},
+                'home':{}}
+    
+    #Evaluate and add players by team
+    for team in ['away','home']:
+        abbr = (away_team_abbr if team == 'away' else home_team_abbr)
+        rost = roster.loc[roster['team_abbr']==abbr]
         
-        #Evaluate and add players by team
-        for team in ['away','home']:
-            abbr = (away_team_abbr if team == 'away' else home_team_abbr)
-            rost = roster.loc[roster['team_abbr']==abbr]
-            
-            #Now iterate through team players
-            for player,id,num,pos,team_abbr,key in zip(rost['full_name'],rost['playerId'],rost['sweaterNumber'],rost['positionCode'],rost['team_abbr'],rost['key']):
-                roster_dict[team].update({str(num):[key, pos, player, team_abbr, id]})
-
-        #Return: game information
-        return {"game_id":str(game_id),
-                "season":season,
-                "season_type":season_type,
-                "game_date":game_date,
-                "game_state":game_state,
-                "start_time":start_time,
-                'venue':venue,
-                'venue_location':venue_location,
-                'away_team_id':away_team_id,
-                'away_team_abbr':away_team_abbr,
-                'home_team_id':home_team_id,
-                'home_team_abbr':home_team_abbr,
-                'events':pd.json_normalize(json['plays']).reset_index(drop=True),
-                'rosters':roster,
-                'HTML_rosters':roster_dict,
-                'coaches':get_game_coaches(game_id),
-                'json_shifts':json_shifts}
+        #Now iterate through team players
+        for player,id,num,pos,team_abbr,key in zip(rost['full_name'],rost['playerId'],rost['sweaterNumber'],rost['positionCode'],rost['team_abbr'],rost['key']):
+            roster_dict[team].update({str(num):[key, pos, player, team_abbr, id]})
+
+    #Return: game information
+    return {"game_id":str(game_id),
+            "season":season,
+            "season_type":season_type,
+            "game_date":game_date,
+            "game_state":game_state,
+            "start_time":start_time,
+            'venue':venue,
+            'venue_location':venue_location,
+            'away_team_id':away_team_id,
+            'away_team_abbr':away_team_abbr,
+            'home_team_id':home_team_id,
+            'home_team_abbr':home_team_abbr,
+            'events':pd.json_normalize(json['plays']).reset_index(drop=True),
+            'rosters':roster,
+            'HTML_rosters':roster_dict,
+            'coaches':coaches,
+            'json_shifts':json_shifts}
 
 def parse_json(info):
     #Given game info, return JSON document
@@ -253,7 +361,7 @@ def parse_json(info):
     # x, y - Raw coordinates from JSON pbp
     # x_adj, y_adj - Adjusted coordinates configuring the away offensive zone to the left and the home offensive zone to the right
     #Some games (mostly preseason and all star games) do not include coordinates. 
-    if info['season'] in [20052006, 20062007, 20072008, 20082009, 20092010]:
+    if info['season'] in espn_seasons:
         #If the json is used as a supplement for the ESPN pbp data then remove unnecessary columns
         events = events.drop(columns=['x','y','event_team_venue','period_seconds_elapsed','game_id',
                                       'period_time_elapsed', 'shot_type', 'zone_code', 'event_player_1_id', 'event_player_2_id', 'event_player_3_id'],
@@ -262,7 +370,7 @@ def parse_json(info):
         try:
             events = adjust_coords(events)
         except KeyError:
-            print(f"No coordinates found for game {info['game_id'][0]}...")
+            reporter.message(f"No coordinates found for game {info['game_id'][0]}...")
             events['x_adj'] = np.nan
             events['y_adj'] = np.nan
             events['event_distance'] = np.nan
@@ -330,15 +438,17 @@ def strip_html_pbp(td,rosters):
     return td
 
 
-def clean_html_pbp(info):
+def clean_html_pbp(info,start=0):
     #Harry Shomer's Code (modified)
 
     game_id = info['game_id']
     #Retreive data
     season = info['season']
     doc = f"https://www.nhl.com/scores/htmlreports/{season}/PL{game_id[-6:]}.HTM"
-    html = rs.get(doc).content
-    soup = get_contents(html)
+    with record_stage(info.get('metrics'),'html_soup') as record:
+        html = get_document(info,'html_pbp',doc)
+        soup = get_contents(html)
+        record['rows'] = len(soup)//8
 
     #Rosters
     rosters = info['HTML_rosters']
@@ -346,16 +456,20 @@ def clean_html_pbp(info):
     # Create a list of lists (each length 8)...corresponds to 8 columns in html pbp
     td = [soup[i:i + 8] for i in range(0, len(soup), 8)]
 
+    #Only strip events after the provided event number (used when tracking live games)
+    if start > 0:
+        td = [x for x in td if not x[0].get_text().strip().isdigit() or int(x[0].get_text().strip()) > start]
+
     cleaned_html = [strip_html_pbp(x,rosters) for x in td]
 
     return cleaned_html
 
-def parse_html(info):
+def parse_html(info,start=0):
     #Given game info, return HTML event data
 
     #Retreive game information and html events
     rosters = info['HTML_rosters']
-    events = clean_html_pbp(info)
+    events = clean_html_pbp(info,start)
 
     teams = {info['away_team_abbr']:['away'],
              info['home_team_abbr']:['home']}
@@ -516,6 +630,10 @@ def parse_html(info):
 
         event_log.append(pd.DataFrame([events_dict]))
     
+    #No events to parse (no new events in a live game, for example)
+    if not event_log:
+        return pd.DataFrame()
+
     data = pd.concat(event_log)
     data['event_type'] = data['event_type'].replace({
         "PGSTR": "pre-game-start",
@@ -544,13 +662,30 @@ def parse_html(info):
     return data
 
 ### ESPN SCRAPING FUNCTIONS ###
-def espn_game_id(date,away,home):
-    #Given a date formatted as YYYY-MM-DD and teams, return game id from ESPN schedule
+#Seasons where events are merged with ESPN events rather than NHL json events
+espn_seasons = [20052006, 20062007, 20072008, 20082009, 20092010]
+
+def get_espn_documents(date,away,home,recorder=None):
+    #Given a date formatted as YYYY-MM-DD and teams (and stage recorder), return raw ESPN scoreboard and game summary documents
+    with record_stage(recorder,'fetch_espn_scoreboard') as record:
+        scoreboard, record['bytes'] = get_sized_json(f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard?dates={date.replace('-','')}")
+
+    game_id = espn_game_id(date,away,home,scoreboard)
+    with record_stage(recorder,'fetch_espn_summary') as record:
+        summary, record['bytes'] = get_sized_json(f'https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary?event={game_id}')
+
+    #Return: raw ESPN documents
+    return {'espn_scoreboard':scoreboard,
+            'espn_summary':summary}
+
+def espn_game_id(date,away,home,scoreboard=None):
+    #Given a date formatted as YYYY-MM-DD and teams (and the ESPN scoreboard of the date if it has already been retreived), return game id from ESPN schedule
     date = date.replace("-","")
 
     #Retreive data
-    api = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard?dates={date}"
-    schedule = pd.json_normalize(rs.get(api).json()['events'])
+    if scoreboard is None:
+        scoreboard = get_json(f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard?dates={date}")
+    schedule = pd.json_normalize(scoreboard['events'])
 
     #Create team abbreviation columns
     schedule['away_team_abbr'] = schedule['shortName'].str[:3].str.strip(" ")
@@ -571,13 +706,17 @@ def espn_game_id(date,away,home):
     #Return: ESPN game id
     return game_id
 
-def parse_espn(date,away,home):
-    #Given a date formatted as YYYY-MM-DD and teams, return game events from ESPN
-    game_id = espn_game_id(date,away,home)
+def parse_espn(date,away,home,documents=None):
+    #Given a date formatted as YYYY-MM-DD, teams, and raw documents (see get_espn_documents), return game events from ESPN
+    #Documents which have not been retreived are requested
+    documents = documents or {}
+    game_id = espn_game_id(date,away,home,documents.get('espn_scoreboard'))
     
     #Hidden ESPN API endpoint (akin to the gamecenter/{game_id}/play-by-play NHL endpoint)
-    url = f'https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary?event={game_id}'
-    data = rs.get(url).json()
+    if 'espn_summary' in documents:
+        data = documents['espn_summary']
+    else:
+        data = get_json(f'https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary?event={game_id}')
     teams = data['boxscore']['teams']
 
     #Retreive plays
@@ -591,7 +730,7 @@ def parse_espn(date,away,home):
     
     #Some games are missing plays on ESPN, for some reason
     if espn_events.empty:
-        print(f"No coordinates found for game ...")
+        reporter.message(f"No coordinates found for game ...")
         return pd.DataFrame(columns=['period','seconds_elapsed','event_type','event_team_abbr'])
     else:
         #Retreive event team venue with team data (maintain the team abbreviation fill-in at the bottom)
@@ -634,7 +773,7 @@ def parse_espn(date,away,home):
         try:
             espn_events = adjust_coords(espn_events)
         except KeyError:
-            print(f"No coordinates found for game ...")
+            reporter.message(f"No coordinates found for game ...")
         
             espn_events['x_adj'] = np.nan
             espn_events['y_adj'] = np.nan
@@ -645,35 +784,170 @@ def parse_espn(date,away,home):
         return espn_events
 
 def assign_target(data):
-    #Assign target number to plays to assist with merging
+    #Assign target number to plays to assist with merging (play-by-play may include multiple games)
 
     #New sort
-    data = data.sort_values(['period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','event_player_2_id'])
+    data = data.sort_values(['game_id','period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','event_player_2_id'])
 
     #Target number distingushes events that occur in the same second to assist in merging the JSON and HTML
     #Sometimes the target number may not reflect the same order as the event number in either document (especially in earlier seasons where the events are out of order in the HTML or JSON)
-    data['target_num'] = np.where(data['event_type'].isin(['penalty','blocked-shot','missed-shot','shot-on-goal','goal']),data['event_type'].isin(['penalty','blocked-shot','missed-shot','shot-on-goal','goal']).cumsum(),0)
+    target = data['event_type'].isin(['penalty','blocked-shot','missed-shot','shot-on-goal','goal'])
+    data['target_num'] = np.where(target,target.groupby(data['game_id']).cumsum(),0)
 
     #Revert sort and return dataframe
-    return data.reset_index()
+    return data.reset_index(drop=True)
+
+def merge_keys(html_pbp,json_pbp,cols):
+    #Given HTML and JSON events, return each with integer-typed merge keys for the provided columns added
+    html_keys = {}
+    json_keys = {}
+    for col in cols:
+        if col in ['event_type','event_team_abbr']:
+            #Text columns are coded with a shared set of categories (missing values are coded as -1)
+            codes, uniques = pd.factorize(np.concatenate([html_pbp[col].to_numpy(dtype=object),json_pbp[col].to_numpy(dtype=object)]))
+            html_keys[f'key_{col}'] = codes[:len(html_pbp)]
+            json_keys[f'key_{col}'] = codes[len(html_pbp):]
+        else:
+            html_keys[f'key_{col}'] = pd.to_numeric(html_pbp[col],errors='coerce').fillna(-1).astype('int64').to_numpy()
+            json_keys[f'key_{col}'] = pd.to_numeric(json_pbp[col],errors='coerce').fillna(-1).astype('int64').to_numpy()
+
+    #Return: events with keys and keys used to merge
+    return (pd.concat([html_pbp,pd.DataFrame(html_keys,index=html_pbp.index)],axis=1),
+            pd.concat([json_pbp,pd.DataFrame(json_keys,index=json_pbp.index)],axis=1),
+            ['game_id']+list(html_keys))
+
+def merge_pbp(html_pbp,json_pbp):
+    #Given HTML and JSON events (of one or many games), return merged events and a report of the merge for each game
+    #Games where the HTML and JSON include the same events in the same order are merged by position; other games are merged on event information
+    html_pbp = assign_target(html_pbp)
+    json_pbp = assign_target(json_pbp)
+
+    html_pbp['game_id'] = html_pbp['game_id'].astype('int64')
+    json_pbp['game_id'] = json_pbp['game_id'].astype('int64')
+
+    #Position of events within each game
+    html_pbp['position'] = html_pbp.groupby('game_id').cumcount()
+    json_pbp['position'] = json_pbp.groupby('game_id').cumcount()
+    json_pbp['json_row'] = np.arange(len(json_pbp))
+
+    #Determine which games may be merged by position
+    html_count = html_pbp.groupby('game_id').size()
+    json_count = json_pbp.groupby('game_id').size()
+    games = html_count.index[html_count.eq(json_count.reindex(html_count.index))]
+
+    #Events of these games are in the same order in both documents (sorted by game and position)
+    html_aligned = html_pbp.loc[html_pbp['game_id'].isin(games)]
+    json_aligned = json_pbp.loc[json_pbp['game_id'].isin(games)]
+    match = (html_aligned['event_type'].to_numpy() == json_aligned['event_type'].to_numpy()) & (html_aligned['seconds_elapsed'].to_numpy() == json_aligned['seconds_elapsed'].to_numpy())
+    same = pd.Series(match).groupby(html_aligned['game_id'].to_numpy()).all()
+    index_games = same.index[same]
+
+    #Merge by position
+    parts = []
+    index_html = html_pbp['game_id'].isin(index_games)
+    if index_html.any():
+        html_index = html_pbp.loc[index_html].drop(columns=['period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','event_player_2_id','event_player_3_id','shot_type','zone_code','target_num'],errors='ignore')
+        parts.append(pd.merge(html_index,json_pbp,how='left',on=['game_id','position'],indicator=True).drop(columns=['position']))
+
+    #Merge on columns (with integer keys)
+    if not index_html.all():
+        merge_col = ['period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','target_num']
+        html_cols = html_pbp.loc[~index_html].drop(columns=['event_player_2_id','event_player_3_id','shot_type','zone_code','position'],errors='ignore')
+        json_cols = json_pbp.loc[~json_pbp['game_id'].isin(index_games)].drop(columns=['position'])
+        html_cols, json_cols, keys = merge_keys(html_cols,json_cols,merge_col)
+        
+        #Key columns are kept from the HTML events
+        parts.append(pd.merge(html_cols,json_cols.drop(columns=merge_col),how='left',on=keys,indicator=True).drop(columns=keys[1:]))
+
+    df = (pd.concat(parts) if len(parts) > 1 else parts[0]).sort_values(['game_id','event_num','json_row'])
+
+    #Report merge for each game
+    unmatched_html = df.loc[df['_merge']=='left_only']
+    unmatched_json = json_pbp.loc[~json_pbp['json_row'].isin(df['json_row'])]
+
+    report = pd.DataFrame({'game_id':html_count.index})
+    report['method'] = np.where(report['game_id'].isin(index_games),'index','columns')
+    report['html_events'] = report['game_id'].map(html_count)
+    report['json_events'] = report['game_id'].map(json_count).fillna(0).astype(int)
+    report['unmatched_html'] = report['game_id'].map(unmatched_html.groupby('game_id').size()).fillna(0).astype(int)
+    report['unmatched_json'] = report['game_id'].map(unmatched_json.groupby('game_id').size()).fillna(0).astype(int)
+    report['unmatched_html_events'] = report['game_id'].map(unmatched_html.groupby('game_id')['event_num'].agg(list))
+    report['unmatched_json_events'] = report['game_id'].map(unmatched_json.groupby('game_id')['event_id'].agg(list))
+    for col in ['unmatched_html_events','unmatched_json_events']:
+        report[col] = report[col].apply(lambda x: x if isinstance(x,list) else [])
+
+    #Return: merged events and merge report
+    return df.drop(columns=['json_row','_merge']).reset_index(drop=True), report
+
+def source_files(path='sources',game_ids=None):
+    #Given sources directory (written by combine_pbp when sources=True), return the saved HTML and JSON events files of each game with both
+    #Games of seasons merged with ESPN data are excluded (their saved JSON events are already merged with ESPN events)
+    files = []
+    if not os.path.isdir(path):
+        return files
+
+    for season in sorted(os.listdir(path)):
+        if not season.isdigit() or int(season) in espn_seasons:
+            continue
+
+        dirs_html = os.path.join(path,season,'HTML')
+        dirs_json = os.path.join(path,season,'JSON')
+        if not os.path.isdir(dirs_html):
+            continue
+
+        for name in sorted(os.listdir(dirs_html)):
+            if not name.endswith('_HTML.csv'):
+                continue
+            game_id = name[:-len('_HTML.csv')]
+            json_path = os.path.join(dirs_json,f'{game_id}_JSON.csv')
+            if os.path.exists(json_path) and (game_ids is None or game_id in game_ids):
+                files.append((int(game_id),os.path.join(dirs_html,name),json_path))
+
+    return files
+
+def merge_sources(path='sources',game_ids=None):
+    #Given sources directory and optional list of game_ids, return the saved HTML and JSON events of each game merged in a single call of merge_pbp and the merge report of each game
+    if game_ids is not None:
+        game_ids = [str(game_id) for game_id in game_ids]
+
+    files = source_files(path,game_ids)
+    if not files:
+        return pd.DataFrame(), pd.DataFrame(columns=['game_id','method','html_events','json_events','unmatched_html','unmatched_json','unmatched_html_events','unmatched_json_events'])
+
+    #Events of each game are kept contiguous and in the same game order in both documents
+    html_pbp = pd.concat([pd.read_csv(html_path).assign(game_id=game_id) for game_id, html_path, _ in files],ignore_index=True)
+    json_pbp = pd.concat([pd.read_csv(json_path).assign(game_id=game_id) for game_id, _, json_path in files],ignore_index=True)
+
+    #Return: merged events and merge report
+    return merge_pbp(html_pbp,json_pbp)
 
 def no_data(): 
     #Allows the passage of espn_pbp data if it is not needed
     pass
 
-def combine_pbp(info,sources):
+def combine_pbp(info,sources,start=0):
     #Given game info, return complete play-by-play data for provided game
 
     #Create tasks
-    html_task = parse_html(info)
-    if info['season'] in [20052006, 20062007, 20072008, 20082009, 20092010]:
-        espn_task = parse_espn(str(info['game_date']),info['away_team_abbr'],info['home_team_abbr'])
+    metrics = info.get('metrics')
+    with record_stage(metrics,'parse_html') as record:
+        html_task = parse_html(info,start)
+        record['rows'] = len(html_task)
+
+    #Nothing to combine if there are no HTML events (no new events in a live game, for example)
+    if html_task.empty:
+        return pd.DataFrame()
+
+    if info['season'] in espn_seasons:
+        espn_task = parse_espn(str(info['game_date']),info['away_team_abbr'],info['home_team_abbr'],info.get('documents',{}))
         json_type = 'espn'
     else:
         espn_task = no_data()
         json_type = 'nhl'
 
-    json_task = parse_json(info)
+    with record_stage(metrics,'parse_json') as record:
+        json_task = parse_json(info)
+        record['rows'] = len(json_task)
 
     html_pbp = html_task
     json_pbp = json_task
@@ -700,12 +974,27 @@ def combine_pbp(info,sources):
             html_pbp.to_csv(f'{dirs_html}{info['game_id']}_HTML.csv',index=False)
             espn_pbp.to_csv(f'{dirs_json}{info['game_id']}_JSON.csv',index=False)
 
-        print(f' merging on columns...',end="")
         #Merge pbp
-        df = pd.merge(html_pbp,espn_pbp,how='left',on=merge_col)
+        with record_stage(metrics,'merge_pbp') as record:
+            df = pd.merge(html_pbp,espn_pbp,how='left',on=merge_col,indicator=True)
+            record['rows'] = len(df)
+
+        unmatched = df.loc[df['_merge']=='left_only','event_num']
+        info['merge_report'] = pd.DataFrame([{'game_id':int(info['game_id']),
+                                              'method':'espn',
+                                              'html_events':len(html_pbp),
+                                              'json_events':len(espn_pbp),
+                                              'unmatched_html':len(unmatched),
+                                              'unmatched_json':np.nan,
+                                              'unmatched_html_events':unmatched.to_list(),
+                                              'unmatched_json_events':[]}])
+        df = df.drop(columns=['_merge'])
 
     else:
         #JSON x HTML
+        html_pbp['game_id'] = int(info['game_id'])
+        json_pbp['game_id'] = int(info['game_id'])
+
         if sources:
             dirs_html = f'sources/{info['season']}/HTML/'
             dirs_json = f'sources/{info['season']}/JSON/'
@@ -718,26 +1007,10 @@ def combine_pbp(info,sources):
             html_pbp.to_csv(f'{dirs_html}{info['game_id']}_HTML.csv',index=False)
             json_pbp.to_csv(f'{dirs_json}{info['game_id']}_JSON.csv',index=False)
         
-        #Assign target numbers
-        html_pbp = assign_target(html_pbp)
-        json_pbp = assign_target(json_pbp)
-
-        #Merge on index if the df lengths are the same and the events are in the same general order; merge on columns otherwise
-        if (len(html_pbp) == len(json_pbp)) and (html_pbp['event_type'].equals(json_pbp['event_type'])) and (html_pbp['seconds_elapsed'].equals(json_pbp['seconds_elapsed'])):
-            html_pbp = html_pbp.drop(columns=['period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','event_player_2_id','event_player_3_id','shot_type','zone_code'],errors='ignore').reset_index()
-            df = pd.merge(html_pbp,json_pbp,how='left',left_index=True,right_index=True).sort_values(['event_num'])
-        else:
-            print(f' merging on columns...',end="")
-            #Modify merge conditions and merge pbps
-            merge_col = ['period','seconds_elapsed','event_type','event_team_abbr','event_player_1_id','target_num']
-            html_pbp = html_pbp.drop(columns=['event_player_2_id','event_player_3_id','shot_type','zone_code'],errors='ignore')
-
-            #While rare sometimes column 'event_player_1_id' is interpreted differently between the two dataframes. 
-            html_pbp['event_player_1_id'] = html_pbp['event_player_1_id'].astype(object)
-            json_pbp['event_player_1_id'] = json_pbp['event_player_1_id'].astype(object)
-
-            #Merge pbp
-            df = pd.merge(html_pbp,json_pbp,how='left',on=merge_col).sort_values(['event_num'])
+        #Merge pbp (events are merged by position if the events are in the same order in both documents and on event information otherwise)
+        with record_stage(metrics,'merge_pbp') as record:
+            df, info['merge_report'] = merge_pbp(html_pbp,json_pbp)
+            record['rows'] = len(df)
 
     #Add game info
     info_col = ['season','season_type','game_id','game_date',"venue","venue_location",
@@ -834,7 +1107,7 @@ def parse_shifts_html(info,home):
     game_id = info['game_id']
     season = info['season']
     link = f"https://www.nhl.com/scores/htmlreports/{season}/T{'H' if home else 'V'}{game_id[-6:]}.HTM"
-    doc = rs.get(link).content
+    doc = get_document(info,f"html_shifts_{'home' if home else 'away'}",link)
     td, teams = get_soup(doc)
 
     team = teams[0]
@@ -958,7 +1231,7 @@ def parse_shift_events(info,home):
     
     max_players = 6
     for i in range(max_players):
-        on_skaters[f"{'home' if home else 'away'}_on_{i+1}_id"] = on_skaters["level_1"].apply(lambda x: x[i] if i < len(x) else " ")
+        on_skaters[f"{'home' if home else 'away'}_on_{i+1}_id"] = on_skaters["level_1"].apply(lambda x: x[i] if i < len(x) else np.nan)
     
     on_skaters = on_skaters.drop(columns=["level_1"]).rename(columns={"level_0": "row"})
     
@@ -981,7 +1254,7 @@ def parse_shift_events(info,home):
     
     max_players = 1
     for i in range(max_players):
-        on_goalies[f"{'home' if home else 'away'}_goalie_id"] = on_goalies["level_1"].apply(lambda x: x[i] if i < len(x) else " ")
+        on_goalies[f"{'home' if home else 'away'}_goalie_id"] = on_goalies["level_1"].apply(lambda x: x[i] if i < len(x) else np.nan)
     
     on_goalies = on_goalies.drop(columns=["level_1"]).rename(columns={"level_0": "row"})
     
@@ -994,8 +1267,8 @@ def parse_shift_events(info,home):
         shifts['home_team_abbr'] = team
     else:
         shifts['away_team_abbr'] = team
-    #Return: shift events with newly added on-ice columns.  NAN values are replaced with string "REMOVE" as means to create proper on-ice columns for json pbp
-    return pd.merge(shifts,on_players,how="outer",on=['row']).replace(np.nan,"")
+    #Return: shift events with newly added on-ice columns (empty on-ice slots are left missing)
+    return pd.merge(shifts,on_players,how="outer",on=['row'])
 
 ## FINALIZE PBP FUNCTIONS ##
 def combine_shifts(info,sources):
@@ -1005,8 +1278,14 @@ def combine_shifts(info,sources):
     roster = info['rosters']
 
     #Quickly combine shifts data
-    away = parse_shift_events(info,False)
-    home = parse_shift_events(info,True)
+    with record_stage(info.get('metrics'),'parse_shift_events_away') as record:
+        away = parse_shift_events(info,False)
+        record['rows'] = len(away)
+    with record_stage(info.get('metrics'),'parse_shift_events_home') as record:
+        home = parse_shift_events(info,True)
+        record['rows'] = len(home)
+    away['shift_venue'] = 'away'
+    home['shift_venue'] = 'home'
 
     #Combine shifts
     data = pd.concat([away,home]).sort_values(['period','seconds_elapsed'])
@@ -1038,14 +1317,20 @@ def combine_shifts(info,sources):
                 'home_on_1_id','home_on_2_id','home_on_3_id','home_on_4_id','home_on_5_id','home_on_6_id',
                 'away_goalie','home_goalie','away_goalie_id','home_goalie_id']
 
-    for col in on_ice_col:
-        data[col] = data[col].ffill()
+    #Each team's on-ice columns are carried from its last shift event (empty on-ice slots are not filled from earlier shift events)
+    for venue in ['away','home']:
+        cols = [col for col in on_ice_col if col.startswith(venue)]
+        last = pd.Series(np.where(data['shift_venue']==venue,np.arange(len(data)),np.nan)).ffill()
+        
+        values = data[cols].to_numpy(dtype=object)[last.fillna(0).astype(int)]
+        values[last.isna().to_numpy()] = np.nan
+        data[cols] = values
 
     #Create strength state information
     away_on = ['away_on_1_id','away_on_2_id','away_on_3_id','away_on_4_id','away_on_5_id','away_on_6_id',]
     home_on = ['home_on_1_id','home_on_2_id','home_on_3_id','home_on_4_id','home_on_5_id','home_on_6_id',]
-    data['away_skaters'] = data[away_on].replace(r'^\s*$', np.nan, regex=True).notna().sum(axis=1)
-    data['home_skaters'] = data[home_on].replace(r'^\s*$', np.nan, regex=True).notna().sum(axis=1)
+    data['away_skaters'] = data[away_on].notna().sum(axis=1)
+    data['home_skaters'] = data[home_on].notna().sum(axis=1)
     data['strength_state'] = np.where(data['event_team_abbr']==data['away_team_abbr'],data['away_skaters'].astype(str)+"v"+data['home_skaters'].astype(str),data['home_skaters'].astype(str)+"v"+data['away_skaters'].astype(str))
 
     #Create final shifts df
@@ -1064,14 +1349,37 @@ def combine_shifts(info,sources):
     #Return: full shifts data converted to play-by-play format
     return full_shifts
 
+def clean_blanks(df):
+    #Given play-by-play, return play-by-play with blank strings replaced with missing values
+    #Blank strings are only created in text columns (missing json columns, event team venue, shift type, and coaches) so only these columns are checked
+    cols = df.columns[df.dtypes==object]
+    values = df[cols].to_numpy()
+    df[cols] = np.where((values=='')|(values==' '),np.nan,values)
+
+    #Return: play-by-play with missing values in place of blank strings (text columns are converted to numeric types where possible, such as ID columns which only had missing values or blank strings)
+    return df.infer_objects()
+
 def combine_data(info,sources):
     #Given game info, return complete play-by-play data
 
-    pbp = combine_pbp(info,sources)
-    shifts = combine_shifts(info,sources)
+    metrics = info.get('metrics')
+    with record_stage(metrics,'combine_pbp') as record:
+        pbp = combine_pbp(info,sources)
+        record['rows'] = len(pbp)
+    with record_stage(metrics,'combine_shifts') as record:
+        shifts = combine_shifts(info,sources)
+        record['rows'] = len(shifts)
 
     #Combine data    
-    df = pd.concat([pbp,shifts])
+    with record_stage(metrics,'finalize_data') as record:
+        df = finalize_data(pd.concat([pbp,shifts]),info)
+        record['rows'] = len(df)
+
+    #Return: complete play-by-play with all important data for each event in a provided game
+    return df
+
+def finalize_data(df,info):
+    #Given combined play-by-play and shift events, return ordered play-by-play with event states and game context
 
     df['game_id'] = df['game_id'].astype(int)
     df['event_num'] = df['event_num'].replace(np.nan,0)
@@ -1150,4 +1458,249 @@ def combine_data(info,sources):
         df[col] = df[col].ffill()
 
     #Return: complete play-by-play with all important data for each event in a provided game
-    return df[[col for col in get_col() if col in df.columns.to_list()]].replace(r'^\s*$', np.nan, regex=True)
+    return clean_blanks(df[[col for col in get_col() if col in df.columns.to_list()]])
+
+## PIPELINE FUNCTIONS ##
+# Scraping is split into two stages: requesting documents (network-bound) and parsing them into play-by-play (CPU-bound)
+# Threads request the documents for each game and place them in a bounded queue which the parsing stage consumes (in a process pool if more than one parsing worker is requested)
+# When the queue is full the request threads wait (and when the queue is empty the parsing workers wait) so neither stage runs away from the other
+
+def get_game_documents(game_id):
+    #Given game_id, return all raw documents required to scrape the game (no parsing is done here) and the stages of their requests
+    recorder = StageRecorder(game_id)
+    json, shifts, coaches = get_game_data(game_id,recorder)
+
+    #Retreive HTML documents (HTML shifts are only used when there are no json shifts)
+    season = json['season']
+    game_id = str(json['id'])
+    urls = {'html_pbp':f"https://www.nhl.com/scores/htmlreports/{season}/PL{game_id[-6:]}.HTM"}
+
+    if shifts['total'] == 0:
+        for venue, code in [('home','H'),('away','V')]:
+            urls[f'html_shifts_{venue}'] = f"https://www.nhl.com/scores/htmlreports/{season}/T{code}{game_id[-6:]}.HTM"
+
+    documents = {}
+    for key, url in urls.items():
+        with record_stage(recorder,f'fetch_{key}') as record:
+            documents[key] = get_content(url)
+            record['bytes'] = len(documents[key])
+
+    #ESPN documents are retreived here so that parsing (which may be done in separate processes) makes no requests
+    if json['season'] in espn_seasons:
+        documents.update(get_espn_documents(json['gameDate'],json['awayTeam']['abbrev'],json['homeTeam']['abbrev'],recorder))
+
+    #Return: raw game documents
+    return {'json':json,
+            'shifts':shifts,
+            'coaches':coaches,
+            'documents':documents,
+            'metrics':recorder.records}
+
+def parse_game_documents(raw,sources):
+    #Given raw game documents, return complete play-by-play, report of the JSON and HTML merge, metrics of the scrape stages, and time spent parsing
+    start = time.perf_counter()
+
+    #Stages of the requests (if they were recorded) are followed by the stages of parsing
+    recorder = StageRecorder(raw['json']['id'],raw.get('metrics'))
+    with record_stage(recorder,'parse_info') as record:
+        info = parse_game_info(raw['json'],raw['shifts'],raw['coaches'])
+        record['rows'] = len(info['events'])
+    info['documents'] = raw['documents']
+    info['metrics'] = recorder
+    data = combine_data(info,sources)
+
+    #Export if sources is true
+    if sources:
+        dirs = f'sources/{info['season']}/'
+
+        if not os.path.exists(dirs):
+            os.makedirs(dirs)
+
+        data.to_csv(f'{dirs}{info['game_id']}.csv',index=False)
+
+    #Return: play-by-play, merge report, stage metrics, and parsing time
+    return data, info['merge_report'], metrics_frame(recorder.records), time.perf_counter()-start
+
+def scrape_games(game_ids,sources=False,fetch_workers=4,parse_workers=1,queue_size=8,retry=True,problems={}):
+    #Given list of game_ids, yield (game_id, result, seconds) for each game as it finishes where result is either (play-by-play, merge report, stage metrics) or the exception raised while scraping the game
+    #Games with requests that failed after all retries are attempted once more after the rest of the games (if retry is True)
+    #The progress of the scrape is reported as each game finishes (problems may describe known problems of games by game_id)
+    progress = Progress(len(game_ids))
+    totals = {'completed':0,'failed':0,'transient':0,'bytes':0}
+    reporter.emit('scrape_started',games=len(game_ids))
+
+    def report(game_id, result, secs, retrying=False):
+        if isinstance(result, Exception):
+            transient = is_transient(result)
+            if not retrying:
+                progress.update()
+                totals['transient' if transient else 'failed'] += 1
+            if reporter.active:
+                reporter.emit('game_failed',game_id=game_id,error=str(result),transient=transient,retrying=retrying,problem=problems.get(game_id))
+            return
+
+        totals['completed'] += 1
+        game_bytes = int(result[2]['bytes'].sum())
+        totals['bytes'] += game_bytes
+        fields = progress.update()
+        if reporter.active:
+            for record in result[2].to_dict('records'):
+                record.update({key:(None if pd.isna(record[key]) else int(record[key])) for key in ['bytes','rows']})
+                reporter.emit('stage',**record)
+            reporter.emit('game_finished',game_id=game_id,seconds=secs,rows=len(result[0]),bytes=game_bytes,**fields)
+
+    transient_ids = []
+    for game_id, result, secs in run_pipeline(game_ids,sources,fetch_workers,parse_workers,queue_size):
+        if retry and isinstance(result, Exception) and is_transient(result):
+            report(game_id, result, secs, retrying=True)
+            transient_ids.append(game_id)
+            continue
+        report(game_id, result, secs)
+        yield game_id, result, secs
+
+    if transient_ids:
+        #Games failing on an open circuit would fail again immediately; the retry pass begins once requests are allowed again
+        governor.wait_for_circuits()
+        reporter.message(f'Retrying {len(transient_ids)} games with failed requests...')
+        for game_id, result, secs in run_pipeline(transient_ids,sources,fetch_workers,parse_workers,queue_size):
+            report(game_id, result, secs)
+            yield game_id, result, secs
+
+    elapsed = time.perf_counter()-progress.start
+    reporter.emit('scrape_finished',games=len(game_ids),seconds=elapsed,rate=totals['completed']/elapsed if elapsed > 0 else 0.0,**totals)
+
+def run_pipeline(game_ids,sources,fetch_workers,parse_workers,queue_size):
+    #Given list of game_ids, yield (game_id, result, seconds) for each game as it finishes (see scrape_games)
+    #fetch_workers threads request documents, placing at most queue_size games in the queue before waiting for the parsing stage
+    #parse_workers processes parse documents (games are parsed in the calling thread if parse_workers is less than two)
+    documents = queue.Queue(maxsize=max(queue_size,1))
+    ids = queue.Queue()
+    for game_id in game_ids:
+        ids.put(game_id)
+    
+    stop = threading.Event()
+
+    def fetch():
+        #Request documents for games until there are none left (or the scrape is stopped)
+        while not stop.is_set():
+            try:
+                game_id = ids.get_nowait()
+            except queue.Empty:
+                return
+            
+            reporter.emit('game_started',game_id=game_id)
+            start = time.perf_counter()
+            try:
+                raw = get_game_documents(game_id)
+            except Exception as e:
+                raw = e
+
+            #Wait for space in the queue (checking periodically if the scrape has been stopped)
+            while not stop.is_set():
+                try:
+                    documents.put((game_id, raw, time.perf_counter()-start), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    fetchers = [threading.Thread(target=fetch, daemon=True) for _ in range(max(min(fetch_workers,len(game_ids)),1))]
+    for thread in fetchers:
+        thread.start()
+
+    #Parsing workers are spawned (rather than forked) as the request threads are already running
+    pool = ProcessPoolExecutor(max_workers=parse_workers,mp_context=multiprocessing.get_context('spawn')) if parse_workers > 1 else None
+    pending = {}
+    remaining = len(game_ids)
+    try:
+        while remaining > 0:
+            #Pass documents to the parsing stage (limiting parsing tasks in flight so documents wait in the bounded queue)
+            if pool is None or len(pending) < parse_workers * 2:
+                try:
+                    game_id, raw, secs = documents.get(timeout=0.1 if pending else None)
+                except queue.Empty:
+                    game_id = None
+                
+                if game_id is not None:
+                    if isinstance(raw, Exception):
+                        remaining -= 1
+                        yield game_id, raw, secs
+                    elif pool is None:
+                        try:
+                            data, report, metrics, parse_secs = parse_game_documents(raw,sources)
+                            result = (data, report, metrics)
+                            secs += parse_secs
+                        except Exception as e:
+                            result = e
+                        remaining -= 1
+                        yield game_id, result, secs
+                    else:
+                        pending[pool.submit(parse_game_documents,raw,sources)] = (game_id, secs)
+                    continue
+
+            #Collect finished parsing tasks
+            done, _ = wait(list(pending), timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                game_id, secs = pending.pop(future)
+                try:
+                    data, report, metrics, parse_secs = future.result()
+                    result = (data, report, metrics)
+                    secs += parse_secs
+                except Exception as e:
+                    result = e
+                remaining -= 1
+                yield game_id, result, secs
+    finally:
+        #Stop request threads and parsing workers (the scrape may end early if the caller stops iterating)
+        stop.set()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+## COMPACT SCHEMA ##
+#Columns sharing a set of categories (so values may be compared between columns)
+team_cols = ['away_team_abbr','home_team_abbr','event_team_abbr','penalty_attribution']
+name_cols = ['event_player_1_name','event_player_2_name','event_player_3_name','event_goalie_name',
+             "away_on_1","away_on_2","away_on_3","away_on_4","away_on_5","away_on_6","away_goalie",
+             "home_on_1","home_on_2","home_on_3","home_on_4","home_on_5","home_on_6","home_goalie"]
+
+#Remaining low-cardinality columns
+category_cols = ['game_date','venue','venue_location','period_type','strength_state','strength_state_venue','home_team_defending_side',
+                 'event_type','event_reason','penalty_type','event_team_venue','shift_type',
+                 'event_player_1_pos','event_player_2_pos','event_player_3_pos','event_player_1_hand',
+                 'shot_type','zone_code','event_coach','away_coach','home_coach']
+
+id_cols = ['season','game_id','event_id',
+           'event_player_1_id','event_player_2_id','event_player_3_id','event_goalie_id',
+           "away_on_1_id","away_on_2_id","away_on_3_id","away_on_4_id","away_on_5_id","away_on_6_id","away_goalie_id",
+           "home_on_1_id","home_on_2_id","home_on_3_id","home_on_4_id","home_on_5_id","home_on_6_id","home_goalie_id"]
+
+coord_cols = ['x','y','x_fixed','y_fixed','x_adj','y_adj','event_distance','event_angle']
+
+def compact_pbp(pbp):
+    #Given play-by-play, return play-by-play with compact column types (categoricals, nullable Int32 IDs, and float32 coordinates)
+    #Columns not included in the schema are left as they are
+    pbp = pbp.copy()
+    
+    for cols in [team_cols, name_cols]:
+        cols = [col for col in cols if col in pbp.columns]
+        if not cols:
+            continue
+        
+        #Blank strings are treated as missing values
+        values = pbp[cols].replace('',np.nan)
+        categories = pd.unique(values.stack().astype(str))
+        dtype = pd.CategoricalDtype(np.sort(categories))
+        
+        for col in cols:
+            pbp[col] = values[col].astype(dtype)
+
+    for col in [col for col in category_cols if col in pbp.columns]:
+        pbp[col] = pbp[col].replace('',np.nan).astype('category')
+
+    for col in [col for col in id_cols if col in pbp.columns]:
+        pbp[col] = pd.to_numeric(pbp[col], errors='coerce').astype('Int32')
+
+    for col in [col for col in coord_cols if col in pbp.columns]:
+        pbp[col] = pd.to_numeric(pbp[col], errors='coerce').astype('float32')
+
+    #Return: compacted play-by-play
+    return pbp
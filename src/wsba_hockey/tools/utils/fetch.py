@@ -0,0 +1,316 @@
+import os
+import json
+import time
+import random
+import threading
+import requests as rs
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from wsba_hockey.tools.utils.report import reporter
+
+## FETCH ##
+# Provided in this file are functions handling requests to the NHL (and supplementary) endpoints used in the WSBA Hockey Python package. #
+
+## GLOBAL VARIABLES ##
+#A single session keeps connections to the NHL hosts alive between requests
+session = rs.Session()
+
+#Status codes which indicate a temporary problem with the host (retried)
+TRANSIENT_CODES = [408, 425, 429, 500, 502, 503, 504]
+
+#Requests per second allowed (and burst size) by host; hosts not listed use the default entry
+HOST_LIMITS = {'default':{'rate':10, 'burst':10},
+               'api-web.nhle.com':{'rate':20, 'burst':20},
+               'api.nhle.com':{'rate':20, 'burst':20},
+               'www.nhl.com':{'rate':10, 'burst':10}}
+
+## REQUEST GOVERNOR ##
+class TransientError(Exception):
+    #Request failed for reasons which are expected to pass (rate limiting, timeouts, server errors)
+    pass
+
+class CircuitOpenError(TransientError):
+    #Requests to a host are suspended after repeated transient failures
+    pass
+
+class HostState:
+    #Token bucket and circuit breaker for a single host
+    
+    def __init__(self, name, rate, burst):
+        self.name = name
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        
+        #Consecutive transient failures and the time the circuit reopens (if open)
+        self.failures = 0
+        self.open_until = 0
+        
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        #Wait for a token to become available
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class Governor:
+    #Governs requests made to each host: token-bucket rate limiting, jittered exponential retry on transient failures, and circuit breaking
+    #Rates are halved when a host responds with 429 and recover gradually with successful requests (up to the rate configured in HOST_LIMITS)
+
+    def __init__(self, retries=4, backoff=0.5, max_backoff=30, threshold=8, cooldown=60, timeout=30):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.timeout = timeout
+
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def host(self, url):
+        #Return state for the host of the provided url
+        name = urlparse(url).netloc
+        with self.lock:
+            if name not in self.hosts:
+                limits = HOST_LIMITS.get(name, HOST_LIMITS['default'])
+                self.hosts[name] = HostState(name, limits['rate'], limits['burst'])
+            return self.hosts[name]
+
+    def get(self, url, headers=None):
+        #Given url, return response (raises TransientError if retries are exhausted and requests.HTTPError for other failed responses)
+        host = self.host(url)
+
+        for attempt in range(self.retries+1):
+            if time.monotonic() < host.open_until:
+                raise CircuitOpenError(f'Requests to {urlparse(url).netloc} are suspended after repeated failures.')
+            
+            host.acquire()
+            retry_after = None
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout)
+                
+                if response.status_code not in TRANSIENT_CODES:
+                    self.success(host)
+                    response.raise_for_status()
+                    return response
+                
+                error = f'{response.status_code} response from {url}'
+                retry_after = response.headers.get('Retry-After')
+                if response.status_code == 429:
+                    with host.lock:
+                        host.rate = max(host.rate / 2, 0.5)
+            except (rs.Timeout, rs.ConnectionError) as e:
+                error = f'{type(e).__name__} requesting {url}'
+
+            self.failure(host)
+            
+            #Wait before retrying (full jitter over an exponentially increasing window unless the host specifies a wait)
+            if attempt < self.retries:
+                try:
+                    #Waits specified by the host are bounded by the backoff limit (negative waits are ignored)
+                    wait = max(0.0, min(float(retry_after), self.max_backoff))
+                except (TypeError, ValueError):
+                    wait = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+                reporter.emit('retry', host=host.name, url=url, attempt=attempt+1, error=error, wait=wait)
+                time.sleep(wait)
+        
+        raise TransientError(error)
+
+    def success(self, host):
+        #Close circuit and recover rate after a successful request
+        with host.lock:
+            host.failures = 0
+            host.rate = min(host.max_rate, host.rate + 0.1)
+
+    def failure(self, host):
+        #Open circuit after too many consecutive transient failures
+        with host.lock:
+            host.failures += 1
+            opened = host.failures >= self.threshold
+            if opened:
+                host.open_until = time.monotonic() + self.cooldown
+                host.failures = 0
+
+        if opened:
+            reporter.emit('circuit_open', host=host.name, cooldown=self.cooldown)
+
+    def wait_for_circuits(self):
+        #Wait until every open circuit has closed (at most the cooldown) and return the seconds waited
+        with self.lock:
+            hosts = list(self.hosts.values())
+        wait = min(max([host.open_until for host in hosts], default=0) - time.monotonic(), self.cooldown)
+
+        if wait > 0:
+            reporter.message(f'Waiting {wait:.0f} seconds for suspended hosts to resume...')
+            time.sleep(wait)
+            return wait
+        return 0.0
+
+#Requests made by the package are governed by a single instance (adjust settings by replacing attributes)
+governor = Governor()
+
+def is_transient(error):
+    #Given an exception raised while scraping, return whether it is expected to pass when retried
+    return isinstance(error, TransientError)
+
+## FETCH FUNCTIONS ##
+def conditional_get(url, cache):
+    #Given url and a cache dict, return document content and whether it changed since the last request
+    #The cache stores the ETag, Last-Modified header, and content of each url previously requested so unchanged documents return 304 without a body
+    entry = cache.get(url)
+
+    headers = {}
+    if entry:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = governor.get(url, headers)
+
+    #Document is unchanged; return what was stored previously
+    if response.status_code == 304 and entry:
+        reporter.emit('cache', cache='conditional', hits=1, misses=0)
+        return entry['content'], False
+
+    reporter.emit('cache', cache='conditional', hits=0, misses=1)
+
+    cache[url] = {'etag':response.headers.get('ETag'),
+                  'last_modified':response.headers.get('Last-Modified'),
+                  'content':response.content}
+
+    #Some hosts do not honor conditional headers; compare content in these cases
+    changed = (entry is None) or (entry['content'] != response.content)
+
+    #Return: document content and change conditional
+    return response.content, changed
+
+def get_json(url):
+    #Given url, return json document
+    return governor.get(url).json()
+
+def get_content(url):
+    #Given url, return raw document content
+    return governor.get(url).content
+
+def get_sized_json(url):
+    #Given url, return json document and size of the response (in bytes)
+    response = governor.get(url)
+    return response.json(), len(response.content)
+
+def fetch_many(urls, workers=8):
+    #Given list of urls, return their json documents (in the same order) with requests made concurrently
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(get_json, urls))
+
+## ENTITY FUNCTIONS ##
+#Endpoints for entities requested in bulk (keys are formatted into each url)
+ENTITY_URLS = {'player_info':'https://api-web.nhle.com/v1/player/{}/landing',
+               'roster':'https://api-web.nhle.com/v1/roster/{}/{}',
+               'game_info':'https://api-web.nhle.com/v1/gamecenter/{}/landing',
+               'edge':'https://api-web.nhle.com/v1/edge/{}-detail/{}/{}/{}'}
+
+#Time (in seconds) entities remain valid in the persistent cache
+ENTITY_TTL = {'player_info':86400,
+              'roster':86400,
+              'game_info':3600,
+              'edge':86400}
+
+#Entities which may still change are not written to the persistent cache (game information is only cached once the game is final)
+ENTITY_FINAL = {'game_info':lambda data: data.get('gameState') in ['OFF','FINAL']}
+
+#Persistent cache location (may be overridden with the WSBA_CACHE_DIR environment variable)
+CACHE_DIR = os.environ.get('WSBA_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.wsba_hockey', 'cache'))
+
+def entity_path(entity, key):
+    #Given entity type and key, return the location of the entity in the persistent cache
+    return os.path.join(CACHE_DIR, entity, '_'.join(str(part) for part in key)+'.json')
+
+def read_entity(entity, key, ttl):
+    #Return cached entity if it exists and has not expired
+    path = entity_path(entity, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return data if is_final(entity, data) else None
+
+def is_final(entity, data):
+    #Return whether the entity will no longer change (and may be cached)
+    return ENTITY_FINAL.get(entity, lambda data: True)(data)
+
+def write_entity(entity, key, data):
+    #Write entity to the persistent cache (failures to write do not stop the scrape)
+    path = entity_path(entity, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        #Write to a temporary file first so concurrent readers never see a partial document
+        temp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp, path)
+    except OSError:
+        pass
+
+def get_entity(url):
+    #Given url, return json document (None for entities which do not exist)
+    #Requests which fail after all retries (or while the circuit of the host is open) raise TransientError as the entity may exist
+    try:
+        return get_json(url)
+    except TransientError:
+        raise
+    except (rs.HTTPError, ValueError):
+        return None
+
+def fetch_entities(entity, keys, workers=8, cache=True, ttl=None):
+    #Given entity type and list of keys, return dict of json documents by key (None for entities which do not exist and the TransientError raised for entities with failed requests)
+    #Repeated keys are only requested once and entities in the persistent cache are not requested until they expire
+    ttl = ENTITY_TTL[entity] if ttl is None else ttl
+    
+    #Keys are stored as tuples of url parts
+    keys = list(dict.fromkeys(key if isinstance(key, tuple) else (key,) for key in keys))
+
+    docs = {}
+    if cache and ttl > 0:
+        for key in keys:
+            data = read_entity(entity, key, ttl)
+            if data is not None:
+                docs[key] = data
+
+    def request(key):
+        try:
+            data = get_entity(ENTITY_URLS[entity].format(*key))
+        except TransientError as e:
+            return e
+        
+        if data is not None and cache and is_final(entity, data):
+            write_entity(entity, key, data)
+        return data
+
+    #Request entities which are not cached
+    missing = [key for key in keys if key not in docs]
+    reporter.emit('cache', cache=entity, hits=len(keys)-len(missing), misses=len(missing))
+    if missing:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            docs.update(zip(missing, pool.map(request, missing)))
+
+    #Return: json documents in order of the provided (unique) keys
+    return {(key[0] if len(key) == 1 else key): docs[key] for key in keys}
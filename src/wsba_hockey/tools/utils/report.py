@@ -0,0 +1,216 @@
+import time
+import logging
+import threading
+import pandas as pd
+
+## REPORT ##
+# Provided in this file are the reporters which receive progress and metrics events from the WSBA Hockey Python package. #
+
+## EVENTS ##
+# Each event is a dict with its name ('event'), the time it occured ('time'), and the fields below
+# message: message, level ('info' or 'warning')
+# scrape_started: games
+# game_started: game_id
+# stage: game_id, stage, seconds, bytes, rows (see StageRecorder in scraping.py)
+# game_finished: game_id, seconds, rows, bytes, finished, total, elapsed, rate (games per second), eta (seconds remaining)
+# game_failed: game_id, error, transient, retrying, problem (known problem with the game, if any)
+# scrape_finished: games, completed, failed, transient, seconds, rate, bytes
+# retry: host, url, attempt, error, wait
+# circuit_open: host, cooldown
+# cache: cache, hits, misses
+# partition_finished: rows, finished, elapsed
+# task_finished: task, seconds, rows
+# Events from games parsed in separate processes (parse_workers > 1) are limited to those reported by the calling process
+
+## GLOBAL VARIABLES ##
+#Name of the logger used by the logging sink
+LOGGER = 'wsba_hockey'
+
+def describe(record):
+    #Given event, return a readable description of the event (None for events which are only of interest as metrics)
+    event = record['event']
+    if event == 'message':
+        return record['message']
+    elif event == 'game_finished':
+        eta = f" ETA: {record['eta']/60:.1f} minutes." if record['eta'] is not None and record['finished'] < record['total'] else ''
+        return f"Scraped game {record['game_id']} in {record['seconds']:.2f} seconds. {record['finished']}/{record['total']} ({(record['finished']/record['total'])*100:.2f}%).{eta}"
+    elif event == 'game_failed':
+        if record['transient']:
+            return f"Requests for game {record['game_id']} failed{' (the game will be retried)' if record['retrying'] else ''}.  Exception: {record['error']}"
+        elif record['problem']:
+            return f"Game {record['game_id']} has a known problem: {record['problem']}"
+        else:
+            return f"Unable to scrape game {record['game_id']}.  Exception: {record['error']}"
+    elif event == 'scrape_finished':
+        return f"Scraped {record['completed']}/{record['games']} games in {record['seconds']:.2f} seconds ({record['rate']:.2f} games per second)."
+    else:
+        return None
+
+## SINKS ##
+# A sink is any callable accepting an event (functions provided to nhl_configure_reporting are used as sinks directly)
+class ConsoleSink:
+    #Prints readable events (the output of the package before reporting was configurable)
+
+    def __call__(self, record):
+        text = describe(record)
+        if text is not None:
+            print(text)
+
+class LoggingSink:
+    #Writes events to a logger: readable events at INFO (or WARNING for failures) and all other events at DEBUG as key=value pairs
+
+    def __init__(self, logger=LOGGER, level=logging.INFO):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def __call__(self, record):
+        text = describe(record)
+        if text is None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                fields = ' '.join(f'{key}={value}' for key, value in record.items() if key not in ['event','time'])
+                self.logger.debug(f"{record['event']} {fields}")
+            return
+
+        level = logging.WARNING if record['event'] == 'game_failed' or record.get('level') == 'warning' else self.level
+        self.logger.log(level, text, extra={'wsba_event':record})
+
+class MetricsSink:
+    #Aggregates events in memory: scrape throughput, stage totals, retries, and cache hit rates
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+            self.started = None
+            self.updated = None
+            self.games = {'finished':0,'failed':0,'transient':0,'rows':0,'bytes':0}
+            self.stages = {}
+            self.retries = {}
+            self.caches = {}
+            self.tasks = {}
+
+    def __call__(self, record):
+        event = record['event']
+        with self.lock:
+            self.counts[event] = self.counts.get(event, 0) + 1
+            if event in ['scrape_started','game_started'] and self.started is None:
+                self.started = record['time']
+
+            if event == 'game_finished':
+                self.games['finished'] += 1
+                self.games['rows'] += record['rows'] or 0
+                self.games['bytes'] += record['bytes'] or 0
+                self.updated = record['time']
+            elif event == 'game_failed':
+                self.games['transient' if record['transient'] else 'failed'] += 1
+                self.updated = record['time']
+            elif event == 'stage':
+                stage = self.stages.setdefault(record['stage'], {'count':0,'seconds':0.0,'bytes':0,'rows':0})
+                stage['count'] += 1
+                stage['seconds'] += record['seconds']
+                stage['bytes'] += record['bytes'] or 0
+                stage['rows'] += record['rows'] or 0
+            elif event == 'retry':
+                self.retries[record['host']] = self.retries.get(record['host'], 0) + 1
+            elif event == 'cache':
+                cache = self.caches.setdefault(record['cache'], {'hits':0,'misses':0})
+                cache['hits'] += record['hits']
+                cache['misses'] += record['misses']
+            elif event == 'task_finished':
+                task = self.tasks.setdefault(record['task'], {'count':0,'seconds':0.0,'rows':0})
+                task['count'] += 1
+                task['seconds'] += record['seconds']
+                task['rows'] += record['rows'] or 0
+
+    def summary(self):
+        #Return summary of the events received (throughput is measured from the first scrape or game started to the last game finished or failed)
+        with self.lock:
+            elapsed = (self.updated - self.started) if self.started is not None and self.updated is not None else 0.0
+
+            caches = {}
+            for name, cache in self.caches.items():
+                lookups = cache['hits'] + cache['misses']
+                caches[name] = {**cache, 'hit_rate':cache['hits']/lookups if lookups else None}
+
+            return {'events':dict(self.counts),
+                    'games':dict(self.games),
+                    'seconds':elapsed,
+                    'games_per_second':self.games['finished']/elapsed if elapsed > 0 else None,
+                    'bytes_per_second':self.games['bytes']/elapsed if elapsed > 0 else None,
+                    'retries':dict(self.retries),
+                    'caches':caches,
+                    'tasks':{name:dict(task) for name, task in self.tasks.items()}}
+
+    def stage_totals(self):
+        #Return totals of each scrape stage
+        with self.lock:
+            return pd.DataFrame([{'stage':stage, **totals} for stage, totals in self.stages.items()],
+                                columns=['stage','count','seconds','bytes','rows'])
+
+## REPORTER ##
+class Reporter:
+    #Passes events to each of its sinks (without sinks, which is the default, events are discarded before they are created)
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+        self.lock = threading.Lock()
+
+    @property
+    def active(self):
+        return bool(self.sinks)
+
+    def configure(self, sinks=None):
+        #Replace sinks (the reporter itself is kept so modules holding a reference to it receive the new sinks)
+        with self.lock:
+            self.sinks = list(sinks or [])
+
+    def emit(self, event, **fields):
+        #Send event to each sink (failures of a sink do not stop the work being reported)
+        sinks = self.sinks
+        if not sinks:
+            return
+
+        record = {'event':event,'time':time.time(),**fields}
+        for sink in sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                logging.getLogger(LOGGER).warning(f'Reporting sink {sink!r} failed on {event} event: {e}')
+
+    def message(self, message, level='info'):
+        #Report progress message
+        self.emit('message', message=message, level=level)
+
+    def metrics(self):
+        #Return metrics sinks of the reporter
+        return [sink for sink in self.sinks if isinstance(sink, MetricsSink)]
+
+    def summary(self):
+        #Return summary of the first metrics sink (None if the reporter has no metrics sink)
+        metrics = self.metrics()
+        return metrics[0].summary() if metrics else None
+
+class Progress:
+    #Tracks the games finished in a scrape for throughput and estimated time remaining
+
+    def __init__(self, total):
+        self.total = total
+        self.finished = 0
+        self.start = time.perf_counter()
+
+    def update(self):
+        #Count finished game and return progress fields of the game_finished event
+        self.finished += 1
+        elapsed = time.perf_counter() - self.start
+        rate = self.finished/elapsed if elapsed > 0 else None
+        return {'finished':self.finished,
+                'total':self.total,
+                'elapsed':elapsed,
+                'rate':rate,
+                'eta':(self.total-self.finished)/rate if rate else None}
+
+#Events of the package are reported by a single instance (quiet until configured with nhl_configure_reporting)
+reporter = Reporter()
@@ -5,6 +5,7 @@ import xgboost as xgb
 import scipy.sparse as sp
 import wsba_hockey.wsba_main as wsba
 import wsba_hockey.tools.scraping as scraping
+from wsba_hockey.tools.utils.report import reporter
 import matplotlib.pyplot as plt
 from sklearn.calibration import calibration_curve
 from sklearn.metrics import roc_curve, auc
@@ -101,7 +102,7 @@ def fix_players(pbp):
     if not find:
         pass
     else:
-        print('Adding player info to pbp...')
+        reporter.message('Adding player info to pbp...')
         roster = pd.read_csv(roster_path)
         roster = roster.loc[roster['player_id'].isin(find)].drop_duplicates(['player_id'])[['player_name','player_id','handedness']]
 
@@ -189,11 +190,8 @@ def prep_xG_data(data):
 def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist', states = False, hypertune = False, train = False, test_path = test_path, cv_path = cv_path, model_path = xg_model_path, train_runs = 20, cv_runs = 20):
     #Train and calculate the WSBA Expected Goals model
     
-    #Add index for future merging
-    pbp['event_index'] = pbp.index
-
-    #Initialize xG column for all events
-    pbp['xG'] = 0.0
+    #Add index for future merging and initialize xG column for all events (on a new frame, leaving the provided play-by-play unchanged)
+    pbp = pbp.assign(event_index=pbp.index,xG=0.0)
 
     #Recalibrate coordinates
     pbp = scraping.adjust_coords(pbp)
@@ -244,7 +242,7 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
             xgb_matrix = xgb.DMatrix(data=predictors,label=is_goal_vect,feature_names=(continuous+boolean))
 
             if train:
-                print('### XGBOOST MODEL TRAINING ###')
+                reporter.message('### XGBOOST MODEL TRAINING ###')
                 if hypertune:
                     # Number of runs
                     run_num = train_runs
@@ -253,10 +251,10 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
                     best_df = pd.DataFrame(columns=["max_depth", "eta", "gamma", "subsample", "colsample_bytree", "min_child_weight", "max_delta_step"])
                     best_ll = pd.DataFrame(columns=["ll", "ll_rounds", "auc", "auc_rounds", "seed"])
 
-                    print('### HYPERTUNING ###')
+                    reporter.message('### HYPERTUNING ###')
                     # Loop
                     for i in range(run_num):
-                        print(f"## LOOP: {i+1} ##")
+                        reporter.message(f"## LOOP: {i+1} ##")
                         
                         param = {
                             "objective": "binary:logistic",
@@ -318,9 +316,9 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
                     run_num = cv_runs
                     cv_test = pd.DataFrame(columns=["AUC_rounds", "AUC", "LL_rounds", "LL", "seed"])
 
-                    print('### CROSS-VALIDATION ###')
+                    reporter.message('### CROSS-VALIDATION ###')
                     for i in range(run_num):
-                        print(f"## LOOP: {i+1} ##")
+                        reporter.message(f"## LOOP: {i+1} ##")
                         
                         seed = np.random.randint(0, 10000)
                         np.random.seed(seed)
@@ -352,7 +350,7 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
                     best_all = pd.read_csv(test_path)
                     cv_final = pd.read_csv(cv_path)
 
-                    print('Loaded hyperparameters...')
+                    reporter.message('Loaded hyperparameters...')
                     # Final parameters
                     param_7_EV = {
                         "objective": "binary:logistic",
@@ -365,7 +363,7 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
                         "max_delta_step": best_all['max_delta_step'].iloc[0],
                     }
 
-                print('Training model...')
+                reporter.message('Training model...')
                 seed = int(cv_final['seed'].iloc[0])
                 np.random.seed(seed)
                 model = xgb.train(
@@ -405,7 +403,7 @@ def wsba_xG(pbp, model_type: Literal['bayesian', 'frequentist'] = 'frequentist',
             return pbp_xg
 
 def feature_importance(model_path = xg_model_path):
-    print('Feature importance for WSBA xG Model...')
+    reporter.message('Feature importance for WSBA xG Model...')
     
     for en in [False, True]:
         model = xgb.Booster()
@@ -424,7 +422,7 @@ def feature_importance(model_path = xg_model_path):
         plt.savefig(os.path.join(metric_path,f'feature_importance{'_en' if en else ''}.png'),bbox_inches='tight')
 
 def roc_auc_curve(pbp):
-    print('ROC-AUC Curve for WSBA xG Model...')
+    reporter.message('ROC-AUC Curve for WSBA xG Model...')
 
     if 'xG' in pbp.columns:
         data = pbp.loc[(pbp['event_type'].isin(fenwick_events))&(pbp['strength_state'].isin(strengths))&(pbp['x'].notna())&(pbp['y'].notna())]
@@ -441,10 +439,10 @@ def roc_auc_curve(pbp):
         plt.legend(loc="lower right")
         plt.savefig(os.path.join(metric_path, f'roc_auc_curve.png'), bbox_inches='tight')
     else:
-        print('No xG found for provided play-by-play data.  Apply xG model to the play-by-play data first.')
+        reporter.message('No xG found for provided play-by-play data.  Apply xG model to the play-by-play data first.',level='warning')
 
 def reliability(pbp):
-    print('Reliability for WSBA xG Model...')
+    reporter.message('Reliability for WSBA xG Model...')
 
     if 'xG' in pbp.columns: 
         data = pbp.loc[(pbp['event_type'].isin(fenwick_events))&(pbp['strength_state'].isin(strengths))&(pbp['x'].notna())&(pbp['y'].notna())]
@@ -460,4 +458,4 @@ def reliability(pbp):
         plt.savefig(os.path.join(metric_path, f'reliability.png'), bbox_inches='tight')
 
     else:
-        print('No xG found for provided play-by-play data.  Apply xG model to the play-by-play data first.')
+        reporter.message('No xG found for provided play-by-play data.  Apply xG model to the play-by-play data first.',level='warning')
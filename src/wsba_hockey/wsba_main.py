@@ -1,16 +1,24 @@
 import random
 import os
+import shutil
 import time
+import logging
 import requests as rs
 import pandas as pd
 import matplotlib.pyplot as plt
-from typing import Literal, Union
+from queue import Queue
+from typing import Callable, Iterator, Literal, Union
 from datetime import datetime, timedelta, date
+from functools import lru_cache
 from wsba_hockey.tools.scraping import *
 from wsba_hockey.tools.xg_model import *
 from wsba_hockey.tools.agg import *
 from wsba_hockey.tools.plotting import *
 from wsba_hockey.tools.columns import *
+from wsba_hockey.tools.live import *
+from wsba_hockey.tools.rapm import rapm_model
+from wsba_hockey.tools.utils.fetch import fetch_entities, is_transient
+from wsba_hockey.tools.utils.report import reporter, Reporter, ConsoleSink, LoggingSink, MetricsSink
 
 ### WSBA HOCKEY ###
 ## Provided below are all integral functions in the WSBA Hockey Python package. ##
@@ -138,8 +146,51 @@ FENWICK_EVENTS = [
     'goal'
 ]
 
+## REPORTING FUNCTIONS ##
+def nhl_configure_reporting(sinks:str | Callable[[dict], None] | list[str | Callable[[dict], None]] | None = None, logger:str = 'wsba_hockey', level:int = logging.INFO) -> Reporter:
+    """
+    Configure where the progress and metrics of the package are reported.  Nothing is reported until this function is called.
+
+    Events are dicts with the event name ('event'), the time the event occured ('time'), and fields describing the event: progress messages ('message'), the start and finish of each scrape and game (with throughput and estimated time remaining), the stages of each game (wall time, bytes, and rows), failed games, request retries, cache hits and misses, and the time taken by stat calculations.
+
+    Args:
+        sinks (str or Callable[[dict], None] or List, optional):
+            Where events are sent.  'console' prints progress messages, 'logging' writes events to a logger (messages at the provided level and all other events at DEBUG), 'metrics' aggregates events in memory (see the summary method of the returned reporter), and functions are called with each event.  Default is None (events are not reported).
+        logger (str, optional):
+            Name of the logger used by the 'logging' sink.  Default is 'wsba_hockey'.
+        level (int, optional):
+            Level of progress messages written by the 'logging' sink.  Default is logging.INFO.
+
+    Returns:
+        Reporter:
+            The reporter of the package.  reporter.summary() returns the games scraped, throughput (games and bytes per second), stage totals, retries by host, and hit rates of each cache if 'metrics' is included in sinks.
+    """
+
+    #Wrap sink in a list if only a single sink is provided
+    sinks = [] if sinks is None else (sinks if isinstance(sinks, list) else [sinks])
+
+    named = {'console':lambda: ConsoleSink(),
+             'logging':lambda: LoggingSink(logger, level),
+             'metrics':lambda: MetricsSink()}
+    
+    configured = []
+    for sink in sinks:
+        if isinstance(sink, str):
+            if sink not in named:
+                raise ValueError(f"Unknown sink '{sink}' (use 'console', 'logging', 'metrics', or a function).")
+            configured.append(named[sink]())
+        elif callable(sink):
+            configured.append(sink)
+        else:
+            raise TypeError(f'Sinks must be strings or functions (received {type(sink).__name__}).')
+
+    reporter.configure(configured)
+
+    #Return: reporter of the package
+    return reporter
+
 ## SCRAPE FUNCTIONS ##
-def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:list[str] = [], xg:bool = False, sources:bool = False, errors:bool = False):
+def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:list[str] = [], xg:bool = False, sources:bool = False, errors:bool = False, compact:bool = False, fetch_workers:int = 4, parse_workers:int = 1, queue_size:int = 8, metrics:bool = False, metrics_hook:Callable[[int, pd.DataFrame], None] | None = None, cube:bool = False):
     """
     Given a set of game_ids (NHL API), return complete play-by-play information as requested.
 
@@ -156,6 +207,20 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
             If True, saves raw HTML, JSON, SHIFTS, and single-game full play-by-play to a separate folder in the working directory. Default is False.
         errors (bool, optional):
             If True, includes a list of game IDs that failed to scrape in the return. Default is False.
+        compact (bool, optional):
+            If True, returns play-by-play with compact column types (see nhl_compact_pbp). Default is False.
+        fetch_workers (int, optional):
+            Number of threads requesting game documents. Default is 4.
+        parse_workers (int, optional):
+            Number of processes parsing game documents. Games are parsed in the calling process if less than two (scripts using more than one worker should be guarded by `if __name__ == '__main__':`). Default is 1.
+        queue_size (int, optional):
+            Number of games with requested documents which may wait to be parsed before requests pause. Default is 8.
+        metrics (bool, optional):
+            If True, includes metrics of each stage of the scrape of each game (wall time in seconds, bytes downloaded, and rows produced) in the return. Default is False.
+        metrics_hook (Callable[[int, pd.DataFrame], None], optional):
+            Function called with the game ID and the stage metrics of each game (wall time in seconds, bytes downloaded, and rows produced by each stage) as soon as the game is scraped. Default is None.
+        cube (bool, optional):
+            If True, builds the stat cube of each game as soon as it is scraped (see nhl_build_stat_cube) and includes the stat cube of the scraped games in the return. Default is False.
 
     Returns:
         pd.DataFrame:
@@ -165,12 +230,16 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
             - 'pbp': play-by-play events
             - 'shifts': shift change events
             - 'errors' (optional): list of game IDs that failed if errors=True
+            - 'transient' (optional): list of game IDs with requests that failed after all retries if errors=True (these games are not included in 'errors' and may be scraped again later)
+            - 'merge_report' (optional): DataFrame reporting how the JSON and HTML events of each game were merged (method and unmatched events) if errors=True
+            - 'metrics' (optional): DataFrame of the stages of the scrape of each game (game_id, stage, seconds, bytes, and rows) if metrics=True
+            - 'cube' (optional): stat cube of the scraped games (built game-by-game from all events) if cube=True
+            If split_shifts is False and errors, metrics, or cube is True, the dictionary includes 'pbp' and the optional keys.
     """
     
     #Wrap game_id in a list if only a single game_id is provided
     game_ids = [game_ids] if type(game_ids) != list else game_ids
 
-    pbps = []
     if game_ids[0] == 'random':
         #Randomize selection of game_ids
         #Some ids returned may be invalid (for example, 2020022000)
@@ -180,9 +249,8 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
 
         game_ids = []
         i = 0
-        print("Finding valid, random game ids...")
+        reporter.message("Finding valid, random game ids...")
         while i is not num:
-            print(f"\rGame IDs found in range {start}-{end}: {i}/{num}",end="")
             rand_year = random.randint(start,end)
             rand_season_type = random.randint(2,3)
             rand_game = random.randint(1,1312)
@@ -191,7 +259,7 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
             rand_id = f'{rand_year}{rand_season_type:02d}{rand_game:04d}'
             try: 
                 #If game exists and has at least begun, then scraping can occur.
-                rand_data = rs.get(f"https://api-web.nhle.com/v1/gamecenter/{rand_id}/play-by-play").json()
+                rand_data = get_json(f"https://api-web.nhle.com/v1/gamecenter/{rand_id}/play-by-play")
                 if rand_data['gameState'] == 'FUT':
                     continue
                 else:
@@ -200,55 +268,48 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
             except: 
                 continue
         
-        print(f"\rGame IDs found in range {start}-{end}: {i}/{num}")
+        reporter.message(f"Game IDs found in range {start}-{end}: {i}/{num}")
             
-    #Scrape each game
-    #Track Errors
+    #Scrape each game (documents are requested and parsed in separate stages; the progress of each game is reported as it finishes)
+    #Track Errors (games which cannot be scraped are seperated from those which failed due to temporary request failures)
     error_ids = []
-    prog = 0
-    for game_id in game_ids:
-        print(f'Scraping data from game {game_id}...',end='')
-        start = time.perf_counter()
+    transient_ids = []
+    results = {}
+    cubes = {}
+    for game_id, result, secs in scrape_games(game_ids, sources, fetch_workers, parse_workers, queue_size, problems=KNOWN_PROBS):
+        if isinstance(result, Exception):
+            #Requests for this game failed again after the rest of the scrape
+            if is_transient(result):
+                transient_ids.append(game_id)
+                continue
 
-        try:
-            #Retrieve data
-            info = get_game_info(game_id)
-            data = combine_data(info, sources)
-                
-            #Append data to list
-            pbps.append(data)
+            #Games such as the all-star game and pre-season games will incur this error (other games have known problems)
+            error_ids.append(game_id)
+            continue
 
-            end = time.perf_counter()
-            secs = end - start
-            prog += 1
-            
-            #Export if sources is true
-            if sources:
-                dirs = f'sources/{info['season']}/'
+        #Store data (and report of the JSON and HTML merge and stage metrics)
+        results[game_id] = result
 
-                if not os.path.exists(dirs):
-                    os.makedirs(dirs)
+        if metrics_hook is not None:
+            metrics_hook(game_id, result[2])
 
-                data.to_csv(f'{dirs}{info['game_id']}.csv',index=False)
+        #Build stat cube of the game as it is ingested
+        if cube:
+            cubes[game_id] = nhl_build_stat_cube(result[0])
 
-            print(f" finished in {secs:.2f} seconds. {prog}/{len(game_ids)} ({(prog/len(game_ids))*100:.2f}%)")
-        except Exception as e:
-            #Games such as the all-star game and pre-season games will incur this error
-            
-            #Other games have known problems
-            if game_id in KNOWN_PROBS.keys():
-                print(f"\nGame {game_id} has a known problem: {KNOWN_PROBS[game_id]}")
-            else:
-                print(f"\nUnable to scrape game {game_id}.  Exception: {e}")
-            
-            #Track error
-            error_ids.append(game_id)
-            
+    #Games are returned in the order provided (rather than the order they finished)
+    pbps = [results[game_id][0] for game_id in game_ids if game_id in results]
+    reports = [results[game_id][1] for game_id in game_ids if game_id in results]
+    stages = [results[game_id][2] for game_id in game_ids if game_id in results]
+        
     #Add all pbps together
     if not pbps:
-        print("\rNo data returned.")
+        reporter.message("No data returned.",level='warning')
         return pd.DataFrame()
     df = pd.concat(pbps)
+    merge_report = pd.concat(reports).reset_index(drop=True)
+    stage_metrics = pd.concat(stages).reset_index(drop=True)
+    stat_cube = pd.concat([cubes[game_id] for game_id in game_ids if game_id in cubes]).reset_index(drop=True) if cube else None
 
     #Add xG if necessary
     if xg:
@@ -256,11 +317,16 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
     else:
         ""
 
-    #Print final message
+    #Compact column types if necessary (after xG is applied)
+    if compact:
+        df = nhl_compact_pbp(df)
+
+    #Report final message
+    reporter.message('Scrape of provided games finished.')
     if error_ids:
-        print(f'\rScrape of provided games finished.\nThe following games failed to scrape: {error_ids}')
-    else:
-        print('\rScrape of provided games finished.')
+        reporter.message(f'The following games failed to scrape: {error_ids}',level='warning')
+    if transient_ids:
+        reporter.message(f'Requests for the following games failed (these games may be scraped again later): {transient_ids}',level='warning')
     
     #Split pbp and shift events if necessary
     #Return: complete play-by-play with data removed or split as necessary
@@ -274,22 +340,35 @@ def nhl_scrape_game(game_ids:int | list[int], split_shifts:bool = False, remove:
             }
         
         if errors:
-            pbp_dict.update({'errors':error_ids})
+            pbp_dict.update({'errors':error_ids,
+                             'transient':transient_ids,
+                             'merge_report':merge_report})
+        if metrics:
+            pbp_dict['metrics'] = stage_metrics
+        if cube:
+            pbp_dict['cube'] = stat_cube
 
         return pbp_dict
     else:
         #Return: all events that are not set for removal by the provided list
         pbp = df.loc[~df['event_type'].isin(remove)]
 
-        if errors:
-            pbp_dict = {'pbp':pbp,
-                        'errors':error_ids}
+        if errors or metrics or cube:
+            pbp_dict = {'pbp':pbp}
+            if errors:
+                pbp_dict.update({'errors':error_ids,
+                                 'transient':transient_ids,
+                                 'merge_report':merge_report})
+            if metrics:
+                pbp_dict['metrics'] = stage_metrics
+            if cube:
+                pbp_dict['cube'] = stat_cube
             
             return pbp_dict
         else:
             return pbp
 
-def nhl_scrape_schedule(season:int | Literal['now'] = 'now', start:str | None = None, end:str | None = None):
+def nhl_scrape_schedule(season:int | Literal['now'] = 'now', start:str | None = None, end:str | None = None, refresh:pd.DataFrame | None = None, workers:int = 8):
     """
     Given season and an optional date range, retrieve NHL schedule data.
 
@@ -300,59 +379,46 @@ def nhl_scrape_schedule(season:int | Literal['now'] = 'now', start:str | None =
             The date string (MM-DD) to start the schedule scrape at. Default is None
         end (str, optional): 
             The date string (MM-DD) to end the schedule scrape at. Default is None
+        refresh (pd.DataFrame, optional):
+            Schedule data previously returned by this function.  If provided, only dates with games which are not yet final (or dates missing from the provided data) are scraped again.  Default is None.
+        workers (int, optional):
+            Number of dates to request concurrently.  Default is 8.
 
     Returns:
         pd.DataFrame: 
             A DataFrame containing the schedule data for the specified season and date range.
     """
 
-    api = "https://api-web.nhle.com/v1/score/"
-    form = '%Y-%m-%d'
-
     #If the season argument is now (live schedule) then skip this step
     if season == 'now':
-        #Set start and end to filler values to ensure only one date is scraped (the phrase 'now' will be appened pre-scrape)
-        start = end = datetime.now()
+        dates = ['now']
     else:
-        season_data = rs.get('https://api.nhle.com/stats/rest/en/season').json()['data']
-        season_data = [s for s in season_data if s['id'] == int(season)][0]
-
-        #Select start and end dates for scrape (if none are provided use the official season start and end dates)
-        #Determine how to approach scraping; if month in season is after the new year the year must be adjusted
-        season_start = f'{(str(season)[0:4] if int(start[0:2])>=9 else str(season)[4:8])}-{start[0:2]}-{start[3:5]}' if start else season_data['startDate'][0:10]
-        season_end = f'{(str(season)[0:4] if int(end[0:2])>=9 else str(season)[4:8])}-{end[0:2]}-{end[3:5]}' if end else season_data['endDate'][0:10]
-
-        #Create datetime values from dates
-        start = datetime.strptime(season_start,form)
-        end = datetime.strptime(season_end,form)
-
-    game = []
-
-    day = (end-start).days+1
-    if day < 0:
-        #Handles dates which are over a year apart
-        day = 365 + day
-    for i in range(day):
-        now = season == 'now'
-        inc = start+timedelta(days=i)
-        
-        date_string = 'now' if now else str(inc)[:10]
+        #Select start and end dates for scrape (season information is only requested once per session)
+        start, end = get_season_dates(season,start,end)
 
-        #For each day, call NHL api and retreive info on all games of selected game
-        print(f'Scraping games {'as of' if now else 'on'} {date_string}...')
-        
-        get = rs.get(f'{api}{date_string}').json()
-        gameWeek = pd.json_normalize(get['games']).drop(columns=['goals'],errors='ignore')
-        
-        #Return nothing if there's nothing
-        if gameWeek.empty:
-            game.append(gameWeek)
-        else:
-            gameWeek['game_date'] = get['currentDate']
-            gameWeek['game_title'] = gameWeek['awayTeam.abbrev'] + " @ " + gameWeek['homeTeam.abbrev'] + " - " + gameWeek['game_date']
-            gameWeek['start_time_est'] = pd.to_datetime(gameWeek['startTimeUTC']).dt.tz_convert('US/Eastern').dt.strftime("%I:%M %p")
+        day = (end-start).days+1
+        if day < 0:
+            #Handles dates which are over a year apart
+            day = 365 + day
+
+        dates = [str(start+timedelta(days=i))[:10] for i in range(day)]
 
-        game.append(gameWeek)
+    #When refreshing, keep dates where every game is final
+    kept = pd.DataFrame()
+    if refresh is not None and not refresh.empty and season != 'now':
+        refresh = refresh.copy()
+        refresh['game_date'] = refresh['game_date'].astype(str).str[:10]
+
+        final = refresh.groupby('game_date')['game_state'].agg(lambda x: x.isin(['OFF','FINAL']).all())
+        final_dates = final.loc[final].index.to_list()
+
+        kept = refresh.loc[refresh['game_date'].isin(final_dates)&refresh['game_date'].isin(dates)]
+        dates = [date for date in dates if date not in final_dates]
+
+    reporter.message('Scraping games as of now...' if season == 'now' else f'Scraping games on {len(dates)} dates...')
+    
+    #For each day, call NHL api and retreive info on all games of selected game (days are requested concurrently)
+    game = scrape_schedule_days(dates,workers) if dates else [pd.DataFrame()]
         
     #Concatenate all games and standardize column naming
     df = pd.concat(game).rename(columns=COL_MAP['schedule'],errors='ignore')
@@ -363,12 +429,59 @@ def nhl_scrape_schedule(season:int | Literal['now'] = 'now', start:str | None =
         for team in ['away','home']:
             df[f'{team}_team_logo'] = df[f'{team}_team_logo'].str.replace('light','dark')
     except KeyError:
-        print('No games found for range of dates provided.')
+        if kept.empty:
+            reporter.message('No games found for range of dates provided.')
+
+    #Add refreshed dates back to the rest of the schedule
+    if not kept.empty:
+        df = pd.concat([kept,df]).sort_values(['game_date','game_id'])
 
     #Return: specificed schedule data
     return df[[col for col in COL_MAP['schedule'].values() if col in df.columns]]
 
-def nhl_scrape_season(season:int, split_shifts:bool = False, season_types:list[int] = [2,3], remove:list[str] = [], start:str | None = None, end:str | None = None, local:bool=False, local_path:str = SCHEDULE_PATH, xg:bool = False, sources:bool = False, errors:bool = False):
+def season_game_ids(season:int, season_types:list[int] = [2,3], start:str | None = None, end:str | None = None, local:bool = False, local_path:str = SCHEDULE_PATH):
+    #Given season and schedule options, return game IDs of season which may be scraped (see nhl_scrape_season)
+    
+    #Determine whether to use schedule data in repository or to scrape
+    local_failed = False
+
+    if local:
+        try:
+            load = pd.read_csv(local_path)
+            load['game_date'] = pd.to_datetime(load['game_date'])
+            
+            #Create datetime values from dates
+            start_date, end_date = get_season_dates(season,start,end)
+
+            load = load.loc[(load['season']==season)&
+                            (load['season_type'].isin(season_types))&
+                            (load['game_date']>=start_date)&(load['game_date']<=end_date)&
+                            (load['game_schedule_state']=='OK')&
+                            (load['game_state']!='FUT')
+                            ]
+            
+            game_ids = load['game_id'].to_list()
+        except KeyError:
+            #If loading games locally fails then force a scrape
+            local_failed = True
+            reporter.message('Loading games locally has failed.  Loading schedule data with a scrape...')
+    else:
+        local_failed = True
+
+    if local_failed:
+        load = nhl_scrape_schedule(season,start,end)
+        load = load.loc[(load['season']==season)&
+                        (load['season_type'].isin(season_types))&
+                        (load['game_schedule_state']=='OK')&
+                        (load['game_state']!='FUT')
+                        ]
+        
+        game_ids = load['game_id'].to_list()
+
+    #Return: list of game IDs
+    return game_ids
+
+def nhl_scrape_season(season:int, split_shifts:bool = False, season_types:list[int] = [2,3], remove:list[str] = [], start:str | None = None, end:str | None = None, local:bool=False, local_path:str = SCHEDULE_PATH, xg:bool = False, sources:bool = False, errors:bool = False, compact:bool = False, fetch_workers:int = 4, parse_workers:int = 1, queue_size:int = 8, metrics:bool = False, metrics_hook:Callable[[int, pd.DataFrame], None] | None = None, cube:bool = False):
     """
     Given season, scrape all play-by-play occuring within the season.
 
@@ -395,6 +508,20 @@ def nhl_scrape_season(season:int, split_shifts:bool = False, season_types:list[i
             If True, saves raw HTML, JSON, SHIFTS, and single-game full play-by-play to a separate folder in the working directory. Default is False.
         errors (bool, optional):
             If True, includes a list of game IDs that failed to scrape in the return. Default is False.
+        compact (bool, optional):
+            If True, returns play-by-play with compact column types (see nhl_compact_pbp). Default is False.
+        fetch_workers (int, optional):
+            Number of threads requesting game documents. Default is 4.
+        parse_workers (int, optional):
+            Number of processes parsing game documents. Games are parsed in the calling process if less than two (scripts using more than one worker should be guarded by `if __name__ == '__main__':`). Default is 1.
+        queue_size (int, optional):
+            Number of games with requested documents which may wait to be parsed before requests pause. Default is 8.
+        metrics (bool, optional):
+            If True, includes metrics of each stage of the scrape of each game (wall time in seconds, bytes downloaded, and rows produced) in the return. Default is False.
+        metrics_hook (Callable[[int, pd.DataFrame], None], optional):
+            Function called with the game ID and the stage metrics of each game (wall time in seconds, bytes downloaded, and rows produced by each stage) as soon as the game is scraped. Default is None.
+        cube (bool, optional):
+            If True, builds the stat cube of each game as soon as it is scraped (see nhl_build_stat_cube) and includes the stat cube of the scraped games in the return. Default is False.
 
     Returns:
         pd.DataFrame:
@@ -404,72 +531,274 @@ def nhl_scrape_season(season:int, split_shifts:bool = False, season_types:list[i
             - 'pbp': play-by-play events
             - 'shifts': shift change events
             - 'errors' (optional): list of game IDs that failed if errors=True
+            - 'transient' (optional): list of game IDs with requests that failed after all retries if errors=True (these games are not included in 'errors' and may be scraped again later)
+            - 'merge_report' (optional): DataFrame reporting how the JSON and HTML events of each game were merged (method and unmatched events) if errors=True
+            - 'metrics' (optional): DataFrame of the stages of the scrape of each game (game_id, stage, seconds, bytes, and rows) if metrics=True
+            - 'cube' (optional): stat cube of the scraped games (built game-by-game from all events) if cube=True
+            If split_shifts is False and errors, metrics, or cube is True, the dictionary includes 'pbp' and the optional keys.
     """
      
-    #Determine whether to use schedule data in repository or to scrape
-    local_failed = False
-
-    if local:
-        try:
-            load = pd.read_csv(local_path)
-            load['game_date'] = pd.to_datetime(load['game_date'])
-            
-            season_data = rs.get('https://api.nhle.com/stats/rest/en/season').json()['data']
-            season_data = [s for s in season_data if s['id'] == season][0]
-
-            season_start = f'{(str(season)[0:4] if int(start[0:2])>=9 else str(season)[4:8])}-{start[0:2]}-{start[3:5]}' if start else season_data['startDate'][0:10]
-            season_end = f'{(str(season)[0:4] if int(end[0:2])>=9 else str(season)[4:8])}-{end[0:2]}-{end[3:5]}' if end else season_data['endDate'][0:10]
-
-            #Create datetime values from dates
-            start_date = pd.to_datetime(season_start)
-            end_date = pd.to_datetime(season_end)
-
-            load = load.loc[(load['season']==season)&
-                            (load['season_type'].isin(season_types))&
-                            (load['game_date']>=start_date)&(load['game_date']<=end_date)&
-                            (load['game_schedule_state']=='OK')&
-                            (load['game_state']!='FUT')
-                            ]
-            
-            game_ids = load['game_id'].to_list()
-        except KeyError:
-            #If loading games locally fails then force a scrape
-            local_failed = True
-            print('Loading games locally has failed.  Loading schedule data with a scrape...')
-    else:
-        local_failed = True
-
-    if local_failed:
-        load = nhl_scrape_schedule(season,start,end)
-        load = load.loc[(load['season']==season)&
-                        (load['season_type'].isin(season_types))&
-                        (load['game_schedule_state']=='OK')&
-                        (load['game_state']!='FUT')
-                        ]
-        
-        game_ids = load['game_id'].to_list()
+    #Determine games to scrape
+    game_ids = season_game_ids(season,season_types,start,end,local,local_path)
 
     #If no games found, terminate the process
     if not game_ids:
-        print('No games found for dates in season...')
+        reporter.message('No games found for dates in season...',level='warning')
         return ""
     
-    print(f"Scraping games from {str(season)[0:4]}-{str(season)[4:8]} season...")
+    reporter.message(f"Scraping games from {str(season)[0:4]}-{str(season)[4:8]} season...")
     start = time.perf_counter()
 
     #Perform scrape
     if split_shifts:
-        data = nhl_scrape_game(game_ids,split_shifts=True,remove=remove,xg=xg,sources=sources,errors=errors)
+        data = nhl_scrape_game(game_ids,split_shifts=True,remove=remove,xg=xg,sources=sources,errors=errors,compact=compact,fetch_workers=fetch_workers,parse_workers=parse_workers,queue_size=queue_size,metrics=metrics,metrics_hook=metrics_hook,cube=cube)
     else:
-        data = nhl_scrape_game(game_ids,remove=remove,xg=xg,sources=sources,errors=errors)
+        data = nhl_scrape_game(game_ids,remove=remove,xg=xg,sources=sources,errors=errors,compact=compact,fetch_workers=fetch_workers,parse_workers=parse_workers,queue_size=queue_size,metrics=metrics,metrics_hook=metrics_hook,cube=cube)
     
     end = time.perf_counter()
     secs = end - start
     
-    print(f'Finished season scrape in {(secs/60)/60:.2f} hours.')
+    reporter.message(f'Finished season scrape in {(secs/60)/60:.2f} hours.')
     #Return: Complete pbp and shifts data for specified season as well as dataframe of game_ids which failed to return data
     return data
 
+def nhl_stream_games(game_ids:int | list[int], split_shifts:bool = False, remove:list[str] = [], xg:bool = False, sources:bool = False, errors:bool = False, compact:bool = False, fetch_workers:int = 4, parse_workers:int = 1, queue_size:int = 8, metrics_hook:Callable[[int, pd.DataFrame], None] | None = None, cube:bool = False) -> Iterator[tuple[int, pd.DataFrame | dict]]:
+    """
+    Given a set of game_ids (NHL API), yield complete play-by-play information for each game as soon as it is scraped.
+
+    Unlike nhl_scrape_game, games are not collected before they are returned, meaning each game may be processed (written to a file, for example) while the rest of the games are scraped.  Games are yielded in the order they finish.
+
+    Args:
+        game_ids (int or List[int]):
+            List of NHL game IDs to scrape.
+        split_shifts (bool, optional):
+            If True, yields a dict with separate 'pbp' and 'shifts' DataFrames for each game. Default is False.
+        remove (List[str], optional):
+            List of event types to remove from the result. Default is an empty list.
+        xg (bool, optional):
+            If True, calculates xG for the play-by-play data of each game (for most accurate values leave 'remove' empty).
+        sources (bool, optional):
+            If True, saves raw HTML, JSON, SHIFTS, and single-game full play-by-play to a separate folder in the working directory. Default is False.
+        errors (bool, optional):
+            If True, games which fail to scrape are yielded with the exception raised in place of data (these games are otherwise skipped). Default is False.
+        compact (bool, optional):
+            If True, yields play-by-play with compact column types (see nhl_compact_pbp). Categories are determined by game, so use nhl_compact_pbp after combining games. Default is False.
+        fetch_workers (int, optional):
+            Number of threads requesting game documents. Default is 4.
+        parse_workers (int, optional):
+            Number of processes parsing game documents. Games are parsed in the calling process if less than two (scripts using more than one worker should be guarded by `if __name__ == '__main__':`). Default is 1.
+        queue_size (int, optional):
+            Number of games with requested documents which may wait to be parsed before requests pause. Default is 8.
+        metrics_hook (Callable[[int, pd.DataFrame], None], optional):
+            Function called with the game ID and the stage metrics of each game (wall time in seconds, bytes downloaded, and rows produced by each stage) as soon as the game is scraped. Default is None.
+        cube (bool, optional):
+            If True, builds the stat cube of each game as soon as it is scraped (see nhl_build_stat_cube) and yields it with the game's play-by-play. Default is False.
+
+    Yields:
+        tuple[int, pd.DataFrame]:
+            If split_shifts is False, the game ID and a DataFrame of the game's play-by-play data.
+        tuple[int, dict[str, pd.DataFrame]]:
+            If split_shifts is True, the game ID and a dictionary with keys:
+            - 'pbp': play-by-play events
+            - 'shifts': shift change events
+            - 'merge_report': DataFrame reporting how the JSON and HTML events of the game were merged
+            - 'metrics': DataFrame of the stages of the scrape of the game (game_id, stage, seconds, bytes, and rows)
+            - 'cube' (optional): stat cube of the game if cube=True (a dictionary with 'pbp' and 'cube' is yielded if cube is True and split_shifts is False)
+        tuple[int, Exception]:
+            If errors is True, the game ID and the exception raised for games which failed to scrape.
+    """
+
+    #Wrap game_id in a list if only a single game_id is provided
+    game_ids = [game_ids] if type(game_ids) != list else game_ids
+
+    for game_id, result, secs in scrape_games(game_ids, sources, fetch_workers, parse_workers, queue_size, problems=KNOWN_PROBS):
+        if isinstance(result, Exception):
+            #Games with known problems or failed requests are reported as in nhl_scrape_game
+            if errors:
+                yield game_id, result
+            continue
+
+        df, merge_report, stage_metrics = result
+
+        if metrics_hook is not None:
+            metrics_hook(game_id, stage_metrics)
+
+        #Add xG if necessary
+        if xg:
+            df = nhl_apply_xG(df)
+
+        #Build stat cube of the game as it is ingested (from all events, before column types are compacted)
+        if cube:
+            game_cube = nhl_build_stat_cube(df)
+
+        #Compact column types if necessary (after xG is applied)
+        if compact:
+            df = nhl_compact_pbp(df)
+
+        #Yield: game play-by-play with data removed or split as necessary (and stat cube if necessary)
+        if split_shifts:
+            data = {'pbp':df.loc[~df['event_type'].isin(remove+['change'])],
+                    'shifts':df.loc[df['event_type']=='change'],
+                    'merge_report':merge_report,
+                    'metrics':stage_metrics}
+        else:
+            data = df.loc[~df['event_type'].isin(remove)]
+
+        if cube:
+            data = {**(data if split_shifts else {'pbp':data}),'cube':game_cube}
+
+        yield game_id, data
+
+def nhl_stream_season(season:int, split_shifts:bool = False, season_types:list[int] = [2,3], remove:list[str] = [], start:str | None = None, end:str | None = None, local:bool=False, local_path:str = SCHEDULE_PATH, xg:bool = False, sources:bool = False, errors:bool = False, compact:bool = False, fetch_workers:int = 4, parse_workers:int = 1, queue_size:int = 8, metrics_hook:Callable[[int, pd.DataFrame], None] | None = None, cube:bool = False) -> Iterator[tuple[int, pd.DataFrame | dict]]:
+    """
+    Given season, yield play-by-play for each game occuring within the season as soon as it is scraped (see nhl_stream_games).
+
+    Args:
+        season (int): 
+            The NHL season formatted such as "20242025".
+        split_shifts (bool, optional):
+            If True, yields a dict with separate 'pbp' and 'shifts' DataFrames for each game. Default is False.
+        season_types (List[int], optional):
+            List of season_types to include in scraping process.  Default is all regular season and playoff games which are 2 and 3 respectively.
+        remove (List[str], optional):
+            List of event types to remove from the result. Default is an empty list.
+        start (str, optional): 
+            The date string (MM-DD) to start the schedule scrape at. Default is None
+        end (str, optional): 
+            The date string (MM-DD) to end the schedule scrape at. Default is None
+        local (bool, optional):
+            If True, use local file to retreive schedule data.
+        local_path (bool, optional):
+            If True, specifies the path with schedule data necessary to scrape a season's games (only relevant if local = True).
+        xg (bool, optional):
+            If True, calculates xG for the play-by-play data of each game (for most accurate values leave 'remove' empty).
+        sources (bool, optional):
+            If True, saves raw HTML, JSON, SHIFTS, and single-game full play-by-play to a separate folder in the working directory. Default is False.
+        errors (bool, optional):
+            If True, games which fail to scrape are yielded with the exception raised in place of data (these games are otherwise skipped). Default is False.
+        compact (bool, optional):
+            If True, yields play-by-play with compact column types (see nhl_compact_pbp). Default is False.
+        fetch_workers (int, optional):
+            Number of threads requesting game documents. Default is 4.
+        parse_workers (int, optional):
+            Number of processes parsing game documents. Games are parsed in the calling process if less than two (scripts using more than one worker should be guarded by `if __name__ == '__main__':`). Default is 1.
+        queue_size (int, optional):
+            Number of games with requested documents which may wait to be parsed before requests pause. Default is 8.
+        metrics_hook (Callable[[int, pd.DataFrame], None], optional):
+            Function called with the game ID and the stage metrics of each game (wall time in seconds, bytes downloaded, and rows produced by each stage) as soon as the game is scraped. Default is None.
+        cube (bool, optional):
+            If True, builds the stat cube of each game as soon as it is scraped (see nhl_build_stat_cube) and yields it with the game's play-by-play. Default is False.
+
+    Yields:
+        tuple[int, pd.DataFrame | dict]:
+            The game ID and the game's play-by-play (see nhl_stream_games).
+    """
+
+    #Determine games to scrape
+    game_ids = season_game_ids(season,season_types,start,end,local,local_path)
+
+    #If no games found, terminate the process
+    if not game_ids:
+        reporter.message('No games found for dates in season...',level='warning')
+        return
+    
+    reporter.message(f"Scraping games from {str(season)[0:4]}-{str(season)[4:8]} season...")
+    yield from nhl_stream_games(game_ids,split_shifts=split_shifts,remove=remove,xg=xg,sources=sources,errors=errors,compact=compact,fetch_workers=fetch_workers,parse_workers=parse_workers,queue_size=queue_size,metrics_hook=metrics_hook,cube=cube)
+
+def nhl_merge_sources(path:str = 'sources', game_ids:list[int] | None = None):
+    """
+    Given the directory of sources saved when scraping with sources=True, merge the saved HTML and JSON events of every game again and report the merge of each game.
+
+    Events of all games are merged at once (games where both documents include the same events in the same order are merged by position and other games on event information), so the merge of a season or more of saved games may be checked or repeated without requesting any documents.  Games of seasons merged with ESPN data (2005-2006 to 2009-2010) are not included.
+
+    Args:
+        path (str, optional):
+            Directory of saved sources (containing a folder of HTML and JSON events for each season).  Default is 'sources'.
+        game_ids (List[int], optional):
+            List of NHL game IDs to merge.  Default is None (all saved games).
+
+    Returns:
+        dict[str, pd.DataFrame]:
+            A dictionary with keys:
+            - 'pbp': merged HTML and JSON events of each game (without game information or shifts)
+            - 'merge_report': DataFrame reporting how the JSON and HTML events of each game were merged (method and unmatched events)
+    """
+
+    start = time.perf_counter()
+    pbp, report = merge_sources(path,game_ids)
+
+    if report.empty:
+        reporter.message(f'No saved sources found in {path}...',level='warning')
+    else:
+        reporter.emit('task_finished',task='merge_sources',seconds=time.perf_counter()-start,rows=len(pbp))
+
+    #Return: merged events and merge report
+    return {'pbp':pbp, 'merge_report':report}
+
+def nhl_scrape_live(game_ids:int | list[int], callback:Callable[[int, pd.DataFrame], None] | None = None, queue:Queue | None = None, interval:int = 10, xg:bool = True, polls:int | None = None):
+    """
+    Given a set of game_ids (NHL API) for games in progress, track each game and emit new play-by-play events as they occur.
+
+    Each game is polled with conditional requests, meaning unchanged documents are not downloaded or parsed again. Only plays after the last processed event are parsed. A finished game is polled until each of its json plays is matched to the HTML report, which may trail the json at the end of a game.
+
+    Args:
+        game_ids (int or List[int]):
+            List of NHL game IDs to track.
+        callback (Callable[[int, pd.DataFrame], None], optional):
+            Function called with the game ID and a DataFrame of new events whenever new events are found. Default is None.
+        queue (queue.Queue, optional):
+            Queue which receives a tuple of the game ID and a DataFrame of new events whenever new events are found. Default is None.
+        interval (int, optional):
+            Seconds to wait between polls. Default is 10.
+        xg (bool, optional):
+            If True, calculates xG for new events. Default is True.
+        polls (int, optional):
+            Maximum number of polls to perform. Default is None (poll until all games have finished).
+
+    Returns:
+        dict[int, pd.DataFrame]:
+            A dictionary mapping each game ID to its complete play-by-play as of the final poll.
+    """
+
+    #Wrap game_id in a list if only a single game_id is provided
+    game_ids = [game_ids] if type(game_ids) != list else game_ids
+
+    reporter.message(f'Tracking live games: {game_ids}...')
+
+    trackers = {game_id:LiveGame(game_id, xg) for game_id in game_ids}
+
+    poll = 0
+    while True:
+        for game_id, tracker in trackers.items():
+            if tracker.done:
+                continue
+
+            try:
+                delta = tracker.poll()
+            except Exception as e:
+                reporter.message(f'Unable to poll game {game_id}.  Exception: {e}',level='warning')
+                continue
+
+            if not delta.empty:
+                reporter.message(f'Game {game_id}: {len(delta)} new events...')
+
+                if callback:
+                    callback(game_id, delta)
+                if queue is not None:
+                    queue.put((game_id, delta))
+
+        poll += 1
+        #Stop when all games are over or the maximum number of polls is reached
+        if all(tracker.done for tracker in trackers.values()) or (polls and poll >= polls):
+            break
+
+        time.sleep(interval)
+
+    reporter.message('Finished tracking live games.')
+
+    #Return: complete play-by-play for each game
+    return {game_id:tracker.pbp for game_id, tracker in trackers.items()}
+
 def nhl_scrape_seasons_info(seasons:list[int] = []):
     """
     Returns info related to NHL seasons (by default, all seasons are included)
@@ -482,13 +811,12 @@ def nhl_scrape_seasons_info(seasons:list[int] = []):
             A DataFrame containing the information for requested seasons.
     """
 
-    print(f'Scraping info for seasons: {seasons}')
+    reporter.message(f'Scraping info for seasons: {seasons}')
     
     #Load two different data sources: general season info and standings data related to season
-    api = "https://api.nhle.com/stats/rest/en/season"
     info = "https://api-web.nhle.com/v1/standings-season"
-    data = rs.get(api).json()['data']
-    data_2 = rs.get(info).json()['seasons']
+    data = get_seasons_data()
+    data_2 = get_json(info)['seasons']
 
     df = pd.json_normalize(data)
     df_2 = pd.json_normalize(data_2)
@@ -534,13 +862,13 @@ def nhl_scrape_standings(arg:int | list[int] | Literal['now'] = 'now', season_ty
             #Find year from season from date
             arg = [int(arg[0:4])+1 if (9 < int(arg[5:7]) < 13) else int(arg[0:4])]
 
-        print(f"Scraping playoff bracket for season{'s' if len(arg)>1 else ''}: {arg}")
+        reporter.message(f"Scraping playoff bracket for season{'s' if len(arg)>1 else ''}: {arg}")
         
         dfs = []
         for season in arg:
             api = f"https://api-web.nhle.com/v1/playoff-bracket/{season}"
 
-            data = rs.get(api).json()['series']
+            data = get_json(api)['series']
             dfs.append(pd.json_normalize(data))
 
         #Combine and standardize columns
@@ -551,15 +879,15 @@ def nhl_scrape_standings(arg:int | list[int] | Literal['now'] = 'now', season_ty
 
     else:
         if arg == "now":
-            print("Scraping standings as of now...")
+            reporter.message("Scraping standings as of now...")
             arg = [arg]
         elif arg in nhl_scrape_seasons():
-            print(f'Scraping standings for season: {arg}')
+            reporter.message(f'Scraping standings for season: {arg}')
             arg = [arg]
         elif type(arg) == list:
-            print(f'Scraping standings for seasons: {arg}')
+            reporter.message(f'Scraping standings for seasons: {arg}')
         else:
-            print(f"Scraping standings for date: {arg}")
+            reporter.message(f"Scraping standings for date: {arg}")
             arg = [arg]
 
         dfs = []
@@ -567,8 +895,7 @@ def nhl_scrape_standings(arg:int | list[int] | Literal['now'] = 'now', season_ty
             #If the end is an int then its a season otherwise it is either 'now' or a date as a string
             if type(search) == int:
                 #Check if the season date is during the requested season - if so then use this date to find the current standings for the requested season
-                season_data = rs.get('https://api.nhle.com/stats/rest/en/season').json()['data']
-                season_data = [s for s in season_data if s['id'] == search][0]
+                season_data = get_season_data(search)
                 
                 season_start = season_data['startDate']
                 season_end = season_data['regularSeasonEndDate']
@@ -584,7 +911,7 @@ def nhl_scrape_standings(arg:int | list[int] | Literal['now'] = 'now', season_ty
                 
             api = f"https://api-web.nhle.com/v1/standings/{end}"
 
-            data = rs.get(api).json()['standings']
+            data = get_json(api)['standings']
             dfs.append(pd.json_normalize(data))
 
         #Standardize columns
@@ -595,7 +922,16 @@ def nhl_scrape_standings(arg:int | list[int] | Literal['now'] = 'now', season_ty
         #Return: standings data
         return df[[col for col in COL_MAP['standings'].values() if col in df.columns]]
 
-def nhl_scrape_roster(season: int, teams: str | list[str] | None = None):
+def split_entities(docs, name):
+    #Given documents returned by fetch_entities, return documents which were retrieved (or do not exist) and the keys of entities with requests that failed after all retries
+    transient = [key for key, data in docs.items() if is_transient(data)]
+    if transient:
+        reporter.message(f'Requests for {len(transient)} {name} failed after all retries: {transient}',level='warning')
+
+    #Return: retrieved documents and keys of failed entities
+    return {key:data for key, data in docs.items() if key not in transient}, transient
+
+def nhl_scrape_roster(season: int, teams: str | list[str] | None = None, workers:int = 8, cache:bool = True, ttl:int | None = None, errors:bool = False):
     """
     Returns rosters for a selection teams in a given season.
 
@@ -606,12 +942,25 @@ def nhl_scrape_roster(season: int, teams: str | list[str] | None = None):
         teams (str or list[str], optional):
             List of teams(three letter abbreviation) to scrape.
 
+        workers (int, optional):
+            Number of rosters to request concurrently.  Default is 8.
+        cache (bool, optional):
+            If True, rosters are read from and written to the persistent cache (set the WSBA_CACHE_DIR environment variable to change its location).  Default is True.
+        ttl (int, optional):
+            Seconds rosters remain valid in the persistent cache.  Default is None (one day).
+        errors (bool, optional):
+            If True, returns a dict including a list of the (team, season) pairs with requests that failed after all retries.  Default is False.
+
     Returns:
         pd.DataFrame: 
             A DataFrame containing the rosters for all teams in the specified season.
+        dict[str, pd.DataFrame | list]:
+            If errors is True, returns a dictionary with keys:
+            - 'data': rosters
+            - 'transient': list of (team, season) pairs with requests that failed after all retries (these are not included in 'data' and may be scraped again later)
     """
 
-    print(f'Scrpaing rosters for the {season} season...')
+    reporter.message(f'Scrpaing rosters for the {season} season...')
     teaminfo = pd.read_csv(INFO_PATH)
 
     if isinstance(teams, str):
@@ -619,13 +968,14 @@ def nhl_scrape_roster(season: int, teams: str | list[str] | None = None):
     elif not teams:
         teams = teaminfo['team_abbr'].drop_duplicates()
 
+    #Request rosters concurrently (teams are only requested once)
+    docs, transient = split_entities(fetch_entities('roster',[(team, season) for team in teams],workers,cache,ttl),'rosters')
+
     rosts = []
-    for team in teams:
+    for (team, season), data in docs.items():
         try:
-            print(f'Scraping {team} roster...')
-            api = f'https://api-web.nhle.com/v1/roster/{team}/{season}'
+            reporter.message(f'Scraping {team} roster...')
             
-            data = rs.get(api).json()
             forwards = pd.json_normalize(data['forwards'])
             forwards['heading_position'] = "F"
             dmen = pd.json_normalize(data['defensemen'])
@@ -640,17 +990,18 @@ def nhl_scrape_roster(season: int, teams: str | list[str] | None = None):
 
             rosts.append(roster)
         except:
-            print(f'No roster found for {team}...')
+            reporter.message(f'No roster found for {team}...')
             rosts.append(pd.DataFrame())
 
     #Combine rosters
-    df = pd.concat(rosts)
+    df = pd.concat(rosts) if rosts else pd.DataFrame()
 
     #Standardize columns
     df = df.rename(columns=COL_MAP['roster'])
+    df = df[[col for col in COL_MAP['roster'].values() if col in df.columns]]
 
     #Return: roster data for provided season
-    return df[[col for col in COL_MAP['roster'].values() if col in df.columns]]
+    return {'data':df,'transient':transient} if errors else df
 
 def nhl_scrape_prospects(team:str):
     """
@@ -667,9 +1018,9 @@ def nhl_scrape_prospects(team:str):
 
     api = f'https://api-web.nhle.com/v1/prospects/{team}'
 
-    data = rs.get(api).json()
+    data = get_json(api)
 
-    print(f'Scraping {team} prospects...')
+    reporter.message(f'Scraping {team} prospects...')
 
     #Iterate through positions
     players = [pd.json_normalize(data[pos]) for pos in ['forwards','defensemen','goalies']]
@@ -697,10 +1048,10 @@ def nhl_scrape_team_info(country:bool = False):
             A DataFrame containing team or country information from the NHL API.
     """
 
-    print(f'Scraping {'country' if country else 'team'} information...')
+    reporter.message(f'Scraping {'country' if country else 'team'} information...')
     api = f'https://api.nhle.com/stats/rest/en/{'country' if country else 'team'}'
     
-    data =  pd.json_normalize(rs.get(api).json()['data'])
+    data =  pd.json_normalize(get_json(api)['data'])
 
     #Add logos if necessary
     if not country:
@@ -713,30 +1064,46 @@ def nhl_scrape_team_info(country:bool = False):
     #Return: team or country info 
     return data[[col for col in COL_MAP['team_info'].values() if col in data.columns]].sort_values(by=(['country_abbr','country_name'] if country else ['team_abbr','team_name']))
 
-def nhl_scrape_player_info(player_ids:list[int]):
+def nhl_scrape_player_info(player_ids:list[int], workers:int = 8, cache:bool = True, ttl:int | None = None, errors:bool = False):
     """
     Returns player data for specified players.
 
     Args:
         player_ids (list[int]):
             List of NHL API player IDs to retrieve information for.
+        workers (int, optional):
+            Number of players to request concurrently.  Default is 8.
+        cache (bool, optional):
+            If True, players are read from and written to the persistent cache (set the WSBA_CACHE_DIR environment variable to change its location).  Default is True.
+        ttl (int, optional):
+            Seconds players remain valid in the persistent cache.  Default is None (one day).
+        errors (bool, optional):
+            If True, returns a dict including a list of the player IDs with requests that failed after all retries.  Default is False.
 
     Returns:
         pd.DataFrame: 
             A DataFrame containing player data for specified players.
+        dict[str, pd.DataFrame | list]:
+            If errors is True, returns a dictionary with keys:
+            - 'data': player data
+            - 'transient': list of player IDs with requests that failed after all retries (these are not included in 'data' and may be scraped again later)
     """
 
-    print(f'Retreiving player information for {player_ids}...')
+    reporter.message(f'Retreiving player information for {player_ids}...')
 
     #Wrap game_id in a list if only a single game_id is provided
     player_ids = [player_ids] if type(player_ids) != list else player_ids
 
+    #Request players concurrently (repeated players are only requested once)
+    docs, transient = split_entities(fetch_entities('player_info',[int(player_id) for player_id in player_ids],workers,cache,ttl),'players')
+
     infos = []
-    for player_id in player_ids:
-        player_id = int(player_id)
-        api = f'https://api-web.nhle.com/v1/player/{player_id}/landing'
+    for player_id, json in docs.items():
+        if json is None:
+            reporter.message(f'No player information found for {player_id}...')
+            continue
 
-        data = pd.json_normalize(rs.get(api).json())
+        data = pd.json_normalize(json)
         #Add name column
         data['player_name'] = (data['firstName.default'] + " " + data['lastName.default']).str.upper()
 
@@ -748,11 +1115,12 @@ def nhl_scrape_player_info(player_ids:list[int]):
         
         #Standardize columns
         df = df.rename(columns=COL_MAP['player_info'])
-
-        #Return: player data
-        return df[[col for col in COL_MAP['player_info'].values() if col in df.columns]]
+        df = df[[col for col in COL_MAP['player_info'].values() if col in df.columns]]
     else:
-        return pd.DataFrame()
+        df = pd.DataFrame()
+
+    #Return: player data
+    return {'data':df,'transient':transient} if errors else df
 
 def nhl_scrape_draft_rankings(arg:str | Literal['now'] = 'now', category:int = 0):
     """
@@ -775,11 +1143,11 @@ def nhl_scrape_draft_rankings(arg:str | Literal['now'] = 'now', category:int = 0
             A DataFrame containing draft rankings.
     """
 
-    print(f'Scraping draft rankings for {arg}...\nCategory: {DRAFT_CAT[category]}...')
+    reporter.message(f'Scraping draft rankings for {arg}...\nCategory: {DRAFT_CAT[category]}...')
 
     #Player category only applies when requesting a specific season
     api = f"https://api-web.nhle.com/v1/draft/rankings/{arg}/{category}" if category > 0 else f"https://api-web.nhle.com/v1/draft/rankings/{arg}"
-    data = pd.json_normalize(rs.get(api).json()['rankings'])
+    data = pd.json_normalize(get_json(api)['rankings'])
 
     #Add player name columns
     data['player_name'] = (data['firstName']+" "+data['lastName']).str.upper()
@@ -796,41 +1164,59 @@ def nhl_scrape_draft_rankings(arg:str | Literal['now'] = 'now', category:int = 0
     #Return: prospect rankings
     return data[[col for col in COL_MAP['draft_rankings'].values() if col in data.columns]]
 
-def nhl_scrape_game_info(game_ids:list[int]):
+def nhl_scrape_game_info(game_ids:list[int], workers:int = 8, cache:bool = True, ttl:int | None = None, errors:bool = False):
     """
     Given a set of game_ids (NHL API), return information for each game.
 
     Args:
         game_ids (List[int] or ['random', int, int, int]):
             List of NHL game IDs to scrape or use ['random', n, start_year, end_year] to fetch n random games.
-    
+        workers (int, optional):
+            Number of games to request concurrently.  Default is 8.
+        cache (bool, optional):
+            If True, games are read from and written to the persistent cache (set the WSBA_CACHE_DIR environment variable to change its location).  Default is True.
+        ttl (int, optional):
+            Seconds games remain valid in the persistent cache.  Default is None (one hour; games are only cached once they are final).
+        errors (bool, optional):
+            If True, returns a dict including a list of the game IDs with requests that failed after all retries.  Default is False.
+
     Returns:
         pd.DataFrame:
             An DataFrame containing information for each game.    
+        dict[str, pd.DataFrame | list]:
+            If errors is True, returns a dictionary with keys:
+            - 'data': game information
+            - 'transient': list of game IDs with requests that failed after all retries (these are not included in 'data' and may be scraped again later)
     """
 
     #Wrap game_id in a list if only a single game_id is provided
     game_ids = [game_ids] if type(game_ids) != list else game_ids
 
-    print(f'Finding game information for games: {game_ids}')
+    reporter.message(f'Finding game information for games: {game_ids}')
 
-    link = 'https://api-web.nhle.com/v1/gamecenter'
+    #Scrape information (games are requested concurrently)
+    docs, transient = split_entities(fetch_entities('game_info',game_ids,workers,cache,ttl),'games')
+    games = [pd.json_normalize(data) for data in docs.values() if data is not None]
 
-    #Scrape information
-    df = pd.concat([pd.json_normalize(rs.get(f'{link}/{game_id}/landing').json()) for game_id in game_ids])
+    if games:
+        df = pd.concat(games)
 
-    #Add extra info
-    df['game_date'] = df['gameDate']
-    df['game_title'] = df['awayTeam.abbrev'] + " @ " + df['homeTeam.abbrev'] + " - " + df['game_date']
-    df['start_time_est'] = pd.to_datetime(df['startTimeUTC']).dt.tz_convert('US/Eastern').dt.strftime("%I:%M %p")
+        #Add extra info
+        df['game_date'] = df['gameDate']
+        df['game_title'] = df['awayTeam.abbrev'] + " @ " + df['homeTeam.abbrev'] + " - " + df['game_date']
+        df['start_time_est'] = pd.to_datetime(df['startTimeUTC']).dt.tz_convert('US/Eastern').dt.strftime("%I:%M %p")
 
-    #Standardize columns
-    df = df.rename(columns=COL_MAP['schedule'])
+        #Standardize columns
+        df = df.rename(columns=COL_MAP['schedule'])
+        df = df[[col for col in COL_MAP['schedule'].values() if col in df.columns]]
+    else:
+        reporter.message('No game information found...',level='warning')
+        df = pd.DataFrame()
 
     #Return: game information
-    return df[[col for col in COL_MAP['schedule'].values() if col in df.columns]]
+    return {'data':df,'transient':transient} if errors else df
 
-def nhl_scrape_edge(season: int, type: Literal['skater','goalie','team'], scrape: list[int | str], season_type:int = 2):
+def nhl_scrape_edge(season: int, type: Literal['skater','goalie','team'], scrape: list[int | str], season_type:int = 2, workers:int = 8, cache:bool = True, ttl:int | None = None, errors:bool = False):
     """
     Returns NHL Edge stats and data for a selection of skaters, goalies, or teams in a given season.
 
@@ -843,14 +1229,26 @@ def nhl_scrape_edge(season: int, type: Literal['skater','goalie','team'], scrape
             List of skaters, goalies, or teams to scrape (player_ids for skaters/goalies and three letter abbreviation (i.e. 'BOS') for teams.)
         season_types (int or List[int], optional):
             List of season_types to include in scraping process.  Default is all regular season games which is the int '2'.
+        workers (int, optional):
+            Number of entries to request concurrently.  Default is 8.
+        cache (bool, optional):
+            If True, entries are read from and written to the persistent cache (set the WSBA_CACHE_DIR environment variable to change its location).  Default is True.
+        ttl (int, optional):
+            Seconds entries remain valid in the persistent cache.  Default is None (one day).
+        errors (bool, optional):
+            If True, returns a dict including a list of the (type, entry, season, season_type) keys with requests that failed after all retries.  Default is False.
 
     Returns:
         pd.DataFrame:
             A DataFrame containing NHL EDGE metrics for the requested
             skaters, goalies, and/or teams for the specified season.
+        dict[str, pd.DataFrame | list]:
+            If errors is True, returns a dictionary with keys:
+            - 'data': NHL EDGE data
+            - 'transient': list of (type, entry, season, season_type) keys with requests that failed after all retries (these are not included in 'data' and may be scraped again later)
     """
     
-    print(f'Scrpaing edge data for the {season} season...')
+    reporter.message(f'Scrpaing edge data for the {season} season...')
 
     #NHL edge endpoint for teams uses their team ID rather than their three-letter abbreviation
     if type == 'team':
@@ -861,13 +1259,14 @@ def nhl_scrape_edge(season: int, type: Literal['skater','goalie','team'], scrape
     else:
         entries = scrape
 
+    #Request entries concurrently (repeated entries are only requested once)
+    docs, transient = split_entities(fetch_entities('edge',[(type, entry, season, season_type) for entry in entries],workers,cache,ttl),'NHL Edge entries')
+
     dfs = []
-    for entry in entries:
+    for (type, entry, season, season_type), data in docs.items():
         try:
-            print(f'Scraping NHL Edge data for {type} {entry}...')
-            api = f'https://api-web.nhle.com/v1/edge/{type}-detail/{entry}/{season}/{season_type}'
+            reporter.message(f'Scraping NHL Edge data for {type} {entry}...')
             
-            data = rs.get(api).json()
             edge = pd.json_normalize(data)
 
             edge['season'] = season
@@ -877,21 +1276,23 @@ def nhl_scrape_edge(season: int, type: Literal['skater','goalie','team'], scrape
 
             dfs.append(edge)
         except:
-            print(f'No NHL Edge data found for {type} {entry}...')
+            reporter.message(f'No NHL Edge data found for {type} {entry}...')
             dfs.append(pd.DataFrame())
 
     #Combine edge data
-    df = pd.concat(dfs)
+    df = pd.concat(dfs) if dfs else pd.DataFrame()
 
     #Standardize columns
     df = df.rename(columns=COL_MAP['edge'])
 
     #Add additional columns
-    df['season_type'] = season_type
-    df['wsba_id'] = df['team_abbr']+df['season'].astype(str) if type == 'team' else df['player_id'].astype(str)+df['season'].astype(str)+df['team_abbr']
+    if not df.empty:
+        df['season_type'] = season_type
+        df['wsba_id'] = df['team_abbr']+df['season'].astype(str) if type == 'team' else df['player_id'].astype(str)+df['season'].astype(str)+df['team_abbr']
+    df = df[[col for col in COL_MAP['edge'].values() if col in df.columns]]
 
     #Return: dataframe including NHL Edge data for the specified type and the entries included
-    return df[[col for col in COL_MAP['edge'].values() if col in df.columns]]
+    return {'data':df,'transient':transient} if errors else df
 
 def nhl_scrape_seasons(analytic: bool = False):
     """
@@ -906,7 +1307,7 @@ def nhl_scrape_seasons(analytic: bool = False):
             A DataFrame containing a list of all NHL seasons.
     """
 
-    data = rs.get('https://api-web.nhle.com/v1/season').json()
+    data = get_json('https://api-web.nhle.com/v1/season')
 
     if analytic:
         data = [season for season in data if season > 20062007]
@@ -924,14 +1325,54 @@ def nhl_apply_xG(pbp: pd.DataFrame):
             A DataFrame containing input play-by-play data with xG column.
     """
 
-    print(f'Applying WSBA xG to model with seasons: {pbp['season'].drop_duplicates().to_list()}')
+    reporter.message(f'Applying WSBA xG to model with seasons: {pbp['season'].drop_duplicates().to_list()}')
 
     #Apply xG model
     pbp = wsba_xG(pbp)
     
     return pbp
 
-def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team','game_score'], game_strength:Union[Literal['all'], str, list[str]] = 'all', season_types:int | list[int] = 2, split_game:bool = False, roster_path:str = DEFAULT_ROSTER, shot_impact:bool = False, simple_col:bool = False):
+def nhl_compact_pbp(pbp: pd.DataFrame):
+    """
+    Given play-by-play data, return this data with compact column types.
+
+    Team abbreviations, player names, and other low-cardinality text columns are stored as categoricals (team and player name columns share categories so they may be compared with each other), IDs as nullable Int32, and coordinates as float32.  Statistics calculated from compact play-by-play are identical to those calculated from standard play-by-play.
+
+    Args:
+        pbp (pd.DataFrame):
+            A DataFrame containing play-by-play data generated within the WBSA Hockey package.
+    Returns:
+        pd.DataFrame: 
+            A DataFrame containing input play-by-play data with compact column types.
+    """
+
+    #Return: compacted play-by-play
+    return compact_pbp(pbp)
+
+def nhl_calculate_adjustments(pbp: pd.DataFrame):
+    """
+    Given reference play-by-play data, return score and venue adjustment weights for corsi, fenwick, and xG.
+
+    Each event is weighted by the inverse of the share of events taken by teams at the same venue and score state (capped at three goals) in the reference data, such that every venue and score state is neutral once weighted.  Weights may be calculated from any span of reference data (such as a full season at 5v5) and provided to nhl_calculate_stats.
+
+    Args:
+        pbp (pd.DataFrame):
+            A DataFrame containing play-by-play data generated within the WBSA Hockey package.
+    Returns:
+        pd.DataFrame: 
+            A DataFrame containing corsi, fenwick, and xG weights for each venue and score state.
+    """
+
+    #Check if xG column exists and apply model if it does not
+    try:
+        pbp['xG']
+    except KeyError: 
+        pbp = wsba_xG(pbp)
+
+    #Return: adjustment weights (shootouts removed)
+    return calc_adjustments(pbp.loc[pbp['period_type']!='SO'])
+
+def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team','game_score'], game_strength:Union[Literal['all'], str, list[str]] = 'all', season_types:int | list[int] = 2, split_game:bool = False, roster_path:str = DEFAULT_ROSTER, shot_impact:bool = False, simple_col:bool = False, adjust:bool | pd.DataFrame = False):
     """
     Given play-by-play data, seasonal information, game strength, rosters, and an xG model,
     return aggregated statistics at the skater, goalie, or team level.
@@ -955,6 +1396,8 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
             If True, applies shot impact metrics to the stats DataFrame.  Default is False.
         simple_col (bool, optional):
             If True, retains the column names (abbreviated and non-standard) used when developing the package.  Default is False.
+        adjust (bool or pd.DataFrame, optional):
+            If True, corsi, fenwick, and xG for skaters, goalies, and teams are adjusted for score and venue with weights calculated from the provided play-by-play.  Weights from nhl_calculate_adjustments (calculated with other reference data) may be provided instead.  Value is ignored when type == 'game_score'.  Default is False.
             
     Returns:
         pd.DataFrame:
@@ -962,7 +1405,7 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
     """
         
 
-    print(f'''Calculating statistics for {'regular season' if season_types == 2 else
+    reporter.message(f'''Calculating statistics for {'regular season' if season_types == 2 else
                                             'playoff' if season_types == 3 else
                                             'regular season and playoff' if season_types == [2,3] else
                                             'unknown selection of'} games in the provided play-by-play data at {game_strength} for {type}s...\nSeasons included: {pbp['season'].drop_duplicates().to_list()}...'''
@@ -973,7 +1416,7 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
     try:
         pbp['xG']
     except KeyError: 
-        print('Applying xG model...')
+        reporter.message('Applying xG model...')
         pbp = wsba_xG(pbp)
 
     #If single values provided for columns typically in a list then place them into a list
@@ -982,8 +1425,8 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
     if isinstance(game_strength, str) and game_strength != 'all':
         game_strength = [game_strength]
 
-    #Apply season_type filter and remove shootouts
-    pbp = pbp.loc[(pbp['season_type'].isin(season_types))&(pbp['period_type']!='SO')]
+    #Apply season_type filter and remove shootouts (stats are calculated on a projection of the required columns, leaving the provided play-by-play unchanged)
+    pbp = project_columns(pbp,stats_cols,(pbp['season_type'].isin(season_types))&(pbp['period_type']!='SO'))
 
     #Convert all columns with player ids to float in order to avoid merging errors
     id_cols = [col for col in pbp.columns if '_id' in col]
@@ -995,72 +1438,95 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
     else:
         second_group = ['season']
 
+    #Calculate score and venue adjustment weights if necessary
+    if isinstance(adjust, pd.DataFrame):
+        weights = adjust
+    elif adjust:
+        weights = calc_adjustments(pbp)
+    else:
+        weights = None
+
     #Split calculation
     if type == 'game_score':
-        #Create game score features for all positions
-        skater = calc_game_score_features(pbp,'skater')
-        goalie = calc_game_score_features(pbp,'goalie')
-
-        #Generate game score with corresponding model
-        dfs = []
-        for label, df in [('skater',skater),('goalie',goalie)]:
-            with open(os.path.join(GAME_SCORE,f'wsba_gs_{label}.json')) as f:
-                model_data = json.load(f)
-
-            #Extract model data
-            coefficients = np.array(model_data["coefficients"])
-            scaler_mean = np.array(model_data["scaler_mean"])
-            scaler_scale = np.array(model_data["scaler_scale"])
+        complete = game_score_stats(pbp)
+    elif type == 'goalie':
+        complete = format_stats(calc_goalie(pbp,game_strength,second_group,weights), type)
+    elif type == 'team':
+        complete = format_stats(calc_team(pbp,game_strength,second_group,weights), type)
+    else:
+        complete = calc_skater(calc_indv(pbp,game_strength,second_group),calc_onice(pbp,game_strength,second_group,weights),second_group)
 
-            #Prepare features
-            features = df[GS_SCORE_FEATURES[label]]
+    complete = finish_stats(complete, type, game_strength, season_types, roster_path, shot_impact)
+    
+    end = time.perf_counter()
+    length = end-start
+    reporter.message(f'...finished in {(length if length <60 else length/60):.2f} {'seconds' if length <60 else 'minutes'}.')
+    reporter.emit('task_finished',task=f'calculate_stats_{type}',seconds=length,rows=len(complete))
 
-            #Scale features
-            features_scaled = (features - scaler_mean) / scaler_scale
+    return complete if simple_col else complete.rename(columns=COL_MAP['stats'], errors='ignore')
 
-            #Display impact value of each variable
-            for col, coef in zip(features.columns, coefficients):
-                if col in df:
-                    df[f'{col} Score'] = features_scaled[col]*coef
+@lru_cache(maxsize=None)
+def load_game_score_model(label:str):
+    #Given type of game score model ('skater' or 'goalie'), return its coefficients and scaling (the model file is only read once)
+    with open(os.path.join(GAME_SCORE,f'wsba_gs_{label}.json')) as f:
+        model_data = json.load(f)
 
-            #Calculate game score
-            df["GS"] = df[[f'{col} Score' for col in GS_SCORE_FEATURES[label]]].sum(axis=1)
+    return {key: np.array(model_data[key]) for key in ['coefficients','scaler_mean','scaler_scale']}
 
-            dfs.append(df)
-        
-        #Combine game_score
-        complete = pd.concat(dfs)
+def game_score_stats(pbp:pd.DataFrame):
+    #Given play-by-play (with shootouts removed and xG applied), return game score of each skater and goalie in each game (see nhl_calculate_stats)
+    #Create game score features for all positions (in one pass of the play-by-play)
+    features = game_score_features(pbp)
 
-        #Remove entries with no ID listed
-        complete = complete.loc[complete['ID'].notna()]
+    #Generate game score with corresponding model
+    dfs = []
+    for label, df in features.items():
+        model = load_game_score_model(label)
 
-        #Calculate game score composites
-        for strength in ['EV','PP','SH']:
-            complete[f'{strength} Score'] = complete[[col for col in complete.columns if f'{strength}_' in col and 'Score' in col and 'xGC%' not in col]].sum(axis=1)
-        complete['Production Score'] = complete['P Score']
-        complete['Play-Driving Score'] = complete[[col for col in complete.columns if f'_xGC%' in col and 'Score' in col]].sum(axis=1)
-        complete['Offensive Score'] = complete['Production Score']+complete['Play-Driving Score']+complete[[col for col in complete.columns if f'_xGF' in col and 'Score' in col]].sum(axis=1)
-        complete['Defensive Score'] = complete[[col for col in complete.columns if f'_xGA' in col and 'Score' in col]].sum(axis=1)
-        complete['Penalties Score'] = complete['PENL% Score'] 
-        complete['Puck Management Score'] = complete['PM% Score']
-        complete['Faceoffs Score'] = complete['F% Score']
-        complete['Misc Score'] = complete['PENL% Score']+complete['PM% Score']+complete['F% Score']
-        complete['Workload Score'] = complete['xGF% Score']
-        complete['Goaltending Score'] = complete['GA/xGA Score']
-
-        complete = complete[[
-            "ID","Season","Team","Game",
-            ]+GS_SCORE_FEATURES['skater']+GS_SCORE_FEATURES['goalie']+
-            [f'{col} Score' for col in GS_SCORE_FEATURES['skater']]+[f'{col} Score' for col in GS_SCORE_FEATURES['goalie']]+
-            ['EV Score','PP Score','SH Score','Production Score','Play-Driving Score',
-             'Offensive Score','Defensive Score','Workload Score','Goaltending Score',
-             'Penalties Score','Puck Management Score','Faceoffs Score',
-             'Misc Score','GS']
-        ]
+        #Scale features
+        features_scaled = (df[GS_SCORE_FEATURES[label]].to_numpy(dtype=float) - model['scaler_mean']) / model['scaler_scale']
 
-    elif type == 'goalie':
-        complete = calc_goalie(pbp,game_strength,second_group)
+        #Display impact value of each variable and calculate game score (the sum of all impacts)
+        df[[f'{col} Score' for col in GS_SCORE_FEATURES[label]]] = features_scaled*model['coefficients']
+        df["GS"] = features_scaled @ model['coefficients']
 
+        dfs.append(df)
+    
+    #Combine game_score
+    complete = pd.concat(dfs)
+
+    #Remove entries with no ID listed
+    complete = complete.loc[complete['ID'].notna()]
+
+    #Calculate game score composites
+    for strength in ['EV','PP','SH']:
+        complete[f'{strength} Score'] = complete[[col for col in complete.columns if f'{strength}_' in col and 'Score' in col and 'xGC%' not in col]].sum(axis=1)
+    complete['Production Score'] = complete['P Score']
+    complete['Play-Driving Score'] = complete[[col for col in complete.columns if f'_xGC%' in col and 'Score' in col]].sum(axis=1)
+    complete['Offensive Score'] = complete['Production Score']+complete['Play-Driving Score']+complete[[col for col in complete.columns if f'_xGF' in col and 'Score' in col]].sum(axis=1)
+    complete['Defensive Score'] = complete[[col for col in complete.columns if f'_xGA' in col and 'Score' in col]].sum(axis=1)
+    complete['Penalties Score'] = complete['PENL% Score'] 
+    complete['Puck Management Score'] = complete['PM% Score']
+    complete['Faceoffs Score'] = complete['F% Score']
+    complete['Misc Score'] = complete['PENL% Score']+complete['PM% Score']+complete['F% Score']
+    complete['Workload Score'] = complete['xGF% Score']
+    complete['Goaltending Score'] = complete['GA/xGA Score']
+
+    complete = complete[[
+        "ID","Season","Team","Game",
+        ]+GS_SCORE_FEATURES['skater']+GS_SCORE_FEATURES['goalie']+
+        [f'{col} Score' for col in GS_SCORE_FEATURES['skater']]+[f'{col} Score' for col in GS_SCORE_FEATURES['goalie']]+
+        ['EV Score','PP Score','SH Score','Production Score','Play-Driving Score',
+         'Offensive Score','Defensive Score','Workload Score','Goaltending Score',
+         'Penalties Score','Puck Management Score','Faceoffs Score',
+         'Misc Score','GS']
+    ]
+
+    return complete
+
+def format_stats(complete:pd.DataFrame, type:str):
+    #Given aggregated goalie or team stats, return stats with rates per sixty minutes and shares (see nhl_calculate_stats)
+    if type == 'goalie':
         #Set TOI to minute
         complete['TOI'] = complete['TOI']/60
         complete = complete.loc[complete['TOI']>0]
@@ -1089,10 +1555,7 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
             'GSAx',
             'RushF','RushA','RushFxG','RushAxG','RushFG','RushAG'
         ]+[f'{stat}/60' for stat in ['FF','FA','xGF','xGA','GF','GA','SF','SA','CF','CA','GSAx']]]
-    
-    elif type == 'team':
-        complete = calc_team(pbp,game_strength,second_group)
-
+    else:
         #WSBA
         complete['WSBA'] = complete['Team']+complete['Season'].astype(str)
 
@@ -1128,67 +1591,12 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
             'RushF','RushA','RushFxG','RushAxG','RushFG','RushAG',
             'GSAx'
         ]+[f'{stat}/60' for stat in PER_SIXTY[11:len(PER_SIXTY)]]]
-        #Apply shot impacts if necessary
-
-    else:
-        indv_stats = calc_indv(pbp,game_strength,second_group)
-        onice_stats = calc_onice(pbp,game_strength,second_group)
-
-        #IDs sometimes set as objects
-        indv_stats['ID'] = indv_stats['ID'].astype(float)
-        onice_stats['ID'] = onice_stats['ID'].astype(float)
-
-        #Merge and add columns for extra stats
-        complete = pd.merge(indv_stats,onice_stats,how="outer",on=['ID','Team','Season']+(['Game'] if 'game_id' in second_group else []))
-        complete['GC%'] = complete['Gi']/complete['GF']
-        complete['AC%'] = (complete['A1']+complete['A2'])/complete['GF']
-        complete['GI%'] = (complete['Gi']+complete['A1']+complete['A2'])/complete['GF']
-        complete['FC%'] = complete['Fi']/complete['FF']
-        complete['xGC%'] = complete['xGi']/complete['xGF']
-        complete['GF%'] = complete['GF']/(complete['GF']+complete['GA'])
-        complete['SF%'] = complete['SF']/(complete['SF']+complete['SA'])
-        complete['xGF%'] = complete['xGF']/(complete['xGF']+complete['xGA'])
-        complete['FF%'] = complete['FF']/(complete['FF']+complete['FA'])
-        complete['CF%'] = complete['CF']/(complete['CF']+complete['CA'])
-
-        #Set TOI to minute and remove players with no TOI
-        complete['TOI'] = complete['TOI']/60
-        complete = complete.loc[complete['TOI']>0]
-
-        #Add per 60 stats
-        for stat in PER_SIXTY:
-            complete[f'{stat}/60'] = (complete[stat]/complete['TOI'])*60
 
-        #Shot Type Metrics
-        type_metrics = []
-        for shot_type in shot_types:
-            for stat in PER_SIXTY[:3]:
-                type_metrics.append(f'{shot_type.capitalize()}{stat}')
-
-        #Remove entries with no ID listed
-        complete = complete.loc[complete['ID'].notna()]
+    return complete
 
-        head = ['ID','Game'] if 'Game' in complete.columns else ['ID']
-        complete = complete[head+[
-            "Season","Team",
-            'GP','TOI',
-            "Gi","A1","A2",'P1','P','Si','Shi%',
-            'Give','Take','PM%','HF','HA','HF%',
-            "Fi","xGi",'xGi/Fi',"Gi/xGi","Fshi%",
-            "GF","SF","FF","xGF","xGF/FF","GF/xGF","ShF%","FshF%",
-            "GA","SA","FA","xGA","xGA/FA","GA/xGA","ShA%","FshA%",
-            'Ci','CF','CA','CF%',
-            'FF%','xGF%','GF%',"SF%",
-            'Rush',"Rush xG",'Rush G',"GC%","AC%","GI%","FC%","xGC%",
-            'F','FW','FL','F%',
-            'Penl','Penl2','Penl5',
-            'Draw','PIM','PENL%',
-            'Block',
-            'OZF','NZF','DZF',
-            'OZF%','NZF%','DZF%',
-            'GSAx'
-        ]+[f'{stat}/60' for stat in PER_SIXTY]+type_metrics]
-        
+def finish_stats(complete:pd.DataFrame, type:str, game_strength:Union[Literal['all'], list[str]], season_types:list[int], roster_path:str, shot_impact:bool):
+    #Given aggregated stats, return stats with roster information, shot impacts (if requested), and strength and span columns (see nhl_calculate_stats)
+    
     #Apply roster information to stats
     sort_info = STATS_SORT[type]
     complete = apply_rosters(complete, type, roster_path).fillna(0).sort_values(by=sort_info['by'], ascending=sort_info['ascending'])
@@ -1200,20 +1608,302 @@ def nhl_calculate_stats(pbp:pd.DataFrame, type:Literal['skater','goalie','team',
     #Add strength and season type columns to the end of the df
     complete['Strength'] = game_strength if isinstance(game_strength, str) else ', '.join(game_strength)
     complete['Span'] = 'all' if season_types == [2,3] else season_types if isinstance(season_types, int) else ', '.join([str(s) for s in season_types])
-    
+
+    return complete
+
+def nhl_build_stat_cube(pbp:pd.DataFrame):
+    """
+    Given play-by-play data, return a stat cube of additive skater counts by player, team, game, and strength state.
+
+    The stat cube is built once (it may be built game-by-game and combined with pd.concat) and queried with nhl_calculate_cube_stats, which sums the counts rather than recalculating stats from play-by-play.  Stat cubes may also be built as games are ingested with the cube option of nhl_scrape_game, nhl_scrape_season, nhl_stream_games, nhl_stream_season, and NHL_Database.add_games.
+
+    Args:
+        pbp (pd.DataFrame):
+            A DataFrame containing play-by-play event data.
+
+    Returns:
+        pd.DataFrame:
+            A DataFrame with a row for each player, team, game, strength state, and event team relation (events by the opposing team are stored separately) containing individual and on-ice counts.
+    """
+
+    #Check if xG column exists and apply model if it does not
+    try:
+        pbp['xG']
+    except KeyError: 
+        reporter.message('Applying xG model...')
+        pbp = wsba_xG(pbp)
+
+    #Remove shootouts (the cube is built from a projection of the required columns, leaving the provided play-by-play unchanged)
+    pbp = project_columns(pbp,stats_cols,pbp['period_type']!='SO')
+
+    #Convert all columns with player ids to float in order to avoid merging errors
+    id_cols = [col for col in pbp.columns if '_id' in col]
+    pbp[id_cols] = pbp[id_cols].apply(pd.to_numeric, errors='ignore')
+
+    return build_stat_cube(pbp)
+
+def nhl_calculate_cube_stats(cube:pd.DataFrame, game_strength:Union[Literal['all'], str, list[str]] = 'all', season_types:int | list[int] = 2, split_game:bool = False, start:str | None = None, end:str | None = None, roster_path:str = DEFAULT_ROSTER, shot_impact:bool = False, simple_col:bool = False):
+    """
+    Given a stat cube, game strength, and seasonal information, return aggregated skater statistics (identical to nhl_calculate_stats with type 'skater').
+
+    Args:
+        cube (pd.DataFrame):
+            A stat cube generated with nhl_build_stat_cube.
+        game_strength (int or list[str], optional):
+            List of game strength states to include (e.g., ['5v5','5v4','4v5']).  Default is 'all'.
+        season_types (int or List[int], optional):
+            List of season_types to include.  Default is all regular season games which is the int '2'.
+        split_game (bool, optional):
+            If True, aggregates stats separately for each game; otherwise, stats are aggregated across all games.  Default is False.
+        start (str, optional):
+            The date string (YYYY-MM-DD) of the first game to include.  Default is None.
+        end (str, optional):
+            The date string (YYYY-MM-DD) of the last game to include.  Default is None.
+        roster_path (str, optional):
+            File path to the roster data used for mapping players and teams.
+        shot_impact (bool, optional):
+            If True, applies shot impact metrics to the stats DataFrame.  Default is False.
+        simple_col (bool, optional):
+            If True, retains the column names (abbreviated and non-standard) used when developing the package.  Default is False.
+            
+    Returns:
+        pd.DataFrame:
+            A DataFrame containing the aggregated statistics according to the selected parameters.
+    """
+
+    #If single values provided for columns typically in a list then place them into a list
+    if isinstance(season_types, int):
+        season_types = [season_types]
+    if isinstance(game_strength, str) and game_strength != 'all':
+        game_strength = [game_strength]
+
+    #Apply season_type and date filters
+    cube = cube.loc[cube['season_type'].isin(season_types)]
+    if start is not None:
+        cube = cube.loc[pd.to_datetime(cube['game_date']) >= pd.to_datetime(start)]
+    if end is not None:
+        cube = cube.loc[pd.to_datetime(cube['game_date']) <= pd.to_datetime(end)]
+
+    #Split by game if specified
+    if split_game:
+        second_group = ['season','game_id']
+    else:
+        second_group = ['season']
+
+    #Sum counts and add remaining stats
+    indv_stats, onice_stats = query_stat_cube(cube, game_strength, second_group)
+    complete = finish_stats(calc_skater(indv_stats, onice_stats, second_group), 'skater', game_strength, season_types, roster_path, shot_impact)
+
+    return complete if simple_col else complete.rename(columns=COL_MAP['stats'], errors='ignore')
+
+def nhl_calculate_partitioned_stats(partitions:str | list[str | pd.DataFrame] | Iterator[pd.DataFrame], type:Literal['skater','goalie','team','game_score'], game_strength:Union[Literal['all'], str, list[str]] = 'all', season_types:int | list[int] = 2, split_game:bool = False, roster_path:str = DEFAULT_ROSTER, shot_impact:bool = False, simple_col:bool = False, adjust:bool | pd.DataFrame = False):
+    """
+    Given partitions of play-by-play data (such as files of single games or seasons), return aggregated statistics at the skater, goalie, or team level (identical to nhl_calculate_stats with the combined play-by-play).
+
+    Partitions are read one at a time (with only the columns required for statistics) and reduced to additive counts by player or team, which are summed as partitions are read.  Ratios, shares, and rates are calculated once after all partitions are combined, so statistics for any number of seasons are calculated without holding more than one partition of play-by-play in memory.  Each game must be contained in a single partition.
+
+    Args:
+        partitions (str or List[str or pd.DataFrame] or Iterator[pd.DataFrame]):
+            Directory of play-by-play files (CSV or Parquet, searched recursively, such as the 'sources' directory written when scraping with sources=True, where only the complete play-by-play of each game is read and the HTML, JSON, and SHIFTS folders are skipped), list of files or directories, or list or iterator of play-by-play DataFrames.  Files without xG are read in full and the xG model is applied to them.
+        type (Literal['skater', 'goalie', 'team', 'game_score']):
+            Type of statistics to calculate. Must be one of 'skater', 'goalie', 'team', or 'game_score' (specific combination of skaters and goaltenders by game).
+        game_strength (int or list[str], optional):
+            List of game strength states to include (e.g., ['5v5','5v4','4v5']).  Default is 'all'.
+        season_types (int or List[int], optional):
+            List of season_types to include.  Default is all regular season games which is the int '2'.
+        split_game (bool, optional):
+            If True, aggregates stats separately for each game; otherwise, stats are aggregated across all games.  Value is ignored when type == 'game_score'.  Default is False.
+        roster_path (str, optional):
+            File path to the roster data used for mapping players and teams.
+        shot_impact (bool, optional):
+            If True, applies shot impact metrics to the stats DataFrame.  Default is False.
+        simple_col (bool, optional):
+            If True, retains the column names (abbreviated and non-standard) used when developing the package.  Default is False.
+        adjust (bool or pd.DataFrame, optional):
+            If True, corsi, fenwick, and xG for skaters, goalies, and teams are adjusted for score and venue with weights calculated from the provided partitions (which are read twice, so iterators of DataFrames are not accepted).  Weights from nhl_calculate_adjustments may be provided instead.  Value is ignored when type == 'game_score'.  Default is False.
+            
+    Returns:
+        pd.DataFrame:
+            A DataFrame containing the aggregated statistics according to the selected parameters.
+    """
+
+    reporter.message(f'Calculating statistics for {type}s at {game_strength} from partitioned play-by-play...')
+    start = time.perf_counter()
+
+    #If single values provided for columns typically in a list then place them into a list
+    if isinstance(season_types, int):
+        season_types = [season_types]
+    if isinstance(game_strength, str) and game_strength != 'all':
+        game_strength = [game_strength]
+
+    #Split by game if specified
+    if split_game:
+        second_group = ['season','game_id']
+    else:
+        second_group = ['season']
+
+    def read(partitions):
+        #Yield each partition with the season_type filter applied and shootouts removed (as in nhl_calculate_stats)
+        for partition in iter_partitions(partitions):
+            pbp = read_partition(partition)
+            pbp = project_columns(pbp,stats_cols,(pbp['season_type'].isin(season_types))&(pbp['period_type']!='SO'))
+
+            #Convert all columns with player ids to float in order to avoid merging errors
+            id_cols = [col for col in pbp.columns if '_id' in col]
+            pbp[id_cols] = pbp[id_cols].apply(pd.to_numeric, errors='ignore')
+
+            if not pbp.empty:
+                yield pbp
+
+    #Calculate score and venue adjustment weights if necessary (in a first pass summing events by venue and score state)
+    if isinstance(adjust, pd.DataFrame):
+        weights = adjust
+    elif adjust and type != 'game_score':
+        if iter(partitions) is partitions:
+            raise ValueError('Adjustment weights require reading partitions twice.  Provide partitions as a directory or list, or provide weights from nhl_calculate_adjustments.')
+        weights = adjustment_weights(sum(adjustment_counts(pbp) for pbp in read(partitions)))
+    else:
+        weights = None
+
+    #Reduce each partition to partial stats (partials are merged after every batch of partitions)
+    partials = []
+    finished = 0
+    for pbp in read(partitions):
+        if type == 'game_score':
+            partials.append(game_score_stats(pbp))
+        else:
+            partials.append(partial_stats(pbp,type,game_strength,second_group,weights))
+            if len(partials) >= partial_batch:
+                partials = [merge_partials(partials,type,second_group)]
+        
+        finished += 1
+        reporter.emit('partition_finished',rows=len(pbp),finished=finished,elapsed=time.perf_counter()-start)
+        del pbp
+
+    if not partials:
+        reporter.message('No play-by-play found in the provided partitions.',level='warning')
+        return pd.DataFrame()
+
+    #Merge partial stats and add ratios
+    if type == 'game_score':
+        complete = pd.concat(partials)
+    elif type == 'skater':
+        complete = partial_ratios(merge_partials(partials,type,second_group),type,second_group)
+    else:
+        complete = format_stats(partial_ratios(merge_partials(partials,type,second_group),type,second_group), type)
+
+    complete = finish_stats(complete, type, game_strength, season_types, roster_path, shot_impact)
+
     end = time.perf_counter()
     length = end-start
-    print(f'...finished in {(length if length <60 else length/60):.2f} {'seconds' if length <60 else 'minutes'}.')
+    reporter.message(f'...finished {finished} partitions in {(length if length <60 else length/60):.2f} {'seconds' if length <60 else 'minutes'}.')
+    reporter.emit('task_finished',task=f'calculate_partitioned_stats_{type}',seconds=length,rows=len(complete))
 
     return complete if simple_col else complete.rename(columns=COL_MAP['stats'], errors='ignore')
 
-def nhl_plot_skaters_shots(pbp:pd.DataFrame, skater_dict:dict[str | int, list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types: int | list[int] = 2, strengths_title:str | None = None, marker_dict:dict = event_markers, situation:Literal['indv','for','against'] = 'indv', title:str | bool = True, legend:bool = False):
+def nhl_build_stints(pbp:pd.DataFrame):
     """
-    Return a dictionary of shot plots for the specified skaters.
+    Given play-by-play data, return a stint table of contiguous stretches of play with identical on-ice skaters and goalies, score, and strength.
+
+    Stint boundaries are detected by hashing the sorted on-ice IDs of each team.  The stint table may be built once and provided to functions such as nhl_calculate_rapm in place of play-by-play.
 
     Args:
         pbp (pd.DataFrame):
-            A DataFrame containing play-by-play event data to be visualized.
+            A DataFrame containing play-by-play event data.
+
+    Returns:
+        pd.DataFrame:
+            A DataFrame with a row for each stint containing start and end seconds, duration, strength, score, personnel (with a hash of the personnel of each team), and event counts and xG for each team.
+    """
+
+    #Check if xG column exists and apply model if it does not
+    try:
+        pbp['xG']
+    except KeyError: 
+        pbp = wsba_xG(pbp)
+
+    #Return: stint table (shootouts removed)
+    return build_stints(pbp.loc[pbp['period_type']!='SO'])
+
+def nhl_calculate_rapm(pbp:pd.DataFrame, game_strength:Union[str, list[str]] = '5v5', season_types:int | list[int] = 2, alpha:float = 100, roster_path:str = DEFAULT_ROSTER, simple_col:bool = False):
+    """
+    Given play-by-play data (or a stint table), game strength, and seasonal information, return regularized adjusted plus-minus (RAPM) for skaters.
+
+    Play-by-play is collapsed into stints of constant on-ice personnel and a ridge regression of xG and corsi rates per sixty minutes (weighted by stint length) is solved over a sparse design matrix with offense and defense columns for each skater, isolating the impact of each skater from their teammates and competition.
+
+    Args:
+        pbp (pd.DataFrame):
+            A DataFrame containing play-by-play event data or a stint table generated with nhl_build_stints.
+        game_strength (str or list[str], optional):
+            List of game strength states to include (strength states are matched for either team, e.g. '5v4' includes both power plays and penalty kills).  Default is '5v5'.
+        season_types (int or List[int], optional):
+            List of season_types to include.  Default is all regular season games which is the int '2'.
+        alpha (float, optional):
+            Regularization strength of the ridge regression (stint lengths are weighted in minutes).  Default is 100.
+        roster_path (str, optional):
+            File path to the roster data used for mapping players.
+        simple_col (bool, optional):
+            If True, retains the column names (abbreviated and non-standard) used when developing the package.  Default is False.
+            
+    Returns:
+        pd.DataFrame:
+            A DataFrame containing offensive, defensive, and net RAPM impacts per sixty minutes for xG and corsi for each skater.
+    """
+
+    #If single values provided for columns typically in a list then place them into a list
+    if isinstance(season_types, int):
+        season_types = [season_types]
+    if isinstance(game_strength, str):
+        game_strength = [game_strength]
+
+    #Collapse play-by-play into stints (stint tables are used as provided) and apply season_type filter
+    stints = nhl_build_stints(pbp) if 'event_type' in pbp.columns else pbp
+    stints = stints.loc[stints['season_type'].isin(season_types)]
+    
+    #Filter by game strength
+    state = stints['strength_state_venue']
+    stints = stints.loc[state.isin(game_strength)|state.str[::-1].isin(game_strength)]
+
+    #Fit model
+    rapm = rapm_model(stints, alpha)
+
+    #Add names
+    names = pd.read_csv(roster_path)[['player_id','player_name']].drop_duplicates(subset=['player_id'],keep='last')
+    rapm = pd.merge(rapm,names,how='left',left_on='ID',right_on='player_id').drop(columns=['player_id']).rename(columns={'player_name':'Player'})
+    rapm = rapm[['Player']+[col for col in rapm.columns if col != 'Player']].sort_values('xG+/-/60 RAPM',ascending=False)
+
+    #Add strength and season type columns to the end of the df
+    rapm['Strength'] = ', '.join(game_strength)
+    rapm['Span'] = 'all' if season_types == [2,3] else ', '.join([str(s) for s in season_types])
+
+    return rapm if simple_col else rapm.rename(columns=COL_MAP['stats'], errors='ignore')
+
+def nhl_build_plot_context(pbp:pd.DataFrame, marker_dict:dict = event_markers):
+    """
+    Given play-by-play data, return a plot context which prepares the data once and may be shared by plotting functions.
+
+    The context applies the xG model (if necessary) and keeps only the columns used in plotting.  Events are prepared once for each selection of strengths and season types and indexed by game, team, and shooter.
+
+    Args:
+        pbp (pd.DataFrame):
+            A DataFrame containing play-by-play event data.
+        marker_dict (dict[str, dict], optional):
+            Dictionary of event types mapped to marker styles used in plotting.
+
+    Returns:
+        PlotContext:
+            A plot context accepted in place of play-by-play by nhl_plot_skaters_shots, nhl_plot_heatmap, and nhl_plot_games.
+    """
+
+    return PlotContext(pbp,marker_dict)
+
+def nhl_plot_skaters_shots(pbp:pd.DataFrame | PlotContext, skater_dict:dict[str | int, list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types: int | list[int] = 2, strengths_title:str | None = None, marker_dict:dict = event_markers, situation:Literal['indv','for','against'] = 'indv', title:str | bool = True, legend:bool = False, path:str | None = None, formats:list[str] = ['png'], workers:int = 1):
+    """
+    Return a dictionary of shot plots for the specified skaters.
+
+    Args:
+        pbp (pd.DataFrame or PlotContext):
+            A DataFrame containing play-by-play event data to be visualized (or a plot context built from it with nhl_build_plot_context).
         player_dict (dict[str, list[int, str]]):
             Dictionary of players to plot, where each key is a player name and the value is a list 
             with season and team info (e.g., {'Patrice Bergeron': [20212022, 'BOS']} or {8470638: [20212022, 'BOS']}).  
@@ -1234,41 +1924,57 @@ def nhl_plot_skaters_shots(pbp:pd.DataFrame, skater_dict:dict[str | int, list[in
             Whether to include a plot title.
         legend (bool, optional):
             Whether to include a legend on the plots.
+        path (str or None, optional):
+            Folder to write plots to.  If provided, plots are rendered to disk (and closed) and the written file paths are returned in place of figures.  Default is None.
+        formats (list[str], optional):
+            File formats to write when a path is provided (e.g., ['png','svg']).  Default is ['png'].
+        workers (int, optional):
+            Number of processes rendering plots when a path is provided.  Default is 1.
 
     Returns:
-        Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure]]]:
-            A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure.
+        Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure | list[str]]]]:
+            A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure (or written file paths).
     """
 
-    print(f'Plotting the following skater shots: {skater_dict}...')
+    reporter.message(f'Plotting the following skater shots: {skater_dict}...')
 
     roster = pd.read_csv(DEFAULT_ROSTER)
 
-    #Iterate through skaters, adding plots to dict
-    skater_plots = {}
+    #Iterate through skaters, adding plot jobs to list
+    jobs = []
 
     for skater in skater_dict.keys():
         skater_name = skater.title() if isinstance(skater, str) else roster.loc[roster['player_id']==skater,'player_name'].iloc[0].title()
         skater_info = skater_dict[skater]
         
         if isinstance(title, str) or not title:
-            title = title
+            plot_title = title
         else:
-            title = f'{skater_name} Fenwick Shots for {skater_info[1]} in {str(skater_info[0])[2:4]}-{str(skater_info[0])[6:8]}'
+            plot_title = f'{skater_name} Fenwick Shots for {skater_info[1]} in {str(skater_info[0])[2:4]}-{str(skater_info[0])[6:8]}'
             
-        #Key is formatted as IDSEASONTEAM (i.e. 847063820212022BOS)
-        skater_plots.update({skater:{skater_info[0]:{skater_info[1]:plot_skater_shots(pbp,skater,skater_info[0],skater_info[1],strengths,season_types,strengths_title,title,marker_dict,situation,legend)}}})
+        jobs.append((skater,skater_info,(skater,skater_info[0],skater_info[1],strengths,season_types,strengths_title,plot_title,marker_dict,situation,legend)))
+
+    #Render plots to disk or return figures (play-by-play is prepared once for all plots)
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp,marker_dict)
+    if path:
+        plots = render_plots(context,[('shot',args,os.path.join(path,str(skater),str(info[0]),str(info[1]),'plot')) for skater, info, args in jobs],formats,workers)
+    else:
+        plots = [plot_skater_shots(context,*args) for skater, info, args in jobs]
+
+    skater_plots = {}
+    for (skater, skater_info, args), plot in zip(jobs,plots):
+        skater_plots.update({skater:{skater_info[0]:{skater_info[1]:plot}}})
 
     #Return: list of plotted skater shot charts
     return skater_plots
 
-def nhl_plot_heatmap(pbp:pd.DataFrame, player_dict:dict[str | int | Literal[8], list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types: int | list[int] = 2, strengths_title:str | None = None, title:str | bool = True):
+def nhl_plot_heatmap(pbp:pd.DataFrame | PlotContext, player_dict:dict[str | int | Literal[8], list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types: int | list[int] = 2, strengths_title:str | None = None, title:str | bool = True, path:str | None = None, formats:list[str] = ['png'], workers:int = 1):
     """
     Return a dictionary of heatmaps for the specified players or teams.
 
     Args:
-        pbp (pd.DataFrame):
-            A DataFrame containing play-by-play event data to be visualized.
+        pbp (pd.DataFrame or PlotContext):
+            A DataFrame containing play-by-play event data to be visualized (or a plot context built from it with nhl_build_plot_context).
         player_dict (dict[str, list[int, str]]):
             Dictionary of players to plot, where each key is a player name and the value is a list 
             with season and team info (e.g., {'Patrice Bergeron': [20212022, 'BOS']} or {8470638: [20212022, 'BOS']}).  
@@ -1281,18 +1987,24 @@ def nhl_plot_heatmap(pbp:pd.DataFrame, player_dict:dict[str | int | Literal[8],
             Specify a title to describe the strengths states included in the plot.  Default is None (strengths shown will be a full list of the included strengths in the plot).
         title (str or bool, optional):
             Whether to include a plot title.
+        path (str or None, optional):
+            Folder to write plots to.  If provided, plots are rendered to disk (and closed) and the written file paths are returned in place of figures.  Default is None.
+        formats (list[str], optional):
+            File formats to write when a path is provided (e.g., ['png','svg']).  Default is ['png'].
+        workers (int, optional):
+            Number of processes rendering plots when a path is provided.  Default is 1.
 
     Returns:
-        Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure]]]:
-            A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure.  The phrase 'Team' takes the place for team heatmaps.
+        Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure | list[str]]]]:
+            A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure (or written file paths).  The phrase 'Team' takes the place for team heatmaps.
     """
 
-    print(f'Plotting full-ice heatmap for the following players or teams: {player_dict}...')
+    reporter.message(f'Plotting full-ice heatmap for the following players or teams: {player_dict}...')
 
     roster = pd.read_csv(DEFAULT_ROSTER)
 
-    #Iterate through players, adding plots to dict
-    player_plots = {}
+    #Iterate through players, adding plot jobs to list
+    jobs = []
 
     for player in player_dict.keys():
         player_info = player_dict[player]
@@ -1307,22 +2019,33 @@ def nhl_plot_heatmap(pbp:pd.DataFrame, player_dict:dict[str | int | Literal[8],
             title_header = f'{player_name} Heatmap for {player_info[1]}'
         
         if isinstance(title, str) or not title:
-            title = title
+            plot_title = title
         else:
-            title = f'{title_header} in {str(player_info[0])[2:4]}-{str(player_info[0])[6:8]}'
+            plot_title = f'{title_header} in {str(player_info[0])[2:4]}-{str(player_info[0])[6:8]}'
         
-        player_plots.update({player_key:{player_info[0]:{player_info[1]:gen_heatmap(pbp,player,player_info[0],player_info[1],strengths,season_types,'xG',strengths_title,title)}}})
+        jobs.append((player_key,player_info,(player,player_info[0],player_info[1],strengths,season_types,'xG',strengths_title,plot_title)))
+
+    #Render plots to disk or return figures (shot grids are prepared once and league baselines are shared by all heatmaps of the same season)
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp)
+    if path:
+        plots = render_plots(context,[('heatmap',args,os.path.join(path,str(key),str(info[0]),str(info[1]),'plot')) for key, info, args in jobs],formats,workers)
+    else:
+        plots = [gen_heatmap(context,*args) for key, info, args in jobs]
+
+    player_plots = {}
+    for (player_key, player_info, args), plot in zip(jobs,plots):
+        player_plots.update({player_key:{player_info[0]:{player_info[1]:plot}}})
 
     #Return: list of plotted player shot charts
     return player_plots
 
-def nhl_plot_games(pbp:pd.DataFrame, events:list[str] = FENWICK_EVENTS, strengths:Union[Literal['all'], list[str]] = 'all', game_ids: Union[Literal['all'], list[int]] = 'all', marker_dict:dict = event_markers, team_colors:dict = {'away':'primary','home':'primary'}, legend:bool =False):
+def nhl_plot_games(pbp:pd.DataFrame | PlotContext, events:list[str] = FENWICK_EVENTS, strengths:Union[Literal['all'], list[str]] = 'all', game_ids: Union[Literal['all'], list[int]] = 'all', marker_dict:dict = event_markers, team_colors:dict = {'away':'primary','home':'primary'}, legend:bool =False, path:str | None = None, formats:list[str] = ['png'], workers:int = 1):
     """
     Returns a dictionary of event plots for the specified games.
 
     Args:
-        pbp (pd.DataFrame):
-            A DataFrame containing play-by-play event data.
+        pbp (pd.DataFrame or PlotContext):
+            A DataFrame containing play-by-play event data (or a plot context built from it with nhl_build_plot_context).
         events (str or list[str]):
             List of event types to include in the plot (e.g., ['shot-on-goal', 'goal']).
         strengths (str or list[str], optional):
@@ -1333,22 +2056,35 @@ def nhl_plot_games(pbp:pd.DataFrame, events:list[str] = FENWICK_EVENTS, strength
             Dictionary mapping event types to marker styles and/or colors used in plotting.
         legend (bool, optional):
             Whether to include a legend on the plots.
+        path (str or None, optional):
+            Folder to write plots to.  If provided, plots are rendered to disk (and closed) and the written file paths are returned in place of figures.  Default is None.
+        formats (list[str], optional):
+            File formats to write when a path is provided (e.g., ['png','svg']).  Default is ['png'].
+        workers (int, optional):
+            Number of processes rendering plots when a path is provided.  Default is 1.
 
     Returns:
-        dict[int, matplotlib.figure.Figure]:
-            A dictionary mapping each game ID to its corresponding matplotlib event plot figure.
+        dict[int, matplotlib.figure.Figure | list[str]]:
+            A dictionary mapping each game ID to its corresponding matplotlib event plot figure (or written file paths).
     """
 
+    #Prepare play-by-play once for all plots
+    context = pbp if isinstance(pbp, PlotContext) else PlotContext(pbp,marker_dict)
+
     #Find games to scrape
     if game_ids == 'all':
-        game_ids = pbp['game_id'].drop_duplicates().to_list()
+        game_ids = context.pbp['game_id'].drop_duplicates().to_list()
 
-    print(f'Plotting the following games: {game_ids}...')
+    reporter.message(f'Plotting the following games: {game_ids}...')
 
-    game_plots = {}
-    #Iterate through games, adding plot to dict
-    for game in game_ids:
-        game_plots.update({game:plot_game_events(pbp,game,events,strengths,marker_dict,team_colors,legend)})
+    #Render plots to disk or iterate through games, adding plot to dict
+    if path:
+        plots = render_plots(context,[('game',(game,events,strengths,marker_dict,team_colors,legend),os.path.join(path,str(game))) for game in game_ids],formats,workers)
+        game_plots = dict(zip(game_ids,plots))
+    else:
+        game_plots = {}
+        for game in game_ids:
+            game_plots.update({game:plot_game_events(context,game,events,strengths,marker_dict,team_colors,legend)})
 
     #Return: list of plotted game events
     return game_plots
@@ -1373,15 +2109,17 @@ def nhl_plot_game_score(pbp:pd.DataFrame, game_ids: Union[Literal['all'], list[i
     if game_ids == 'all':
         game_ids = pbp['game_id'].drop_duplicates().to_list()
 
-    print(f'Charting game score for the following games: {game_ids}...')
+    reporter.message(f'Charting game score for the following games: {game_ids}...')
+
+    #Calculate game score for all games at once
+    stats = nhl_calculate_stats(pbp.loc[pbp['game_id'].isin(game_ids)],'game_score').sort_values('game_score',ascending=False)
+    games = stats.groupby('game_id').indices
 
     game_plots = {}
     #Iterate through games, adding plot to dict
     for game in game_ids:
-        df = pbp.loc[pbp['game_id']==game]
-        stats = nhl_calculate_stats(df,'game_score').sort_values('game_score',ascending=False)
-
-        game_plots.update({game:plot_game_score(stats)})
+        if game in games:
+            game_plots.update({game:plot_game_score(stats.iloc[games[game]])})
 
     #Return: list of charted games
     return game_plots
@@ -1438,6 +2176,16 @@ def repo_load_teaminfo():
     return pd.read_csv(INFO_PATH)
 
 ## CLASSES ##
+def export_plot(plot, path:str):
+    #Given figure or paths of a plot rendered to disk and export path (without extension), write the figure to PNG or copy the rendered files
+    if isinstance(plot, list):
+        for file in plot:
+            target = f'{path}{os.path.splitext(file)[1]}'
+            if os.path.abspath(file) != os.path.abspath(target):
+                shutil.copyfile(file, target)
+    else:
+        plot.savefig(f'{path}.png', bbox_inches='tight')
+
 class NHL_Database:
     """
     A class for managing and analyzing NHL play-by-play data.
@@ -1454,8 +2202,10 @@ class NHL_Database:
             Unique game IDs currently in the dataset.
         stats (dict[str, dict[str, pd.DataFrame]]): 
             Dictionary storing calculated stats by type and name.
+        cube (pd.DataFrame):
+            Stat cube of the games added with cube=True (see nhl_build_stat_cube).
         plots (dict[int, matplotlib.figure.Figure] |  dict[str or int, dict[int, dict[str, matplotlib.figure.Figure]]]): 
-            Dictionary storing plot outputs keyed by game or event.
+            Dictionary storing plot outputs keyed by game or event (file paths replace figures for plots rendered to disk).
 
     Args:
         game_ids (list[int], optional): 
@@ -1483,7 +2233,7 @@ class NHL_Database:
                 The initialized play-by-play dataset.
         """
 
-        print(f'Initializing database "{name}"...')
+        reporter.message(f'Initializing database "{name}"...')
         self.name = name
 
         if game_ids:
@@ -1493,24 +2243,34 @@ class NHL_Database:
 
         self.games = self.pbp['game_id'].drop_duplicates().to_list()
         self.stats = {}
+        self.cube = pd.DataFrame()
         self.game_plots = {}
         self.plots = {}
 
-    def add_games(self, game_ids:list[int]):
+    def add_games(self, game_ids:list[int], cube:bool = False):
         """
         Add additional games to the existing play-by-play dataset.
 
         Args:
             game_ids (list[int]): 
                 List of game IDs to scrape and append.
+            cube (bool, optional):
+                If True, the stat cube of each game is built as it is scraped and appended to the stat cube of the database.  Default is False.
 
         Returns:
             pd.DataFrame: 
                 The updated play-by-play dataset.
         """
 
-        print('Adding games...')
-        self.pbp = pd.concat([self.pbp,nhl_apply_xG(wsba.nhl_scrape_game(game_ids))])
+        reporter.message('Adding games...')
+        data = wsba.nhl_scrape_game(game_ids,cube=cube)
+
+        #Games are returned with their stat cube if it was built
+        if isinstance(data, dict):
+            self.cube = pd.concat([self.cube,data['cube']]).reset_index(drop=True)
+            data = data['pbp']
+
+        self.pbp = pd.concat([self.pbp,nhl_apply_xG(data)])
 
         return self.pbp
     
@@ -1527,7 +2287,7 @@ class NHL_Database:
                 Filtered PBP data matching the selected games.
         """
          
-        print('Selecting games...')
+        reporter.message('Selecting games...')
 
         df = self.pbp
         return df.loc[df['game_id'].isin(game_ids)]
@@ -1603,7 +2363,7 @@ class NHL_Database:
         return pd.unique(self.pbp['season']).tolist()
 
 
-    def add_game_plots(self, events:list[str] = FENWICK_EVENTS, strengths:Union[Literal['all'], list[str]] = 'all', game_ids: Union[Literal['all'], list[int]] = 'all', marker_dict:dict = event_markers, team_colors:dict = {'away':'primary','home':'primary'}, legend:bool = False):
+    def add_game_plots(self, events:list[str] = FENWICK_EVENTS, strengths:Union[Literal['all'], list[str]] = 'all', game_ids: Union[Literal['all'], list[int]] = 'all', marker_dict:dict = event_markers, team_colors:dict = {'away':'primary','home':'primary'}, legend:bool = False, path:str | None = None, formats:list[str] = ['png'], workers:int = 1):
         """
         Generate visualizations of game events based on play-by-play data.
 
@@ -1620,17 +2380,23 @@ class NHL_Database:
                 Dictionary mapping team venue (home or away) to its primary or secondary color.
             legend (bool, optional):
                 Whether to include a legend on the plots.
+            path (str or None, optional):
+                Folder to write plots to.  If provided, plots are rendered to disk (and closed) and the written file paths are stored in place of figures.  Default is None.
+            formats (list[str], optional):
+                File formats to write when a path is provided (e.g., ['png','svg']).  Default is ['png'].
+            workers (int, optional):
+                Number of processes rendering plots when a path is provided.  Default is 1.
 
         Returns:
-            dict[int, matplotlib.figure.Figure]:
-                A dictionary mapping each game ID to its corresponding matplotlib event plot figure.
+            dict[int, matplotlib.figure.Figure | list[str]]:
+                A dictionary mapping each game ID to its corresponding matplotlib event plot figure (or written file paths).
         """
         
-        self.game_plots.update(nhl_plot_games(self.pbp, events, strengths, game_ids, marker_dict, team_colors, legend))
+        self.game_plots.update(nhl_plot_games(self.pbp, events, strengths, game_ids, marker_dict, team_colors, legend, path, formats, workers))
 
         return self.game_plots
     
-    def add_plots(self, plot:Literal['shot','heatmap'], player_dict:dict[str | int | Literal[8], list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types:int | list[int] = 2, strengths_title:str | None = None, marker_dict:dict = event_markers, situation:Literal['indv','for','against'] = 'indv', title:str | bool = True, legend:bool = False):
+    def add_plots(self, plot:Literal['shot','heatmap'], player_dict:dict[str | int | Literal[8], list[int, str]], strengths:Union[Literal['all'], list[str]] = 'all', season_types:int | list[int] = 2, strengths_title:str | None = None, marker_dict:dict = event_markers, situation:Literal['indv','for','against'] = 'indv', title:str | bool = True, legend:bool = False, path:str | None = None, formats:list[str] = ['png'], workers:int = 1):
         """
         Generate visualizations for players or teams based on play-by-play data.
 
@@ -1662,13 +2428,19 @@ class NHL_Database:
                 Whether to include a plot title.
             legend (bool):
                 Whether to include a legend on the plots.  Only applies when plot is equal to 'shot'.
+            path (str or None, optional):
+                Folder to write plots to.  If provided, plots are rendered to disk (and closed) and the written file paths are stored in place of figures.  Default is None.
+            formats (list[str], optional):
+                File formats to write when a path is provided (e.g., ['png','svg']).  Default is ['png'].
+            workers (int, optional):
+                Number of processes rendering plots when a path is provided.  Default is 1.
 
         Returns:
-            Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure]]]:
-                A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure.  The phrase 'Team' takes the place for team heatmaps.
+            Dict[str or int, Dict[int, Dict[str, matplotlib.figure.Figure | list[str]]]]:
+                A dictionary mapping each skater’s name or id to their corresponding season, team, then matplotlib heatmap figure (or written file paths).  The phrase 'Team' takes the place for team heatmaps.
         """
         
-        data = nhl_plot_skaters_shots(self.pbp,player_dict,strengths,season_types,strengths_title,marker_dict,situation,title,legend) if plot == 'shot' else nhl_plot_heatmap(self.pbp,player_dict,strengths,strengths_title,title)
+        data = nhl_plot_skaters_shots(self.pbp,player_dict,strengths,season_types,strengths_title,marker_dict,situation,title,legend,path,formats,workers) if plot == 'shot' else nhl_plot_heatmap(self.pbp,player_dict,strengths,season_types,strengths_title,title,path,formats,workers)
 
         self.plots.update(data)
 
@@ -1681,7 +2453,7 @@ class NHL_Database:
         The method writes:
         - The full play-by-play DataFrame to a CSV file.
         - All calculated statistics by type and name to CSV files in subfolders.
-        - All stored plots to PNG files.
+        - All stored plots to PNG files (plots already rendered to disk are copied).
 
         If no path is provided, exports to a folder named after the database (`self.name/`).
 
@@ -1690,7 +2462,7 @@ class NHL_Database:
                 Root folder to export data into. Defaults to `self.name/`.
         """
 
-        print(f'Exporting data in database "{self.name}"...')
+        reporter.message(f'Exporting data in database "{self.name}"...')
         start = time.perf_counter()
 
         # Use default path if none provided
@@ -1711,7 +2483,7 @@ class NHL_Database:
         plot_path = os.path.join(path, 'game_plots')
         os.makedirs(plot_path, exist_ok=True)
         for game_id, plot in self.game_plots.items():
-            plot.savefig(os.path.join(plot_path, f'{game_id}.png'), bbox_inches='tight')
+            export_plot(plot, os.path.join(plot_path, f'{game_id}'))
 
         # Export plots
         plot_path = os.path.join(path, 'plots')
@@ -1722,9 +2494,9 @@ class NHL_Database:
                 os.makedirs(f'{plot_path}/{eid}/{season}', exist_ok=True)
                 for team, plot in teams.items():
                     os.makedirs(f'{plot_path}/{eid}/{season}/{team}', exist_ok=True)
-                    plot.savefig(os.path.join(plot_path, f'{eid}/{season}/{team}/plot.png'), bbox_inches='tight')
+                    export_plot(plot, os.path.join(plot_path, f'{eid}/{season}/{team}/plot'))
 
         # Completion message
         end = time.perf_counter()
         length = end - start
-        print(f"...finished in {length:.2f} {'seconds' if length < 60 else 'minutes'}.")
\ No newline at end of file
+        reporter.message(f"...finished in {length:.2f} {'seconds' if length < 60 else 'minutes'}.")
\ No newline at end of file
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import statistics
+from datetime import datetime, timezone
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from importlib import metadata
+from wsba_hockey.tools import scraping, agg, plotting
+from wsba_hockey.tools.xg_model import wsba_xG
+from wsba_hockey.wsba_main import nhl_calculate_stats
+from fixtures import GAME_ID, FIXTURE_SETS, fixture_kind, load_game_documents, synthetic_pbp
+
+### WSBA HOCKEY BENCHMARKS ###
+## Provided below is a benchmark suite timing the hot paths of the package (scraping, parsing, xG, and aggregation) on fixture documents and synthetic play-by-play
+# Results are written as JSON for regression tracking:
+#   python bench.py --output results.json
+#   python bench.py --only parse_html combine_data --repeat 10
+# Fixture documents are created by fixtures.py; scraping benchmarks run on NHL documents when they have been downloaded (the parsing baseline) and on synthetic documents otherwise
+# The set of documents is recorded with the results and scraping timings of the two sets should not be compared
+
+dir = os.path.dirname(os.path.realpath(__file__))
+
+## SETUP ##
+def game_info(raw):
+    #Given raw game documents, return game information with documents attached (as in parse_game_documents)
+    info = scraping.parse_game_info(raw['json'],raw['shifts'],raw['coaches'])
+    info['documents'] = raw['documents']
+    return info
+
+def top_player(pbp):
+    #Given play-by-play, return the skater (with season and team) with the most shots in the first season
+    season = pbp['season'].min()
+    shots = pbp.loc[(pbp['season']==season)&(pbp['event_type'].isin(['missed-shot','shot-on-goal','goal']))]
+    player, team = shots.groupby(['event_player_1_id','event_team_abbr']).size().idxmax()
+    return int(player), season, team
+
+class Suite:
+    #Inputs shared by benchmarks (each input is built once, the first time a benchmark requires it)
+
+    def __init__(self, game_id, seasons, games, seed, documents=None):
+        self.game_id = game_id
+        self.documents = fixture_kind(game_id,documents)
+        self.seasons = seasons
+        self.games = games
+        self.seed = seed
+        self.inputs = {}
+
+    def get(self, key):
+        if key not in self.inputs:
+            self.inputs[key] = getattr(self, f'build_{key}')()
+        return self.inputs[key]
+
+    def build_info(self):
+        return game_info(load_game_documents(self.game_id,kind=self.documents))
+
+    def build_html_info(self):
+        return game_info(load_game_documents(self.game_id,html_shifts=True,kind=self.documents))
+
+    def build_pbp(self):
+        return synthetic_pbp(self.seasons,self.games,self.seed)
+
+    def build_xg(self):
+        return wsba_xG(self.get('pbp'))
+
+    def build_skater_stats(self):
+        return nhl_calculate_stats(self.get('xg'),'skater',['5v5'],2,simple_col=True)
+
+    def build_grids(self):
+        return plotting.HeatmapGrids(self.get('xg'))
+
+## BENCHMARKS ##
+#Each benchmark is a group, the input it is run on (for row counts), and a function of the suite returning a result
+def heatmap(suite, pbp):
+    player, season, team = top_player(suite.get('xg'))
+    fig = plotting.gen_heatmap(pbp,player,season,team,['5v5'])
+    plt.close(fig)
+    return fig
+
+BENCHMARKS = {
+    'parse_html':('scrape','info',lambda s: scraping.parse_html(s.get('info'))),
+    'parse_shift_events':('scrape','info',lambda s: pd.concat([scraping.parse_shift_events(s.get('info'),home) for home in [False,True]])),
+    'parse_shift_events_html':('scrape','html_info',lambda s: pd.concat([scraping.parse_shift_events(s.get('html_info'),home) for home in [False,True]])),
+    'combine_data':('scrape','info',lambda s: scraping.combine_data(s.get('info'),False)),
+    'wsba_xG':('xg','pbp',lambda s: wsba_xG(s.get('pbp'))),
+    'calc_indv':('agg','xg',lambda s: agg.calc_indv(s.get('xg'),['5v5'],['season'])),
+    'calc_onice':('agg','xg',lambda s: agg.calc_onice(s.get('xg'),['5v5'],['season'])),
+    'calc_team':('agg','xg',lambda s: agg.calc_team(s.get('xg'),['5v5'],['season'])),
+    'shooting_impacts':('agg','skater_stats',lambda s: agg.shooting_impacts(s.get('skater_stats'),'skater')),
+    'gen_heatmap':('plot','xg',lambda s: heatmap(s,s.get('xg'))),
+    'gen_heatmap_shared':('plot','xg',lambda s: heatmap(s,s.get('grids')))
+}
+
+def rows(value):
+    #Return number of rows in benchmark input or result (if it has any)
+    if isinstance(value, dict):
+        value = value.get('events')
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series, list)) else None
+
+def run_benchmark(suite, name, repeat, warmup):
+    #Given suite, benchmark name, and number of runs, return timing results of the benchmark
+    group, key, func = BENCHMARKS[name]
+    result = {'name':name,'group':group}
+    if group == 'scrape':
+        result['documents'] = suite.documents
+    try:
+        data = suite.get(key)
+        for _ in range(warmup):
+            func(suite)
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = func(suite)
+            times.append(time.perf_counter()-start)
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+        return result
+
+    result.update({'rows_in':rows(data),
+                   'rows_out':rows(output),
+                   'times':times,
+                   'min':min(times),
+                   'median':statistics.median(times),
+                   'mean':statistics.mean(times)})
+    return result
+
+def environment(args, suite):
+    #Return information about the environment and inputs of the benchmark run
+    try:
+        commit = subprocess.run(['git','rev-parse','HEAD'],cwd=dir,capture_output=True,text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    packages = {}
+    for package in ['wsba_hockey','pandas','numpy','scikit-learn','xgboost','beautifulsoup4','lxml','matplotlib']:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {'timestamp':datetime.now(timezone.utc).isoformat(),
+            'commit':commit,
+            'python':platform.python_version(),
+            'platform':platform.platform(),
+            'processor':platform.processor(),
+            'cpus':os.cpu_count(),
+            'packages':packages,
+            'repeat':args.repeat,
+            'warmup':args.warmup,
+            'fixture':suite.game_id,
+            'documents':suite.documents,
+            'synthetic':{'seasons':suite.seasons,'games':suite.games,'seed':suite.seed,
+                         'rows':len(suite.inputs['pbp']) if 'pbp' in suite.inputs else None}}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the WSBA Hockey benchmark suite.')
+    parser.add_argument('--only',nargs='+',choices=list(BENCHMARKS),help='benchmarks to run (all by default)')
+    parser.add_argument('--repeat',type=int,default=5,help='timed runs of each benchmark')
+    parser.add_argument('--warmup',type=int,default=1,help='untimed runs of each benchmark before timing')
+    parser.add_argument('--game',type=int,default=GAME_ID,help='fixture game')
+    parser.add_argument('--documents',choices=FIXTURE_SETS,help='set of fixture documents (NHL documents if downloaded and synthetic documents otherwise)')
+    parser.add_argument('--seasons',nargs='+',type=int,default=[20212022,20222023,20232024],help='seasons of synthetic play-by-play')
+    parser.add_argument('--games',type=int,default=100,help='games per season of synthetic play-by-play')
+    parser.add_argument('--seed',type=int,default=0,help='seed of synthetic play-by-play')
+    parser.add_argument('--output',help='path of JSON results (printed if not provided)')
+    args = parser.parse_args(argv)
+
+    suite = Suite(args.game,args.seasons,args.games,args.seed,args.documents)
+    if suite.documents == 'synthetic':
+        print(f'Scraping benchmarks run on synthetic documents; download NHL documents (python fixtures.py {args.game} --download) for the parsing baseline.', file=sys.stderr)
+    results = []
+    for name in args.only or BENCHMARKS:
+        result = run_benchmark(suite,name,args.repeat,args.warmup)
+        results.append(result)
+        status = result['error'] if 'error' in result else f"{result['median']:.4f} seconds (median)"
+        print(f'{name}: {status}', file=sys.stderr)
+
+    report = {'environment':environment(args,suite),
+              'benchmarks':results}
+
+    if args.output:
+        with open(args.output,'w') as f:
+            json.dump(report,f,indent=4)
+    else:
+        print(json.dumps(report,indent=4))
+
+    #Return: benchmark results
+    return report
+
+if __name__ == '__main__':
+    main()
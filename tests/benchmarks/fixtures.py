@@ -0,0 +1,428 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+
+### WSBA HOCKEY BENCHMARK FIXTURES ###
+## Provided below are functions which create and load the fixture documents used in the benchmark suite (see bench.py)
+# Each fixture game is a directory of the documents requested when scraping a game (the same documents get_game_documents returns):
+#   play-by-play.json - JSON play-by-play (https://api-web.nhle.com/v1/gamecenter/{game_id}/play-by-play)
+#   shiftcharts.json - JSON shifts (https://api.nhle.com/stats/rest/en/shiftcharts?cayenneExp=gameId={game_id})
+#   coaches.json - head coaches (parsed from https://api-web.nhle.com/v1/gamecenter/{game_id}/right-rail)
+#   PL{game}.HTM, TH{game}.HTM, TV{game}.HTM - HTML play-by-play and home and away shifts (https://www.nhl.com/scores/htmlreports/{season}/)
+# Fixtures are kept in two separate sets:
+#   fixtures/nhl/{game_id} - documents downloaded from the NHL (--download); the baseline of the parsing benchmarks
+#   fixtures/synthetic/{game_id} - documents rebuilt from a game in the sample play-by-play (default) with minimal markup, so that the suite runs without network access
+# Parsing timings of synthetic documents measure the markup written here rather than NHL reports and are not comparable to timings of NHL documents
+
+dir = os.path.dirname(os.path.realpath(__file__))
+fixture_dir = os.path.join(dir,'fixtures')
+sample_path = os.path.join(dir,'..','samples','sample_db','pbp.csv')
+roster_path = os.path.join(dir,'..','..','src','wsba_hockey','tools','rosters','nhl_rosters.csv')
+teams_path = os.path.join(dir,'..','..','src','wsba_hockey','tools','utils','team_tri_codes.json')
+
+#Fixture game (Colorado Avalanche at Washington Capitals, 2021-10-19)
+GAME_ID = 2021020045
+
+#Sets of fixture documents (NHL documents are preferred when available)
+FIXTURE_SETS = ['nhl','synthetic']
+
+#Team IDs used by the NHL API
+TEAM_IDS = {'NJD':1,'NYI':2,'NYR':3,'PHI':4,'PIT':5,'BOS':6,'BUF':7,'MTL':8,'OTT':9,'TOR':10,
+            'CAR':12,'FLA':13,'TBL':14,'WSH':15,'CHI':16,'DET':17,'NSH':18,'STL':19,'CGY':20,
+            'COL':21,'EDM':22,'VAN':23,'ANA':24,'DAL':25,'LAK':26,'SJS':28,'CBJ':29,'MIN':30,
+            'WPG':52,'ARI':53,'VGK':54,'SEA':55,'UTA':59}
+
+#HTML event codes
+HTML_EVENTS = {'period-start':'PSTR','faceoff':'FAC','shot-on-goal':'SHOT','blocked-shot':'BLOCK','stoppage':'STOP',
+               'missed-shot':'MISS','hit':'HIT','goal':'GOAL','giveaway':'GIVE','takeaway':'TAKE','delayed-penalty':'DELPEN',
+               'penalty':'PENL','challenge':'CHL','shootout-complete':'SOC','period-end':'PEND','game-end':'GEND'}
+
+#Event players (by order of importance) in JSON event details
+JSON_PLAYERS = {'faceoff':['winningPlayerId','losingPlayerId'],
+                'hit':['hittingPlayerId','hitteePlayerId'],
+                'giveaway':['playerId'],
+                'takeaway':['playerId'],
+                'shot-on-goal':['shootingPlayerId'],
+                'missed-shot':['shootingPlayerId'],
+                'blocked-shot':['shootingPlayerId','blockingPlayerId'],
+                'goal':['scoringPlayerId','assist1PlayerId','assist2PlayerId'],
+                'penalty':['committedByPlayerId','drawnByPlayerId']}
+
+## LOADING FUNCTIONS ##
+def game_path(game_id,kind='nhl'):
+    #Given game_id and fixture set, return directory of fixture documents
+    return os.path.join(fixture_dir,kind,str(game_id))
+
+def fixture_kind(game_id=GAME_ID,kind=None):
+    #Given game_id, return the set of its fixture documents (NHL documents if they were downloaded and synthetic documents otherwise)
+    kinds = [kind] if kind else FIXTURE_SETS
+    for kind in kinds:
+        if os.path.exists(os.path.join(game_path(game_id,kind),'play-by-play.json')):
+            return kind
+    
+    raise FileNotFoundError(f'No {" or ".join(kinds)} fixture documents for game {game_id} (create them with fixtures.py).')
+
+def html_name(code,game_id):
+    #Given HTML report code ('PL', 'TH', or 'TV') and game_id, return file name of HTML document
+    return f'{code}{str(game_id)[-6:]}.HTM'
+
+def load_game_documents(game_id=GAME_ID,html_shifts=False,kind=None):
+    #Given game_id, return raw fixture documents in the format returned by get_game_documents (HTML shifts are only included when requested)
+    #Documents are loaded from the provided fixture set or the first available set otherwise (see fixture_kind)
+    path = game_path(game_id,fixture_kind(game_id,kind))
+    with open(os.path.join(path,'play-by-play.json'),encoding='utf-8') as f:
+        pbp = json.load(f)
+    with open(os.path.join(path,'shiftcharts.json'),encoding='utf-8') as f:
+        shifts = json.load(f)
+    with open(os.path.join(path,'coaches.json'),encoding='utf-8') as f:
+        coaches = json.load(f)
+
+    documents = {}
+    for key, code in [('html_pbp','PL'),('html_shifts_home','TH'),('html_shifts_away','TV')]:
+        if key == 'html_pbp' or html_shifts:
+            with open(os.path.join(path,html_name(code,game_id)),'rb') as f:
+                documents[key] = f.read()
+
+    #HTML shifts are used only when there are no JSON shifts
+    if html_shifts:
+        shifts = {'data':[],'total':0}
+
+    #Return: raw game documents
+    return {'json':pbp,
+            'shifts':shifts,
+            'coaches':coaches,
+            'documents':documents}
+
+## SYNTHETIC PLAY-BY-PLAY ##
+def synthetic_pbp(seasons=[20212022,20222023,20232024],games=100,seed=0,source=sample_path):
+    #Given seasons and number of games per season, return synthetic multi-season play-by-play
+    #Games are resampled from the sample play-by-play with new game IDs, seasons, and dates and with shot coordinates jittered so that games are not identical
+    from wsba_hockey.tools.scraping import get_col
+
+    sample = pd.read_csv(source)
+    sample = sample[[col for col in get_col() if col in sample.columns]]
+    sample = sample.loc[sample['period_type']!='SO']
+
+    rng = np.random.default_rng(seed)
+    source_games = {game_id: df for game_id, df in sample.groupby('game_id',sort=False)}
+    game_ids = list(source_games)
+
+    dfs = []
+    for season in seasons:
+        start = pd.Timestamp(f'{str(season)[:4]}-10-10')
+        for i in range(games):
+            df = source_games[game_ids[rng.integers(len(game_ids))]].copy()
+
+            df['season'] = season
+            df['season_type'] = 2
+            df['game_id'] = int(f'{str(season)[:4]}02{i+1:04d}')
+            df['game_date'] = (start+pd.Timedelta(days=int(i*180/games))).strftime('%Y-%m-%d')
+
+            #Jitter coordinates (within the rink)
+            shots = df['x'].notna().to_numpy()
+            df.loc[shots,'x'] = np.clip(df.loc[shots,'x']+rng.integers(-3,4,shots.sum()),-99,99)
+            df.loc[shots,'y'] = np.clip(df.loc[shots,'y']+rng.integers(-3,4,shots.sum()),-42,42)
+
+            dfs.append(df)
+
+    #Return: synthetic play-by-play
+    return pd.concat(dfs,ignore_index=True)
+
+## FIXTURE CREATION ##
+def time_str(seconds):
+    #Given seconds, return time formatted as M:SS
+    seconds = int(seconds)
+    return f'{seconds//60}:{seconds%60:02d}'
+
+def as_int(value):
+    #Return integer value (or None if missing)
+    return None if pd.isna(value) else int(value)
+
+def game_roster(game,season):
+    #Given play-by-play of a game and season, return roster of players in the game
+    #Numbers are taken from event descriptions (i.e. "#29 MACKINNON") where possible and otherwise (as with positions) from the package rosters of the nearest season
+    rosters = pd.read_csv(roster_path)
+    rosters['distance'] = (rosters['season']-season).abs()
+    rosters = rosters.sort_values('distance',ascending=False).drop_duplicates(subset=['player_id'],keep='last').set_index('player_id')
+
+    described = {}
+    for num, name in game['description'].dropna().str.findall(r'#(\d+) ([^\s,;(]+)').explode().dropna():
+        described.setdefault(name,set()).add(int(num))
+
+    players = []
+    for venue in ['away','home']:
+        abbr = game[f'{venue}_team_abbr'].iloc[0]
+        cols = [f'{venue}_on_{i}' for i in range(1,7)]+[f'{venue}_goalie']
+        onice = pd.DataFrame({'id':np.concatenate([game[f'{col}_id'].to_numpy() for col in cols]),
+                              'name':np.concatenate([game[col].to_numpy() for col in cols])}).dropna()
+        for id, name in dict(zip(onice['id'].astype(int),onice['name'])).items():
+            info = rosters.loc[id]
+            first, last = name.split(' ',1)
+            numbers = described.get(last.split(' ')[0],set())
+            players.append({'venue':venue,'team_abbr':abbr,'id':id,'name':name,'first':first.title(),'last':last.title(),
+                            'number':numbers.pop() if len(numbers) == 1 else int(info['sweater_number']),'pos':info['position']})
+
+    #Return: game roster
+    return pd.DataFrame(players)
+
+def game_shifts(game,roster):
+    #Given play-by-play of a game and game roster, return shifts of each player (shifts begin and end at the changes in which a player enters and leaves the ice)
+    changes = game.loc[game['event_type']=='change']
+    shifts = []
+    for venue in ['away','home']:
+        cols = [f'{venue}_on_{i}_id' for i in range(1,7)]+[f'{venue}_goalie_id']
+        team = changes.loc[changes['event_team_venue']==venue]
+
+        on = {}
+        period = 1
+        for row in team[['period','seconds_elapsed']+cols].itertuples(index=False):
+            #Players on the ice at the end of a period leave at the end of the period
+            if row[0] != period:
+                for id, start in on.items():
+                    shifts.append((venue,id,period,start,period*1200))
+                on = {}
+                period = row[0]
+
+            current = set(int(id) for id in row[2:] if not pd.isna(id))
+            for id in [id for id in on if id not in current]:
+                shifts.append((venue,id,period,on.pop(id),row[1]))
+            for id in current:
+                on.setdefault(id,row[1])
+
+        for id, start in on.items():
+            shifts.append((venue,id,period,start,max(period*1200,start)))
+
+    shifts = pd.DataFrame(shifts,columns=['venue','id','period','start','end'])
+    shifts = shifts.loc[shifts['end']>shifts['start']].sort_values(['venue','id','period','start'])
+    shifts['start'] = shifts['start']-(shifts['period']-1)*1200
+    shifts['end'] = shifts['end']-(shifts['period']-1)*1200
+    shifts['shift'] = shifts.groupby('id').cumcount()+1
+
+    #Return: player shifts
+    return shifts.merge(roster,on=['venue','id'])
+
+def build_json(game,roster,info):
+    #Given play-by-play of a game, game roster, and game information, return JSON play-by-play
+    team_ids = {info['away_team_abbr']:info['away_team_id'],info['home_team_abbr']:info['home_team_id']}
+    events = game.loc[game['event_type']!='change']
+
+    plays = []
+    for i, event in enumerate(events.to_dict('records')):
+        period_seconds = event['seconds_elapsed']-(event['period']-1)*1200
+        situation = f"{int(pd.notna(event['away_goalie_id']))}{int(event['away_skaters'])}{int(event['home_skaters'])}{int(pd.notna(event['home_goalie_id']))}"
+        play = {'eventId':as_int(event['event_id']),
+                'periodDescriptor':{'number':int(event['period']),'periodType':event['period_type'],'maxRegulationPeriods':3},
+                'timeInPeriod':time_str(period_seconds),
+                'timeRemaining':time_str(1200-period_seconds),
+                'situationCode':situation,
+                'homeTeamDefendingSide':event['home_team_defending_side'],
+                'typeCode':as_int(event['event_type_code']),
+                'typeDescKey':event['event_type'],
+                'sortOrder':i}
+
+        details = {}
+        if pd.notna(event['event_team_abbr']):
+            details['eventOwnerTeamId'] = team_ids[event['event_team_abbr']]
+        for col, key in [('x','xCoord'),('y','yCoord')]:
+            if pd.notna(event[col]):
+                details[key] = as_int(event[col])
+        for col, key in [('zone_code','zoneCode'),('shot_type','shotType'),('event_reason','reason'),
+                         ('penalty_attribution','typeCode'),('penalty_type','descKey')]:
+            if pd.notna(event[col]):
+                details[key] = event[col]
+        if pd.notna(event['penalty_duration']):
+            details['duration'] = as_int(event['penalty_duration'])
+
+        for j, key in enumerate(JSON_PLAYERS.get(event['event_type'],[])):
+            if pd.notna(event[f'event_player_{j+1}_id']):
+                details[key] = as_int(event[f'event_player_{j+1}_id'])
+        if event['event_type'] in ['shot-on-goal','missed-shot','goal'] and pd.notna(event['event_goalie_id']):
+            details['goalieInNetId'] = as_int(event['event_goalie_id'])
+        if event['event_type'] == 'goal':
+            details['awayScore'] = int(event['away_score'])+int(event['event_team_venue']=='away')
+            details['homeScore'] = int(event['home_score'])+int(event['event_team_venue']=='home')
+
+        if details:
+            play['details'] = details
+        plays.append(play)
+
+    #Return: JSON play-by-play
+    return {'id':int(info['game_id']),
+            'season':int(info['season']),
+            'gameType':int(info['season_type']),
+            'gameDate':info['game_date'],
+            'venue':{'default':info['venue']},
+            'venueLocation':{'default':info['venue_location']},
+            'startTimeUTC':f"{info['game_date']}T23:00:00Z",
+            'gameState':'OFF',
+            'awayTeam':{'id':info['away_team_id'],'abbrev':info['away_team_abbr']},
+            'homeTeam':{'id':info['home_team_id'],'abbrev':info['home_team_abbr']},
+            'plays':plays,
+            'rosterSpots':[{'teamId':team_ids[player['team_abbr']],
+                            'playerId':int(player['id']),
+                            'firstName':{'default':player['first']},
+                            'lastName':{'default':player['last']},
+                            'sweaterNumber':int(player['number']),
+                            'positionCode':player['pos']} for player in roster.to_dict('records')]}
+
+def build_json_shifts(shifts,info):
+    #Given player shifts and game information, return JSON shifts
+    data = []
+    for i, shift in enumerate(shifts.to_dict('records')):
+        data.append({'id':i+1,
+                     'detailCode':0,
+                     'duration':time_str(shift['end']-shift['start']).zfill(5),
+                     'endTime':time_str(shift['end']).zfill(5),
+                     'firstName':shift['first'],
+                     'gameId':int(info['game_id']),
+                     'lastName':shift['last'],
+                     'period':int(shift['period']),
+                     'playerId':int(shift['id']),
+                     'shiftNumber':int(shift['shift']),
+                     'startTime':time_str(shift['start']).zfill(5),
+                     'teamAbbrev':shift['team_abbr'],
+                     'teamId':info[f"{shift['venue']}_team_id"],
+                     'typeCode':517})
+
+    #Return: JSON shifts
+    return {'data':data,'total':len(data)}
+
+def onice_html(players):
+    #Given list of on-ice players (number and position), return HTML on-ice cell contents
+    if not players:
+        return '&nbsp;'
+    cells = ['<td align="center"><table border="0" cellpadding="0" cellspacing="0">'
+             f'<tr><td align="center"><font style="cursor:hand;" title="{pos}">{number}</font></td></tr>'
+             f'<tr><td align="center">{pos}</td></tr></table></td>' for number, pos in players]
+    return '<table border="0" cellpadding="0" cellspacing="0"><tr>'+'<td align="center">&nbsp;</td>'.join(cells)+'</tr></table>'
+
+def build_html_pbp(game,roster,info):
+    #Given play-by-play of a game, game roster, and game information, return HTML play-by-play
+    players = {id: (number, pos) for id, number, pos in zip(roster['id'],roster['number'],roster['pos'])}
+    events = game.loc[game['event_type']!='change']
+
+    rows = ['<tr>'+''.join(f'<td class="heading + bborder" align="center">{text}</td>' for text in
+            ['#','Per','Str','Time:<br>Elapsed<br>Game','Event','Description',f"{info['away_team_abbr']} On Ice",f"{info['home_team_abbr']} On Ice"])+'</tr>']
+    for i, event in enumerate(events.to_dict('records')):
+        period_seconds = event['seconds_elapsed']-(event['period']-1)*1200
+
+        #Strength of the event team
+        if pd.isna(event['event_team_abbr']) or event['event_type'] in ['period-start','period-end','game-end','stoppage']:
+            strength = '&nbsp;'
+        else:
+            skaters = [int(event['away_skaters']),int(event['home_skaters'])]
+            if event['event_team_venue'] == 'home':
+                skaters.reverse()
+            strength = 'EV' if skaters[0] == skaters[1] else 'PP' if skaters[0] > skaters[1] else 'SH'
+
+        onice = {}
+        for venue in ['away','home']:
+            ids = [event[f'{venue}_on_{j}_id'] for j in range(1,7)]+[event[f'{venue}_goalie_id']]
+            onice[venue] = onice_html([players[int(id)] for id in ids if pd.notna(id)])
+
+        cells = [str(i+1),str(int(event['period'])),strength,
+                 f'{time_str(period_seconds)}<br>{time_str(1200-period_seconds)}',
+                 HTML_EVENTS[event['event_type']],
+                 event['description'] if pd.notna(event['description']) else '&nbsp;']
+        rows.append(f'<tr class="{"evenColor" if i % 2 else "oddColor"}">'+''.join(f'<td class=" + bborder" align="center">{cell}</td>' for cell in cells)+
+                    f'<td class=" + bborder + rborder">{onice["away"]}</td><td class=" + bborder + rborder">{onice["home"]}</td></tr>')
+
+    #Return: HTML play-by-play
+    return ('<html><head><title>Play By Play</title></head><body>'
+            '<table border="0" cellpadding="0" cellspacing="0" width="100%">'+'\n'.join(rows)+'</table></body></html>')
+
+def build_html_shifts(shifts,info,home):
+    #Given player shifts, game information, and home team conditional, return HTML shifts of the team
+    with open(teams_path,encoding='utf-8') as f:
+        names = {}
+        for name, abbr in json.load(f)['teams'].items():
+            names.setdefault(abbr,name)
+    away = names[info['away_team_abbr']]
+    home_name = names[info['home_team_abbr']]
+    venue = 'home' if home else 'away'
+
+    header = ['&nbsp;','&nbsp;',f'{away}<br>Away','Game',info['game_date'],info['venue'],'&nbsp;',f'{home_name}<br>Home']
+    rows = ['<tr>'+''.join(f'<td align="center" style="font-size: 10px;font-weight:bold">{text}</td>' for text in header)+'</tr>',
+            f'<tr><td align="center" class="teamHeading + border">{home_name if home else away}</td></tr>']
+
+    for (id, number, first, last), player in shifts.loc[shifts['venue']==venue].groupby(['id','number','first','last'],sort=False):
+        rows.append(f'<tr><td class="playerHeading + border" colspan="8">{number} {last.upper()}, {first.upper()}</td></tr>')
+        rows.append('<tr>'+''.join(f'<td class="heading + lborder + bborder" align="center">{text}</td>' for text in
+                    ['Shift #','Per','Start of Shift<br>Elapsed / Game','End of Shift<br>Elapsed / Game','Duration','Event'])+'</tr>')
+        for shift in player.to_dict('records'):
+            period = 'OT' if shift['period'] == 4 else str(shift['period'])
+            cells = [str(shift['shift']),period,
+                     f"{time_str(shift['start'])} / {time_str(1200-shift['start'])}",
+                     f"{time_str(shift['end'])} / {time_str(1200-shift['end'])}",
+                     time_str(shift['end']-shift['start']).zfill(5)]
+            rows.append('<tr>'+''.join(f'<td class="lborder + bborder" align="center">{cell}</td>' for cell in cells)+
+                        '<td class="lborder + bborder + rborder" align="center">&nbsp;</td></tr>')
+
+    #Return: HTML shifts
+    return ('<html><head><title>Time On Ice Report</title></head><body>'
+            '<table border="0" cellpadding="0" cellspacing="0" width="100%">'+'\n'.join(rows)+'</table></body></html>')
+
+def write_documents(game_id,pbp,shifts,coaches,documents,kind):
+    #Given game_id, raw documents, and fixture set, write fixture documents
+    path = game_path(game_id,kind)
+    os.makedirs(path,exist_ok=True)
+
+    for name, data in [('play-by-play.json',pbp),('shiftcharts.json',shifts),('coaches.json',coaches)]:
+        with open(os.path.join(path,name),'w',encoding='utf-8') as f:
+            json.dump(data,f)
+
+    for code, doc in documents.items():
+        with open(os.path.join(path,html_name(code,game_id)),'wb') as f:
+            f.write(doc if isinstance(doc,bytes) else doc.encode('utf-8'))
+
+def rebuild_fixture(game_id=GAME_ID,source=sample_path):
+    #Given game_id of a game in the sample play-by-play, write fixture documents rebuilt from its events, on-ice players, and changes
+    pbp = pd.read_csv(source)
+    game = pbp.loc[pbp['game_id']==game_id].sort_values('event_num')
+    if game.empty:
+        raise ValueError(f'Game {game_id} is not in the sample play-by-play.')
+
+    first = game.iloc[0]
+    info = {col: first[col] for col in ['season','season_type','game_date','venue','venue_location','away_team_abbr','home_team_abbr']}
+    info['game_id'] = game_id
+    info['away_team_id'] = TEAM_IDS[info['away_team_abbr']]
+    info['home_team_id'] = TEAM_IDS[info['home_team_abbr']]
+
+    roster = game_roster(game,int(info['season']))
+    shifts = game_shifts(game,roster)
+
+    write_documents(game_id,
+                    build_json(game,roster,info),
+                    build_json_shifts(shifts,info),
+                    {'away':first['away_coach'],'home':first['home_coach']},
+                    {'PL':build_html_pbp(game,roster,info),
+                     'TH':build_html_shifts(shifts,info,True),
+                     'TV':build_html_shifts(shifts,info,False)},
+                    'synthetic')
+
+def download_fixture(game_id):
+    #Given game_id, write fixture documents requested from the NHL
+    from wsba_hockey.tools.scraping import get_game_data
+    from wsba_hockey.tools.utils.fetch import get_content
+
+    pbp, shifts, coaches = get_game_data(game_id)
+    season = pbp['season']
+    documents = {code: get_content(f'https://www.nhl.com/scores/htmlreports/{season}/{html_name(code,game_id)}') for code in ['PL','TH','TV']}
+
+    write_documents(game_id,pbp,shifts,coaches,documents,'nhl')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Create benchmark fixture documents.')
+    parser.add_argument('game_ids',nargs='*',type=int,default=[GAME_ID])
+    parser.add_argument('--download',action='store_true',help='request documents from the NHL rather than rebuilding them from the sample play-by-play')
+    args = parser.parse_args()
+
+    for game_id in args.game_ids:
+        if args.download:
+            download_fixture(game_id)
+        else:
+            rebuild_fixture(game_id)
+        print(f"Fixture documents written to {game_path(game_id,'nhl' if args.download else 'synthetic')}", file=sys.stderr)
@@ -1,4 +1,6 @@
 import os
+import sys
+import tempfile
 import pandas as pd
 import matplotlib.pyplot as plt
 import wsba_hockey as wsba
@@ -8,6 +10,23 @@ import wsba_hockey as wsba
 
 dir = os.path.dirname(os.path.realpath(__file__))
 
+#Partitioned stats from a sources directory (written from the benchmark fixture game) match stats of the complete play-by-play
+sys.path.append(f'{dir}/benchmarks')
+from fixtures import load_game_documents
+from wsba_hockey.tools.scraping import parse_game_documents
+
+cwd = os.getcwd()
+with tempfile.TemporaryDirectory() as tmp:
+    os.chdir(tmp)
+    try:
+        pbp = parse_game_documents(load_game_documents(),True)[0]
+        for type in ['skater','goalie','team']:
+            partitioned = wsba.nhl_calculate_partitioned_stats('sources',type,['5v5'],2,simple_col=True)
+            complete = wsba.nhl_calculate_stats(wsba.nhl_apply_xG(pbp),type,['5v5'],2,simple_col=True)
+            pd.testing.assert_frame_equal(partitioned,complete,check_dtype=False)
+    finally:
+        os.chdir(cwd)
+
 #Test scrape of random games
 wsba.nhl_scrape_game(['random',1,2007,2024], xg=True).to_csv(f'{dir}/samples/sample_random_game.csv',index=False)
 